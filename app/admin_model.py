@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from database import db, backup_database
+from app.quran_metadata import invalidate_quran_metadata
 import pandas as pd
 from io import BytesIO
 import os
@@ -28,12 +29,15 @@ def get_record(table: str, primary_key):
 
 def update_record_model(table: str, primary_key, data: dict):
     tables[table].update(data, primary_key)
+    invalidate_quran_metadata(table)
 
 def delete_record_model(table: str, primary_key):
     tables[table].delete(primary_key)
+    invalidate_quran_metadata(table)
 
 def insert_record_model(table: str, data: dict):
     tables[table].insert(data)
+    invalidate_quran_metadata(table)
 
 def get_backup_files(backup_dir="data/backup"):
     if not os.path.exists(backup_dir):
@@ -60,4 +64,5 @@ def process_csv_preview(table: str, file_content: bytes):
 def process_csv_import(table: str, file_content: bytes):
     data = pd.read_csv(BytesIO(file_content)).to_dict("records")
     for record in data:
-        tables[table].upsert(record)
\ No newline at end of file
+        tables[table].upsert(record)
+    invalidate_quran_metadata(table)
\ No newline at end of file
@@ -0,0 +1,408 @@
+"""
+Close Date Engine
+
+Close Date processes every revision recorded on a hafiz's current date, updates
+the scheduling state of the revised items, and advances the hafiz to the next day.
+
+The engine loads everything it needs in a handful of queries:
+- The day's revisions (in insertion order)
+- The hafizs_items rows of the revised items
+- Per-item/mode revision counts (for rep-mode thresholds)
+- Per-item streaks and last_review (one windowed query)
+
+It then applies each mode's transition in memory (the _apply_* functions below;
+SRS intervals for the day in one vectorized batch, see compute_srs_intervals),
+and writes all changes back in a single transaction, so a failure
+never leaves a hafiz half-closed. The closed day's revision_daily_rollup rows
+are rebuilt in the same transaction.
+
+catch_up_close_date closes a range of skipped dates the same way: the range's
+revisions are loaded once, each day is applied in order on the in-memory state,
+and the whole range is committed at once.
+
+The transaction starts by advancing the hafiz's date, which takes the write
+lock before any state is loaded. The advance is conditional on the date the
+close started from, so two concurrent closes of the same day (the scheduled
+worker and a user) can't both apply it: the second raises CloseDateConflict.
+"""
+
+from collections import Counter
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    NEW_MEMORIZATION_MODE_CODE,
+    SRS_MODE_CODE,
+)
+from database import db, Hafiz_Items
+from utils import add_days_to_date, calculate_days_difference
+from app.common_model import get_item_stats, rebuild_revision_daily_rollup
+from app.hafiz_context import get_hafiz, refresh_hafiz_context
+from app.fixed_reps import REP_MODES_CONFIG, get_threshold_for_mode, set_next_review
+from app.srs_reps import (
+    SRS_END_INTERVAL,
+    SRS_START_INTERVAL,
+    compute_srs_intervals,
+)
+
+# hafizs_items columns Close Date may change
+_HAFIZ_ITEM_COLUMNS = (
+    "mode_code",
+    "memorized",
+    "next_review",
+    "next_interval",
+    "last_interval",
+    "srs_start_date",
+    "good_streak",
+    "bad_streak",
+    "last_review",
+)
+
+
+# === Bulk Loaders ===
+
+
+def _load_day_revisions(hafiz_id: int, first_date: str, last_date: str) -> list[dict]:
+    return db.q(
+        f"""
+        SELECT id, item_id, rating, mode_code, revision_date FROM revisions
+        WHERE hafiz_id = {hafiz_id} AND revision_date BETWEEN '{first_date}' AND '{last_date}'
+        ORDER BY id ASC
+        """
+    )
+
+
+def _load_hafiz_items(hafiz_id: int, item_ids: set) -> dict:
+    """Return the first hafizs_items row of each item, keyed by item_id."""
+    rows = db.q(
+        f"""
+        SELECT * FROM hafizs_items
+        WHERE hafiz_id = {hafiz_id} AND item_id IN ({", ".join(map(str, item_ids))})
+        ORDER BY id ASC
+        """
+    )
+    hafiz_items = {}
+    for row in rows:
+        if row["item_id"] not in hafiz_items:
+            hafiz_items[row["item_id"]] = Hafiz_Items(**row)
+    return hafiz_items
+
+
+def _load_mode_counts(hafiz_id: int, item_ids: set) -> dict:
+    rows = db.q(
+        f"""
+        SELECT item_id, mode_code, COUNT(*) AS revision_count FROM revisions
+        WHERE hafiz_id = {hafiz_id} AND item_id IN ({", ".join(map(str, item_ids))})
+        GROUP BY item_id, mode_code
+        """
+    )
+    return {(row["item_id"], row["mode_code"]): row["revision_count"] for row in rows}
+
+
+# === In-memory Transitions ===
+
+
+def _actual_interval(hafiz_item, current_date: str) -> int | None:
+    if not hafiz_item.last_review:
+        return None
+    return calculate_days_difference(hafiz_item.last_review, current_date)
+
+
+def _apply_full_cycle(hafiz_item, current_date: str) -> None:
+    # An SRS page revised in Full Cycle keeps its interval but moves its next review
+    if hafiz_item.mode_code == SRS_MODE_CODE and hafiz_item.next_interval:
+        hafiz_item.next_review = add_days_to_date(current_date, hafiz_item.next_interval)
+    hafiz_item.last_interval = _actual_interval(hafiz_item, current_date)
+
+
+def _apply_new_memorization(hafiz_item, current_date: str) -> None:
+    config = REP_MODES_CONFIG[DAILY_REPS_MODE_CODE]
+    hafiz_item.mode_code = DAILY_REPS_MODE_CODE
+    hafiz_item.memorized = True
+    set_next_review(hafiz_item, config["interval"], current_date)
+
+
+def _apply_rep(hafiz_item, mode_code: str, mode_count: int, current_date: str) -> None:
+    config = REP_MODES_CONFIG[mode_code]
+    hafiz_item.last_interval = hafiz_item.next_interval
+
+    if mode_count < get_threshold_for_mode(hafiz_item, mode_code):
+        interval = config["interval"]
+    elif config["next_mode_code"] == FULL_CYCLE_MODE_CODE:
+        hafiz_item.mode_code = FULL_CYCLE_MODE_CODE
+        hafiz_item.memorized = True
+        hafiz_item.next_interval = None
+        hafiz_item.next_review = None
+        return
+    else:
+        hafiz_item.mode_code = config["next_mode_code"]
+        interval = REP_MODES_CONFIG[config["next_mode_code"]]["interval"]
+
+    set_next_review(hafiz_item, interval, current_date)
+
+
+def _srs_next_intervals(hafiz_items_and_ratings: list, current_date: str) -> list:
+    """Next SRS interval (None if none can be computed) for each (hafiz_item, rating)."""
+    result = compute_srs_intervals(
+        current_date,
+        [hafiz_item.last_review for hafiz_item, _ in hafiz_items_and_ratings],
+        [hafiz_item.next_interval for hafiz_item, _ in hafiz_items_and_ratings],
+        [rating for _, rating in hafiz_items_and_ratings],
+    )
+    return [
+        int(next_interval) if scheduled else None
+        for next_interval, scheduled in zip(result["next_interval"], result["scheduled"])
+    ]
+
+
+def _apply_srs(hafiz_item, next_interval: int, current_date: str) -> None:
+    hafiz_item.last_interval = hafiz_item.next_interval
+    if next_interval <= SRS_END_INTERVAL:
+        set_next_review(hafiz_item, next_interval, current_date)
+    else:
+        hafiz_item.mode_code = FULL_CYCLE_MODE_CODE
+        hafiz_item.memorized = True
+        hafiz_item.last_interval = calculate_days_difference(
+            hafiz_item.last_review, current_date
+        )
+        hafiz_item.next_interval = None
+        hafiz_item.next_review = None
+        hafiz_item.srs_start_date = None
+
+
+def _start_srs(hafiz_item, rating: int, current_date: str) -> None:
+    next_interval = SRS_START_INTERVAL[rating]
+    hafiz_item.mode_code = SRS_MODE_CODE
+    hafiz_item.next_interval = next_interval
+    hafiz_item.srs_start_date = current_date
+    hafiz_item.next_review = add_days_to_date(current_date, next_interval)
+
+
+# === Write-back ===
+
+
+def _cycle_full_cycle_plan(hafiz_id: int) -> bool:
+    """Complete the hafiz's open plan if every Full Cycle/SRS page was revised in it."""
+    open_plans = db.q(
+        f"SELECT id FROM plans WHERE hafiz_id = {hafiz_id} AND completed <> 1 ORDER BY id DESC"
+    )
+    if len(open_plans) != 1:
+        return False
+    plan_id = open_plans[0]["id"]
+
+    memorized_count = db.q(
+        f"""
+        SELECT COUNT(*) AS count FROM hafizs_items
+        WHERE hafiz_id = {hafiz_id} AND memorized = 1
+        AND mode_code IN ('{SRS_MODE_CODE}', '{FULL_CYCLE_MODE_CODE}')
+        """
+    )[0]["count"]
+    revised_count = db.q(
+        f"""
+        SELECT COUNT(*) AS count FROM revisions
+        WHERE hafiz_id = {hafiz_id} AND plan_id = {plan_id}
+        AND mode_code = '{FULL_CYCLE_MODE_CODE}'
+        """
+    )[0]["count"]
+    if memorized_count != revised_count:
+        return False
+
+    db.conn.execute("UPDATE plans SET completed = 1 WHERE id = ?", (plan_id,))
+    db.conn.execute(
+        "INSERT INTO plans (hafiz_id, completed) VALUES (?, 0)", (hafiz_id,)
+    )
+    return True
+
+
+def _close_day(
+    hafiz_id: int,
+    current_date: str,
+    day_revisions: list[dict],
+    hafiz_items: dict,
+    mode_counts: dict,
+    item_stats: dict,
+) -> dict:
+    """
+    Apply one day's revisions to the loaded hafiz_items and write the day's changes.
+
+    Must run inside the caller's transaction; hafiz_items carries the in-memory
+    state over to the following days of a catch-up.
+    """
+    day_items = {
+        rev["item_id"]: hafiz_items[rev["item_id"]]
+        for rev in day_revisions
+        if rev["item_id"] in hafiz_items
+    }
+    start_modes = {item_id: hi.mode_code for item_id, hi in day_items.items()}
+
+    # An SRS revision of an item revised only once today doesn't depend on the
+    # day's other transitions, so those intervals are computed in one batch
+    revisions_per_item = Counter(rev["item_id"] for rev in day_revisions)
+    batched_srs_revisions = [
+        rev
+        for rev in day_revisions
+        if rev["mode_code"] == SRS_MODE_CODE
+        and rev["item_id"] in day_items
+        and revisions_per_item[rev["item_id"]] == 1
+    ]
+    batched_srs_intervals = dict(
+        zip(
+            (rev["id"] for rev in batched_srs_revisions),
+            _srs_next_intervals(
+                [(day_items[rev["item_id"]], rev["rating"]) for rev in batched_srs_revisions],
+                current_date,
+            ),
+        )
+    )
+
+    revision_intervals = []
+    srs_unscheduled = []
+    for rev in day_revisions:
+        hafiz_item = day_items.get(rev["item_id"])
+        if hafiz_item is None:
+            continue
+
+        mode_code = rev["mode_code"]
+        if mode_code == FULL_CYCLE_MODE_CODE:
+            _apply_full_cycle(hafiz_item, current_date)
+        elif mode_code == NEW_MEMORIZATION_MODE_CODE:
+            _apply_new_memorization(hafiz_item, current_date)
+        elif mode_code in REP_MODES_CONFIG:
+            mode_count = mode_counts.get((rev["item_id"], mode_code), 0)
+            _apply_rep(hafiz_item, mode_code, mode_count, current_date)
+        elif mode_code == SRS_MODE_CODE:
+            if rev["id"] in batched_srs_intervals:
+                next_interval = batched_srs_intervals[rev["id"]]
+            else:
+                next_interval = _srs_next_intervals([(hafiz_item, rev["rating"])], current_date)[0]
+            if next_interval is None:
+                srs_unscheduled.append(rev["item_id"])
+            else:
+                _apply_srs(hafiz_item, next_interval, current_date)
+                revision_intervals.append((next_interval, rev["id"]))
+
+        # Non-mode specific columns, as populate_hafizs_items_stat_columns would set them
+        for column, value in item_stats[rev["item_id"]].items():
+            setattr(hafiz_item, column, value)
+
+    # Today's Ok/Bad Full Cycle revisions move items still in Full Cycle into SRS
+    srs_entries = [
+        rev
+        for rev in day_revisions
+        if rev["item_id"] in day_items
+        and rev["mode_code"] == FULL_CYCLE_MODE_CODE
+        and rev["rating"] in SRS_START_INTERVAL
+        and day_items[rev["item_id"]].mode_code == FULL_CYCLE_MODE_CODE
+    ]
+    for rev in srs_entries:
+        _start_srs(day_items[rev["item_id"]], rev["rating"], current_date)
+
+    column_assignments = ", ".join(f"{column} = ?" for column in _HAFIZ_ITEM_COLUMNS)
+    hafiz_item_rows = [
+        tuple(getattr(hafiz_item, column) for column in _HAFIZ_ITEM_COLUMNS)
+        + (hafiz_item.id,)
+        for hafiz_item in day_items.values()
+    ]
+    if hafiz_item_rows:
+        db.conn.executemany(
+            f"UPDATE hafizs_items SET {column_assignments} WHERE id = ?",
+            hafiz_item_rows,
+        )
+    if revision_intervals:
+        db.conn.executemany(
+            "UPDATE revisions SET next_interval = ? WHERE id = ?",
+            revision_intervals,
+        )
+    plan_completed = _cycle_full_cycle_plan(hafiz_id)
+    rebuild_revision_daily_rollup(hafiz_id, current_date)
+
+    return {
+        "current_date": current_date,
+        "next_date": add_days_to_date(current_date, 1),
+        "revision_count": len(day_revisions),
+        "updated_item_ids": sorted(day_items),
+        "transitions": [
+            (item_id, start_modes[item_id], hafiz_item.mode_code)
+            for item_id, hafiz_item in sorted(day_items.items())
+            if start_modes[item_id] != hafiz_item.mode_code
+        ],
+        "srs_unscheduled": srs_unscheduled,
+        "plan_completed": plan_completed,
+    }
+
+
+class CloseDateConflict(Exception):
+    """The hafiz's current date changed (another close committed) before this close started."""
+
+
+def _close_dates(hafiz_id: int, dates: list[str]) -> list[dict]:
+    """Close consecutive dates in order, loading their revisions once and committing once."""
+    with db.conn:
+        # Advancing the date is the transaction's first statement, so it takes
+        # the write lock before anything is read: concurrent closes (the
+        # scheduled worker and a user's Close Date) run one after the other,
+        # each loading the state the previous one committed. It only matches
+        # while the hafiz is still on dates[0]; if another close got there
+        # first, nothing is applied twice.
+        advanced = db.q(
+            'UPDATE hafizs SET "current_date" = ? WHERE id = ? AND "current_date" = ? RETURNING id',
+            [add_days_to_date(dates[-1], 1), hafiz_id, dates[0]],
+        )
+        if not advanced:
+            raise CloseDateConflict(f"Hafiz {hafiz_id} is no longer on {dates[0]}")
+
+        range_revisions = _load_day_revisions(hafiz_id, dates[0], dates[-1])
+        item_ids = {rev["item_id"] for rev in range_revisions}
+
+        hafiz_items, mode_counts, item_stats = {}, {}, {}
+        if item_ids:
+            hafiz_items = _load_hafiz_items(hafiz_id, item_ids)
+            mode_counts = _load_mode_counts(hafiz_id, item_ids)
+            item_stats = get_item_stats(hafiz_id, list(item_ids))
+
+        revisions_by_date = {date: [] for date in dates}
+        for rev in range_revisions:
+            revisions_by_date[rev["revision_date"]].append(rev)
+
+        summaries = [
+            _close_day(hafiz_id, date, revisions_by_date[date], hafiz_items, mode_counts, item_stats)
+            for date in dates
+        ]
+    refresh_hafiz_context(hafiz_id)
+    return summaries
+
+
+def close_date(hafiz_id: int) -> dict:
+    """
+    Close the hafiz's current date and advance it by one day.
+
+    Returns a summary of what changed:
+        current_date: The date that was closed
+        next_date: The hafiz's new current date
+        revision_count: Number of revisions processed
+        updated_item_ids: Items whose hafizs_items row was written
+        transitions: (item_id, from_mode, to_mode) for every mode change
+        srs_unscheduled: SRS items left as-is because no interval could be
+            computed (e.g. revised twice on the same day)
+        plan_completed: Whether the Full Cycle plan was completed and renewed
+    """
+    return _close_dates(hafiz_id, [get_hafiz(hafiz_id).current_date])[0]
+
+
+def catch_up_close_date(hafiz_id: int, until_date: str) -> list[dict]:
+    """
+    Close every date from the hafiz's current date up to until_date in one pass.
+
+    Each day is processed as close_date would (its revisions in order, SRS entry
+    and the Full Cycle plan rollover), but the revisions of the whole range are
+    loaded once and everything is committed in one transaction. The hafiz ends
+    on until_date. Returns the close_date summary of each closed day, oldest
+    first (empty if until_date is not after the current date).
+    """
+    current_date = get_hafiz(hafiz_id).current_date
+    dates = [
+        add_days_to_date(current_date, offset)
+        for offset in range(calculate_days_difference(current_date, until_date))
+    ]
+    if not dates:
+        return []
+    return _close_dates(hafiz_id, dates)
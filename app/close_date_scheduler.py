@@ -0,0 +1,153 @@
+"""
+Scheduled Close Date Worker
+
+Runs Close Date for every hafiz whose current_date is behind the wall clock, so
+the heavy recompute happens overnight instead of on the request path. Each
+hafiz is caught up to today with catch_up_close_date (one transaction per
+hafiz, so a failure leaves that hafiz unchanged and the others still close).
+
+Hafizs are processed in batches of CLOSE_DATE_BATCH_SIZE, with at most
+CLOSE_DATE_CONCURRENCY closing at once in worker threads (each thread has its
+own database connection). Every run writes a row to close_date_runs.
+
+The worker runs either:
+- With the app: set NIGHTLY_CLOSE_DATE=true and nightly_close_date_lifespan
+  (the app's lifespan) runs it every night at NIGHTLY_CLOSE_DATE_AT.
+- From the command line: python -m app.close_date_scheduler [--date YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from database import db
+from utils import current_time
+from app.close_date import catch_up_close_date
+
+CLOSE_DATE_BATCH_SIZE = 50
+CLOSE_DATE_CONCURRENCY = 4
+NIGHTLY_CLOSE_DATE_AT = "00:05"  # Local time, just after the date changes
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def get_hafiz_ids_behind(run_date: str) -> list[int]:
+    """Hafizs whose current date is before run_date."""
+    rows = db.q('SELECT id FROM hafizs WHERE "current_date" < ? ORDER BY id', [run_date])
+    return [row["id"] for row in rows]
+
+
+async def _close_hafiz(hafiz_id: int, run_date: str, semaphore: asyncio.Semaphore) -> tuple:
+    """Catch one hafiz up to run_date; returns (hafiz_id, day summaries, error)."""
+    async with semaphore:
+        try:
+            summaries = await asyncio.to_thread(catch_up_close_date, hafiz_id, run_date)
+        except Exception as e:
+            return hafiz_id, [], f"{type(e).__name__}: {e}"
+    return hafiz_id, summaries, None
+
+
+async def run_scheduled_close_date(
+    run_date: str = None,
+    batch_size: int = CLOSE_DATE_BATCH_SIZE,
+    concurrency: int = CLOSE_DATE_CONCURRENCY,
+) -> dict:
+    """
+    Close every hafiz behind run_date (default: today) up to it.
+
+    Returns the run report, as stored in close_date_runs:
+        run_id, run_date, hafiz_count, closed_days, revision_count
+        failures: hafiz_id -> error for each hafiz that could not be closed
+    """
+    run_date = run_date or current_time()
+    run_id = db.q(
+        "INSERT INTO close_date_runs (run_date, started_at) VALUES (?, ?) RETURNING id",
+        [run_date, current_time(_TIMESTAMP_FORMAT)],
+    )[0]["id"]
+
+    hafiz_ids = get_hafiz_ids_behind(run_date)
+    semaphore = asyncio.Semaphore(concurrency)
+    closed_days = revision_count = 0
+    failures = {}
+    for start in range(0, len(hafiz_ids), batch_size):
+        batch = hafiz_ids[start : start + batch_size]
+        results = await asyncio.gather(
+            *(_close_hafiz(hafiz_id, run_date, semaphore) for hafiz_id in batch)
+        )
+        for hafiz_id, summaries, error in results:
+            if error:
+                failures[hafiz_id] = error
+            closed_days += len(summaries)
+            revision_count += sum(summary["revision_count"] for summary in summaries)
+
+    db.execute(
+        """
+        UPDATE close_date_runs
+        SET finished_at = ?, hafiz_count = ?, closed_days = ?, revision_count = ?, failures = ?
+        WHERE id = ?
+        """,
+        [
+            current_time(_TIMESTAMP_FORMAT),
+            len(hafiz_ids),
+            closed_days,
+            revision_count,
+            "\n".join(f"{hafiz_id}: {error}" for hafiz_id, error in failures.items()),
+            run_id,
+        ],
+    )
+    return {
+        "run_id": run_id,
+        "run_date": run_date,
+        "hafiz_count": len(hafiz_ids),
+        "closed_days": closed_days,
+        "revision_count": revision_count,
+        "failures": failures,
+    }
+
+
+def seconds_until(clock_time: str, now: datetime = None) -> float:
+    """Seconds from now until the next HH:MM local time."""
+    now = now or datetime.now()
+    hour, minute = map(int, clock_time.split(":"))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def nightly_close_date_loop(clock_time: str = NIGHTLY_CLOSE_DATE_AT):
+    """Run the scheduled Close Date every night at clock_time."""
+    while True:
+        await asyncio.sleep(seconds_until(clock_time))
+        try:
+            report = await run_scheduled_close_date()
+            print(f"Scheduled Close Date: {report}")
+        except Exception as e:
+            print(f"Scheduled Close Date failed: {e}")
+
+
+@asynccontextmanager
+async def nightly_close_date_lifespan(app):
+    """App lifespan: run the nightly loop while the app is up, when NIGHTLY_CLOSE_DATE is enabled."""
+    if os.getenv("NIGHTLY_CLOSE_DATE", "").lower() != "true":
+        yield
+        return
+    task = asyncio.create_task(nightly_close_date_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Close Date for every hafiz behind a date.")
+    parser.add_argument("--date", help="Close hafizs up to this date (default: today)")
+    parser.add_argument("--batch-size", type=int, default=CLOSE_DATE_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=CLOSE_DATE_CONCURRENCY)
+    args = parser.parse_args()
+    print(
+        asyncio.run(
+            run_scheduled_close_date(args.date, args.batch_size, args.concurrency)
+        )
+    )
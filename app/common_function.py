@@ -12,15 +12,19 @@ from app.common_view import (
 )
 from app.common_model import (
     get_current_date, get_hafizs_items, get_mode_count, get_actual_interval,
-    get_planned_next_interval, add_revision_record, get_not_memorized_records,
-    get_last_added_full_cycle_page, find_next_memorized_item_id,
-    populate_hafizs_items_stat_columns, get_current_plan_id, get_full_review_item_ids,
+    get_planned_next_interval, add_revision_record, add_revisions_bulk,
+    get_not_memorized_records, get_last_added_full_cycle_page, find_next_memorized_item_id,
+    populate_hafizs_items_stat_columns, update_stats_for_new_revision, recompute_item_stats,
+    get_item_stats, get_current_plan_id,
     get_juz_number_for_item, get_unmemorized_items, get_mode_specific_hafizs_items,
-    get_datewise_revisions, get_earliest_revision_date, get_unrevised_memorized_items,
+    get_mode_queue_page, get_mode_queue_counts, is_full_cycle_plan_finished,
+    get_datewise_revisions, get_revision_daily_rollup, get_daily_page_equivalents,
+    get_mode_day_revisions, rebuild_revision_daily_rollup,
+    get_earliest_revision_date, get_unrevised_memorized_items,
     get_prev_next_item_ids, get_item_page_portion, get_page_count, get_surah_name,
     get_page_number, get_mode_name, get_mode_icon, can_graduate, get_last_item_id,
     get_juz_name, get_mode_name_and_code, get_page_part_info, get_status,
-    get_status_display, get_status_counts
+    get_status_display, get_status_counts, get_status_histogram, get_tab_counts
 )
 # Re-export home view functions for backward compatibility
 from app.home_view import (
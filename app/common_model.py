@@ -33,15 +33,21 @@ from constants import (
     STATUS_DISPLAY,
     DEFAULT_REP_COUNTS
 )
+from app import quran_metadata
+from app.hafiz_context import get_hafiz_context, refresh_hafiz_context
 from utils import current_time, calculate_days_difference, find_next_greater, format_number
 from fasthtml.common import NotFoundError
 
 
 def get_current_date(auth) -> str:
+    context = get_hafiz_context(auth)
+    if context is not None and context.current_date is not None:
+        return context.current_date
     current_hafiz = hafizs[auth]
     current_date = current_hafiz.current_date
     if current_date is None:
         current_date = hafizs.update(current_date=current_time(), id=auth).current_date
+        refresh_hafiz_context(auth)
     return current_date
 
 
@@ -125,101 +131,233 @@ def find_next_memorized_item_id(item_id):
     return find_next_greater(memorized_and_srs_item_ids, item_id)
 
 
-def populate_hafizs_items_stat_columns(item_id: int = None):
+def apply_rating_to_streaks(good_streak: int, bad_streak: int, rating) -> tuple[int, int]:
+    """Return (good_streak, bad_streak) after one more revision with the given rating."""
+    if rating == -1:
+        return 0, bad_streak + 1
+    if rating == 1:
+        return good_streak + 1, 0
+    return 0, 0
 
-    def get_item_id_summary(item_id: int):
-        items_rev_data = revisions(
-            where=f"item_id = {item_id}", order_by="revision_date ASC"
-        )
-        good_streak = 0
-        bad_streak = 0
-        last_review = ""
-
-        for rev in items_rev_data:
-            current_rating = rev.rating
-
-            if current_rating == -1:
-                bad_streak += 1
-                good_streak = 0
-            elif current_rating == 1:
-                good_streak += 1
-                bad_streak = 0
-            else:
-                good_streak = 0
-                bad_streak = 0
-
-            last_review = rev.revision_date
-
-        return {
-            "good_streak": good_streak,
-            "bad_streak": bad_streak,
-            "last_review": last_review,
-        }
 
-    # Update the streak for a specific items if item_id is givien
-    if item_id is not None:
-        current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
-        if current_hafiz_items:
-            current_hafiz_items_id = current_hafiz_items[0].id
-            hafizs_items.update(get_item_id_summary(item_id), current_hafiz_items_id)
+def _write_item_stats(hafiz_id: int, item_id: int, stats: dict):
+    db.execute(
+        "UPDATE hafizs_items SET good_streak = ?, bad_streak = ?, last_review = ? "
+        "WHERE hafiz_id = ? AND item_id = ?",
+        (stats["good_streak"], stats["bad_streak"], stats["last_review"], hafiz_id, item_id),
+    )
 
-        return None
 
-    # Update the streak for all the items in the hafizs_items
-    for h_item in hafizs_items():
-        hafizs_items.update(get_item_id_summary(h_item.item_id), h_item.id)
+def update_stats_for_new_revision(hafiz_id: int, item_id: int, rating, revision_date: str):
+    """
+    Update the streak columns and last_review for a newly added revision.
 
+    An append (dated on or after the stored last_review) is applied to the stored
+    streaks directly, but only while those reflect the item's previous latest
+    revision: the home page adds (and bulk_rate) leave them for Close Date, so
+    they can be behind. Otherwise, and for a back-dated revision, this falls
+    back to recompute_item_stats.
+    """
+    rows = db.q(
+        f"""
+        SELECT good_streak, bad_streak, last_review,
+            (SELECT MAX(revision_date) FROM revisions
+             WHERE hafiz_id = {hafiz_id} AND item_id = {item_id}
+                AND id < (SELECT MAX(id) FROM revisions WHERE hafiz_id = {hafiz_id} AND item_id = {item_id})
+            ) AS previous_review
+        FROM hafizs_items
+        WHERE hafiz_id = {hafiz_id} AND item_id = {item_id}
+        """
+    )
+    if not rows:
+        return
+    current = rows[0]
+    if (
+        not current["last_review"]
+        or revision_date < current["last_review"]
+        or current["last_review"] != current["previous_review"]
+    ):
+        recompute_item_stats(hafiz_id, item_id)
+        return
 
-def get_current_plan_id():
-    unique_seq_plan_id = [
-        i.id for i in plans(where="completed <> 1", order_by="id DESC")
-    ]
+    good_streak, bad_streak = apply_rating_to_streaks(
+        current["good_streak"] or 0, current["bad_streak"] or 0, rating
+    )
+    _write_item_stats(
+        hafiz_id,
+        item_id,
+        {"good_streak": good_streak, "bad_streak": bad_streak, "last_review": revision_date},
+    )
 
-    if unique_seq_plan_id and not len(unique_seq_plan_id) > 1:
-        return unique_seq_plan_id[0]
-    return None
 
+def recompute_item_stats(hafiz_id: int, item_id: int):
+    """
+    Recompute the streak columns and last_review after a revision is edited or deleted.
+
+    Streaks only depend on the trailing run of equal ratings, so revisions are read
+    newest first and the scan stops at the first rating that breaks the run.
+    """
+    cursor = db.execute(
+        f"SELECT rating, revision_date FROM revisions "
+        f"WHERE hafiz_id = {hafiz_id} AND item_id = {item_id} "
+        f"ORDER BY revision_date DESC, id DESC"
+    )
+    stats = {"good_streak": 0, "bad_streak": 0, "last_review": ""}
+    latest = next(cursor, None)
+    if latest is not None:
+        last_rating, stats["last_review"] = latest
+        run_length = 1
+        for rating, _ in cursor:
+            if rating != last_rating:
+                break
+            run_length += 1
+        if last_rating == 1:
+            stats["good_streak"] = run_length
+        elif last_rating == -1:
+            stats["bad_streak"] = run_length
+    cursor.close()
+    _write_item_stats(hafiz_id, item_id, stats)
+
+
+def _item_stats_sql(hafiz_id: int, item_filter: str = "") -> str:
+    """Query of good_streak, bad_streak and last_review per item with revisions."""
+    return f"""
+        WITH ordered AS (
+            SELECT item_id, rating,
+                ROW_NUMBER() OVER latest_first AS position,
+                FIRST_VALUE(rating) OVER latest_first AS last_rating,
+                FIRST_VALUE(revision_date) OVER latest_first AS last_review
+            FROM revisions
+            WHERE hafiz_id = {hafiz_id} {item_filter}
+            WINDOW latest_first AS (PARTITION BY item_id ORDER BY revision_date DESC, id DESC)
+        ),
+        runs AS (
+            SELECT item_id, last_rating, last_review,
+                COALESCE(MIN(CASE WHEN rating IS NOT last_rating THEN position END) - 1, COUNT(*)) AS run_length
+            FROM ordered
+            GROUP BY item_id
+        )
+        SELECT item_id, last_review,
+            CASE WHEN last_rating = 1 THEN run_length ELSE 0 END AS good_streak,
+            CASE WHEN last_rating = -1 THEN run_length ELSE 0 END AS bad_streak
+        FROM runs
+    """
+
+
+def get_item_stats(hafiz_id: int, item_ids: list = None) -> dict:
+    """
+    Compute good_streak, bad_streak and last_review for many items in one query.
+
+    Returns a dict keyed by item_id; items without revisions are omitted.
+    """
+    item_filter = ""
+    if item_ids is not None:
+        if not item_ids:
+            return {}
+        item_filter = f"AND item_id IN ({', '.join(map(str, item_ids))})"
+
+    return {
+        row["item_id"]: {
+            "good_streak": row["good_streak"],
+            "bad_streak": row["bad_streak"],
+            "last_review": row["last_review"],
+        }
+        for row in db.q(_item_stats_sql(hafiz_id, item_filter))
+    }
 
-def get_full_review_item_ids(auth, mode_specific_hafizs_items_records, item_ids):
-    """Get all eligible Full Cycle items (not yet revised in current plan + revised today)."""
-    current_date = get_current_date(auth)
-    plan_id = get_current_plan_id()
 
-    if plan_id is not None:
-        # Filter out items that have been revised in the current plan (but not today)
-        revised_items_in_plan = revisions(
-            where=f"mode_code = '{FULL_CYCLE_MODE_CODE}' AND plan_id = {plan_id} AND revision_date != '{current_date}'",
-            order_by="revision_date DESC, id DESC",
+def populate_hafizs_items_stat_columns(hafiz_id: int, item_ids: list = None):
+    """Rebuild the streak columns and last_review of a hafiz's items (all items by default)."""
+    item_stats = get_item_stats(hafiz_id, item_ids)
+    if item_ids is None:
+        item_ids = [
+            row["item_id"]
+            for row in db.q(f"SELECT item_id FROM hafizs_items WHERE hafiz_id = {hafiz_id}")
+        ]
+    no_history = {"good_streak": 0, "bad_streak": 0, "last_review": ""}
+    rows = []
+    for item_id in item_ids:
+        stats = item_stats.get(item_id, no_history)
+        rows.append(
+            (stats["good_streak"], stats["bad_streak"], stats["last_review"], hafiz_id, item_id)
+        )
+    with db.conn:
+        db.conn.executemany(
+            "UPDATE hafizs_items SET good_streak = ?, bad_streak = ?, last_review = ? "
+            "WHERE hafiz_id = ? AND item_id = ?",
+            rows,
         )
-        # Convert to set for faster lookup
-        revised_items_in_plan_set = {r.item_id for r in revised_items_in_plan}
-        eligible_item_ids = [i for i in item_ids if i not in revised_items_in_plan_set]
 
-        # Check if plan is finished (no more items to review)
-        is_plan_finished = len(eligible_item_ids) == 0
-    else:
-        eligible_item_ids = []
-        is_plan_finished = False
-
-    # Get all item_ids revised today in full_cycle mode
-    today_full_cycle_revisions = {
-        r.item_id
-        for r in revisions(
-            where=f"revision_date = '{current_date}' AND mode_code = '{FULL_CYCLE_MODE_CODE}'"
+
+def add_revisions_bulk(
+    hafiz_id: int,
+    item_ratings: list[tuple[int, int]],
+    mode_code: str,
+    revision_date: str,
+    plan_id: int = None,
+    update_stats: bool = True,
+) -> list[int]:
+    """
+    Validate and insert one revision per (item_id, rating) in a single transaction.
+
+    Every item must belong to the hafiz and mode_code must exist, otherwise
+    ValueError is raised and nothing is written. Unless update_stats is False,
+    the items' streak columns and last_review are then rebuilt with one UPDATE.
+    Returns the new revision ids, in the order of item_ratings.
+    """
+    rows = [
+        (hafiz_id, int(item_id), revision_date, int(rating), mode_code, plan_id)
+        for item_id, rating in item_ratings
+    ]
+    if not rows:
+        return []
+    if not db.q("SELECT 1 FROM modes WHERE code = ?", [mode_code]):
+        raise ValueError(f"Unknown mode_code: {mode_code}")
+    item_ids = sorted({row[1] for row in rows})
+    item_list = ", ".join(map(str, item_ids))
+    known_item_ids = {
+        row["item_id"]
+        for row in db.q(
+            f"SELECT item_id FROM hafizs_items WHERE hafiz_id = {hafiz_id} AND item_id IN ({item_list})"
         )
     }
+    unknown_item_ids = [item_id for item_id in item_ids if item_id not in known_item_ids]
+    if unknown_item_ids:
+        raise ValueError(f"Items {unknown_item_ids} do not belong to hafiz {hafiz_id}")
+
+    with db.conn:
+        revision_ids = [
+            revision_id
+            for (revision_id,) in db.conn.executemany(
+                "INSERT INTO revisions (hafiz_id, item_id, revision_date, rating, mode_code, plan_id) "
+                "VALUES (?, ?, ?, ?, ?, ?) RETURNING id",
+                rows,
+            )
+        ]
+        if update_stats:
+            db.conn.execute(
+                f"""
+                UPDATE hafizs_items
+                SET good_streak = stats.good_streak, bad_streak = stats.bad_streak,
+                    last_review = stats.last_review
+                FROM ({_item_stats_sql(hafiz_id, f"AND item_id IN ({item_list})")}) AS stats
+                WHERE hafizs_items.hafiz_id = {hafiz_id} AND hafizs_items.item_id = stats.item_id
+                """
+            )
+    return revision_ids
+
 
-    # Get items that have been revised today in full_cycle mode, but are not in eligible_item_ids
-    today_revisioned_items = [
-        item["item_id"]
-        for item in mode_specific_hafizs_items_records
-        if item["item_id"] in today_full_cycle_revisions
-        and item["item_id"] not in eligible_item_ids
+def get_current_plan_id():
+    context = get_hafiz_context()
+    if context is not None:
+        return context.plan_id
+    unique_seq_plan_id = [
+        i.id for i in plans(where="completed <> 1", order_by="id DESC")
     ]
 
-    # Combine and sort the item_ids
-    final_item_ids = sorted(list(set(eligible_item_ids + today_revisioned_items)))
-    return is_plan_finished, final_item_ids
+    if unique_seq_plan_id and not len(unique_seq_plan_id) > 1:
+        return unique_seq_plan_id[0]
+    return None
 
 
 # === Additional Database Query Functions ===
@@ -244,42 +382,298 @@ def get_unmemorized_items(auth: int) -> list[dict]:
     return db.q(qry)
 
 
-def get_mode_specific_hafizs_items(auth: int, mode_condition: str) -> list[dict]:
-    """Get hafiz items filtered by mode condition with item details."""
-    qry = f"""
-        SELECT hafizs_items.item_id, items.surah_name, hafizs_items.next_review, 
-               hafizs_items.last_review, hafizs_items.mode_code, hafizs_items.memorized, 
-               hafizs_items.page_number, hafizs_items.loved 
+def get_mode_condition(mode_code: str):
+    mode_code_mapping = {
+        FULL_CYCLE_MODE_CODE: [f"'{FULL_CYCLE_MODE_CODE}'", f"'{SRS_MODE_CODE}'"],
+    }
+    retrieved_mode_codes = mode_code_mapping.get(mode_code)
+    if retrieved_mode_codes is None:
+        mode_condition = f"mode_code = '{mode_code}'"
+    else:
+        mode_condition = f"mode_code IN ({', '.join(retrieved_mode_codes)})"
+    return mode_condition
+
+
+def _mode_specific_hafizs_items_sql(auth: int, mode_condition: str, current_date: str) -> str:
+    # Subquery columns are prefixed with rev_ so the unqualified mode_condition stays unambiguous
+    return f"""
+        SELECT hafizs_items.item_id, items.surah_name, hafizs_items.next_review,
+               hafizs_items.last_review, hafizs_items.mode_code, hafizs_items.memorized,
+               hafizs_items.page_number, hafizs_items.loved,
+               COALESCE(mode_revisions.rev_count, 0) AS mode_revision_count,
+               COALESCE(mode_revisions.rev_today_count, 0) AS mode_revisions_today,
+               COALESCE(nm_revisions.rev_today_count, 0) AS nm_revisions_today
         FROM hafizs_items
         LEFT JOIN items on hafizs_items.item_id = items.id
+        LEFT JOIN (
+            SELECT item_id AS rev_item_id, mode_code AS rev_mode_code, COUNT(*) AS rev_count,
+                   SUM(revision_date = '{current_date}') AS rev_today_count
+            FROM revisions
+            WHERE hafiz_id = {auth}
+            GROUP BY item_id, mode_code
+        ) AS mode_revisions ON mode_revisions.rev_item_id = hafizs_items.item_id
+            AND mode_revisions.rev_mode_code = hafizs_items.mode_code
+        LEFT JOIN (
+            SELECT item_id AS rev_item_id, COUNT(*) AS rev_today_count
+            FROM revisions
+            WHERE hafiz_id = {auth} AND revision_date = '{current_date}'
+                AND mode_code = '{NEW_MEMORIZATION_MODE_CODE}'
+            GROUP BY item_id
+        ) AS nm_revisions ON nm_revisions.rev_item_id = hafizs_items.item_id
         WHERE {mode_condition} AND hafizs_items.hafiz_id = {auth}
+    """
+
+
+def get_mode_specific_hafizs_items(auth: int, mode_condition: str, current_date: str = None) -> list[dict]:
+    """Get hafiz items filtered by mode condition with item details.
+
+    Each record also carries the revision summary the mode queue conditions use
+    (mode_revision_count, mode_revisions_today, nm_revisions_today), counted as
+    of current_date (default: the hafiz's current date).
+    """
+    current_date = current_date or get_current_date(auth)
+    qry = f"""
+        {_mode_specific_hafizs_items_sql(auth, mode_condition, current_date)}
         ORDER BY hafizs_items.item_id ASC
     """
     return db.q(qry)
 
 
-def get_datewise_revisions(date_range: list[str], hafiz_id: int = None) -> list[dict]:
-    """Get all revisions for a date range with item details."""
-    if not date_range:
-        return []
-    
-    dates_str = ", ".join(f"'{d}'" for d in date_range)
-    hafiz_condition = f"AND revisions.hafiz_id = {hafiz_id}" if hafiz_id else ""
-    
+# === Mode Queues ===
+# The item_ids listed in each home page tab, selected in SQL so a tab can be
+# paged with LIMIT/OFFSET and counted with one aggregate. home_view's
+# MODE_PREDICATES are the definition of each tab; the conditions here are their
+# SQL form (plus the SRS exclusion zone, loved filter and Full Cycle plan
+# filter), and tests/integration/test_mode_queue.py checks the two agree.
+
+SRS_EXCLUSION_ZONE = 60
+
+
+def _full_cycle_plan_condition(auth: int, current_date: str, plan_id: int) -> str:
+    """Memorized items not yet revised in the plan (revisions today don't count)."""
+    return f"""
+        COALESCE(memorized, 0) <> 0 AND item_id NOT IN (
+            SELECT item_id FROM revisions
+            WHERE hafiz_id = {auth} AND plan_id = {plan_id}
+                AND mode_code = '{FULL_CYCLE_MODE_CODE}' AND revision_date != '{current_date}'
+        )
+    """
+
+
+def get_mode_queue_sql(
+    auth: int, mode_code: str, current_date: str, plan_id: int = None, show_loved_only: bool = False
+) -> str:
+    """SQL selecting the distinct item_ids shown in a mode's tab on current_date."""
+    if mode_code == NEW_MEMORIZATION_MODE_CODE:
+        # Unmemorized items, plus items memorized today (they stay until Close Date)
+        return f"""
+            SELECT item_id FROM hafizs_items
+            WHERE hafiz_id = {auth} AND memorized = 0
+            UNION
+            SELECT item_id FROM revisions
+            WHERE hafiz_id = {auth} AND revision_date = '{current_date}'
+                AND mode_code = '{NEW_MEMORIZATION_MODE_CODE}'
+        """
+
+    is_due = f"(COALESCE(next_review, '') = '' OR next_review <= '{current_date}')"
+    is_reviewed_today = f"last_review = '{current_date}'"
+
+    if mode_code == DAILY_REPS_MODE_CODE:
+        # Due (unless just memorized), or already reviewed today in Daily Reps
+        condition = f"""
+            ({is_due} AND nm_revisions_today = 0)
+            OR ({is_reviewed_today} AND mode_code = '{DAILY_REPS_MODE_CODE}')
+        """
+    elif mode_code in (WEEKLY_REPS_MODE_CODE, FORTNIGHTLY_REPS_MODE_CODE, MONTHLY_REPS_MODE_CODE):
+        condition = f"""
+            mode_code = '{mode_code}'
+            AND ({is_due} OR ({is_reviewed_today} AND mode_revision_count > 0))
+        """
+    elif mode_code == SRS_MODE_CODE:
+        condition = f"({is_due} OR mode_revisions_today > 0)"
+        exclude_start_page = get_last_added_full_cycle_page(auth)
+        if exclude_start_page is not None:
+            exclude_end_page = exclude_start_page + SRS_EXCLUSION_ZONE
+            condition += f" AND (page_number < {exclude_start_page} OR page_number > {exclude_end_page})"
+        if show_loved_only:
+            condition += " AND COALESCE(loved, 0) <> 0"
+    elif mode_code == FULL_CYCLE_MODE_CODE:
+        # Items still due in the plan, plus everything already revised today
+        condition = f"""
+            item_id IN (
+                SELECT item_id FROM revisions
+                WHERE hafiz_id = {auth} AND revision_date = '{current_date}'
+                    AND mode_code = '{FULL_CYCLE_MODE_CODE}'
+            )
+        """
+        if plan_id is not None:
+            condition = f"({_full_cycle_plan_condition(auth, current_date, plan_id)}) OR {condition}"
+    else:
+        raise ValueError(f"Unknown mode_code: {mode_code}")
+
+    mode_items = _mode_specific_hafizs_items_sql(auth, get_mode_condition(mode_code), current_date)
+    return f"""
+        SELECT DISTINCT item_id FROM ({mode_items}) AS mode_items
+        WHERE {condition}
+    """
+
+
+def get_mode_queue_page(
+    auth: int,
+    mode_code: str,
+    current_date: str,
+    offset: int = 0,
+    limit: int = None,
+    plan_id: int = None,
+    show_loved_only: bool = False,
+) -> tuple[list[int], bool]:
+    """One page of a mode's item_ids in item_id order, and whether more follow.
+
+    Without a limit the whole queue is returned.
+    """
+    queue = get_mode_queue_sql(auth, mode_code, current_date, plan_id, show_loved_only)
+    # One extra row tells whether another page follows
+    page_clause = f"LIMIT {limit + 1} OFFSET {offset}" if limit and limit > 0 else ""
+    rows = db.q(f"SELECT item_id FROM ({queue}) AS queue ORDER BY item_id {page_clause}")
+    item_ids = [row["item_id"] for row in rows]
+    if page_clause and len(item_ids) > limit:
+        return item_ids[:limit], True
+    return item_ids, False
+
+
+def get_mode_queue_counts(auth: int, mode_codes: list[str], current_date: str, plan_id: int = None) -> dict:
+    """Item count of each mode's queue, in one round trip: {mode_code: count}."""
+    if not mode_codes:
+        return {}
+    counts = "\nUNION ALL\n".join(
+        f"SELECT '{mode_code}' AS mode_code, COUNT(*) AS item_count "
+        f"FROM ({get_mode_queue_sql(auth, mode_code, current_date, plan_id)}) AS queue"
+        for mode_code in mode_codes
+    )
+    return {row["mode_code"]: row["item_count"] for row in db.q(counts)}
+
+
+def is_full_cycle_plan_finished(auth: int, current_date: str, plan_id: int = None) -> bool:
+    """True when the open plan has no memorized item left to revise."""
+    if plan_id is None:
+        return False
+    mode_items = _mode_specific_hafizs_items_sql(
+        auth, get_mode_condition(FULL_CYCLE_MODE_CODE), current_date
+    )
+    remaining = db.q(f"""
+        SELECT 1 FROM ({mode_items}) AS mode_items
+        WHERE {_full_cycle_plan_condition(auth, current_date, plan_id)}
+        LIMIT 1
+    """)
+    return not remaining
+
+
+def get_datewise_revisions(hafiz_id: int, start_date: str, end_date: str) -> list[dict]:
+    """Get a hafiz's revisions between two dates (inclusive), in page order.
+
+    Rows carry the item's page_id and description, so report ranges can be
+    built and labelled without further lookups.
+    """
     qry = f"""
-        SELECT revisions.id, revisions.item_id, revisions.revision_date, 
-               revisions.mode_code, items.page_id
+        SELECT revisions.id, revisions.item_id, revisions.revision_date,
+               revisions.mode_code, items.page_id, items.description
         FROM revisions
-        LEFT JOIN items ON revisions.item_id = items.id
-        WHERE revisions.revision_date IN ({dates_str}) {hafiz_condition}
-        ORDER BY revisions.revision_date DESC, revisions.mode_code ASC
+        JOIN items ON revisions.item_id = items.id
+        WHERE revisions.hafiz_id = {hafiz_id}
+            AND revisions.revision_date BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY items.page_id ASC, revisions.id ASC
     """
     return db.q(qry)
 
 
+def get_revision_daily_rollup(hafiz_id: int, start_date: str, end_date: str) -> list[dict]:
+    """Per date and mode revision totals between two dates (inclusive), newest date first.
+
+    Each row has revision_date, mode_code, revision_count and page_equivalents.
+    """
+    return db.q(f"""
+        SELECT revision_date, mode_code, revision_count, page_equivalents
+        FROM revision_daily_rollup
+        WHERE hafiz_id = {hafiz_id}
+            AND revision_date BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY revision_date DESC, mode_code ASC
+    """)
+
+
+def get_daily_page_equivalents(hafiz_id: int, dates: list[str]) -> dict:
+    """Pages revised (all modes) on each of the given dates, from the rollup.
+
+    Dates without revisions are omitted.
+    """
+    date_list = ", ".join(f"'{date}'" for date in dates)
+    rows = db.q(f"""
+        SELECT revision_date, SUM(page_equivalents) AS page_equivalents
+        FROM revision_daily_rollup
+        WHERE hafiz_id = {hafiz_id} AND revision_date IN ({date_list})
+        GROUP BY revision_date
+    """)
+    return {row["revision_date"]: row["page_equivalents"] for row in rows}
+
+
+def get_mode_day_revisions(hafiz_id: int, dates: list[str]) -> dict:
+    """Page count and revision ids per (mode_code, revision_date) on the given dates.
+
+    Returns {(mode_code, revision_date): {"page_count": float, "revision_ids": "3,8,9"}},
+    with the ids in ascending order; groups without revisions are omitted.
+    """
+    date_list = ", ".join(f"'{date}'" for date in dates)
+    rows = db.q(f"""
+        SELECT day.mode_code, day.revision_date,
+            COALESCE(SUM(items.page_portion), 0) AS page_count,
+            GROUP_CONCAT(day.id) AS revision_ids
+        FROM (
+            SELECT id, item_id, mode_code, revision_date FROM revisions
+            WHERE hafiz_id = {hafiz_id} AND revision_date IN ({date_list})
+            ORDER BY id
+        ) AS day
+        JOIN items ON items.id = day.item_id
+        GROUP BY day.mode_code, day.revision_date
+    """)
+    return {
+        (row["mode_code"], row["revision_date"]): {
+            "page_count": row["page_count"],
+            "revision_ids": row["revision_ids"],
+        }
+        for row in rows
+    }
+
+
+# Recomputes a hafiz's rollup rows for every mode on one date
+_REBUILD_DAILY_ROLLUP_SQL = """
+    INSERT INTO revision_daily_rollup
+        (hafiz_id, revision_date, mode_code, revision_count, page_equivalents)
+    SELECT
+        day.hafiz_id, day.revision_date, day.mode_code,
+        COUNT(*), COALESCE(SUM(items.page_portion), 0)
+    FROM revisions AS day
+    LEFT JOIN items ON items.id = day.item_id
+    WHERE day.hafiz_id = ? AND day.revision_date = ?
+    GROUP BY day.hafiz_id, day.revision_date, day.mode_code
+"""
+
+
+def rebuild_revision_daily_rollup(hafiz_id: int, revision_date: str) -> None:
+    """Recompute a hafiz's rollup rows for one date from its revisions.
+
+    The triggers apply each revision and page portion change as a delta;
+    Close Date runs this for the closed day so the day it leaves behind is
+    re-derived from its revisions rather than from accumulated deltas.
+    """
+    db.conn.execute(
+        "DELETE FROM revision_daily_rollup WHERE hafiz_id = ? AND revision_date = ?",
+        (hafiz_id, revision_date),
+    )
+    db.conn.execute(_REBUILD_DAILY_ROLLUP_SQL, (hafiz_id, revision_date))
+
+
 def get_earliest_revision_date(hafiz_id: int = None) -> str | None:
     """Get the earliest revision date for a hafiz."""
-    qry = "SELECT MIN(revision_date) AS earliest_date FROM revisions"
+    qry = "SELECT MIN(revision_date) AS earliest_date FROM revision_daily_rollup"
     if hafiz_id:
         qry += f" WHERE hafiz_id = {hafiz_id}"
     result = db.q(qry)
@@ -329,39 +723,29 @@ def get_item_page_portion(item_id: int) -> float:
     Calculates the portion of a page that a single item represents.
     For example, if a page is divided into 4 items, each item represents 0.25 of the page.
     """
-    page_no = items[item_id].page_id
-    total_parts = items(where=f"page_id = {page_no} and active = 1")
-    if not total_parts:
-        return 0
-    return 1 / len(total_parts)
+    return quran_metadata.item_page_portion(item_id)
 
 
 def get_page_count(records: list = None, item_ids: list = None) -> float:
-    total_count = 0
     if item_ids:
         process_items = item_ids
     elif records:
-        process_items = [record.item_id for record in records]
+        process_items = (record.item_id for record in records)
     else:
-        return format_number(total_count)
+        return format_number(0)
 
-    # Calculate page count
-    for item_id in process_items:
-        total_count += get_item_page_portion(item_id)
-    return format_number(total_count)
+    return format_number(quran_metadata.items_page_count(process_items))
 
 
 def get_surah_name(page_id=None, item_id=None):
     if item_id:
-        surah_id = items[item_id].surah_id
+        surah_id = quran_metadata.item_surah_id(item_id)
     else:
-        surah_id = items(where=f"page_id = {page_id}")[0].surah_id
-    surah_details = surahs[surah_id]
-    return surah_details.name
+        surah_id = quran_metadata.page_surah_id(page_id)
+    return quran_metadata.surah_name(surah_id)
 
 def get_page_number(item_id):
-    page_id = items[item_id].page_id
-    return pages[page_id].page_number
+    return quran_metadata.item_page_number(item_id)
 
 def get_mode_name(mode_code: str):
     try:
@@ -392,11 +776,8 @@ def get_last_item_id():
 
 def get_juz_name(page_id=None, item_id=None):
     if item_id:
-        qry = f"SELECT pages.juz_number FROM pages LEFT JOIN items ON pages.id = items.page_id WHERE items.id = {item_id}"
-        juz_number = db.q(qry)[0]["juz_number"]
-    else:
-        juz_number = pages[page_id].juz_number
-    return juz_number
+        return quran_metadata.item_juz_number(item_id)
+    return quran_metadata.page_juz_number(page_id)
 
 def get_mode_name_and_code():
     all_modes = modes()
@@ -408,16 +789,7 @@ def get_page_part_info(item_id: int) -> tuple[int, int] | None:
     """
     Returns (part_number, total_parts) if item is part of a split page, None otherwise.
     """
-    page_no = items[item_id].page_id
-    page_items = items(where=f"page_id = {page_no} and active = 1", order_by="id ASC")
-    total_parts = len(page_items)
-    if total_parts <= 1:
-        return None
-    # Find position of this item in the list
-    for idx, item in enumerate(page_items):
-        if item.id == item_id:
-            return (idx + 1, total_parts)
-    return None
+    return quran_metadata.item_part_info(item_id)
 
 def get_status(hafiz_item) -> str:
     """Derive status from memorized flag and mode_code."""
@@ -451,30 +823,96 @@ def get_status_display(status: str) -> tuple[str, str]:
     """Get (icon, label) for a status."""
     return STATUS_DISPLAY.get(status, ("❓", "Unknown"))
 
+# hafiz_id -> (hafizs_items version, histogram)
+_status_histogram_cache = {}
+
+_HISTOGRAM_STATUSES = [
+    STATUS_NOT_MEMORIZED,
+    STATUS_LEARNING,
+    STATUS_REPS,
+    STATUS_SOLID,
+    STATUS_STRUGGLING,
+]
+
+
+def _hafizs_items_version(hafiz_id: int) -> int:
+    """Change counter bumped by triggers whenever the hafiz's item statuses change."""
+    rows = db.q(f"SELECT version FROM hafizs_items_versions WHERE hafiz_id = {hafiz_id}")
+    return rows[0]["version"] if rows else 0
+
+
+def _load_status_histogram(hafiz_id: int) -> dict:
+    # Same classification as get_status, done in SQL
+    rep_modes = ", ".join(
+        f"'{mode_code}'"
+        for mode_code in (
+            DAILY_REPS_MODE_CODE,
+            WEEKLY_REPS_MODE_CODE,
+            FORTNIGHTLY_REPS_MODE_CODE,
+            MONTHLY_REPS_MODE_CODE,
+        )
+    )
+    rows = db.q(f"""
+        SELECT
+            CASE
+                WHEN NOT COALESCE(hafizs_items.memorized, 0) THEN '{STATUS_NOT_MEMORIZED}'
+                WHEN hafizs_items.mode_code = '{NEW_MEMORIZATION_MODE_CODE}' THEN '{STATUS_LEARNING}'
+                WHEN hafizs_items.mode_code IN ({rep_modes}) THEN '{STATUS_REPS}'
+                WHEN hafizs_items.mode_code = '{FULL_CYCLE_MODE_CODE}' THEN '{STATUS_SOLID}'
+                WHEN hafizs_items.mode_code = '{SRS_MODE_CODE}' THEN '{STATUS_STRUGGLING}'
+                ELSE '{STATUS_NOT_MEMORIZED}'
+            END AS status,
+            COALESCE(hafizs_items.memorized, 0) <> 0 AS memorized,
+            COUNT(*) AS item_count,
+            COALESCE(SUM(items.page_portion), 0) AS page_count
+        FROM hafizs_items
+        JOIN items ON items.id = hafizs_items.item_id
+        WHERE hafizs_items.hafiz_id = {hafiz_id}
+        GROUP BY status, memorized
+    """)
+
+    histogram = {
+        key: {"items": 0, "pages": 0.0}
+        for key in [*_HISTOGRAM_STATUSES, "memorized", "unmemorized", "total"]
+    }
+    for row in rows:
+        tab = "memorized" if row["memorized"] else "unmemorized"
+        for key in (row["status"], tab, "total"):
+            histogram[key]["items"] += row["item_count"]
+            histogram[key]["pages"] += row["page_count"]
+    return histogram
+
+
+def get_status_histogram(hafiz_id: int) -> dict:
+    """Item and page-equivalent counts per status, plus memorized/unmemorized/total.
+
+    Returns {key: {"items": int, "pages": float}} for each status and for
+    "memorized", "unmemorized" and "total". Cached per hafiz until the
+    hafiz's hafizs_items rows change.
+    """
+    version = _hafizs_items_version(hafiz_id)
+    cached = _status_histogram_cache.get(hafiz_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    histogram = _load_status_histogram(hafiz_id)
+    _status_histogram_cache[hafiz_id] = (version, histogram)
+    return histogram
+
+
 def get_status_counts(hafiz_id: int) -> dict:
     """Get page count for each status for dashboard stats."""
-    all_items = hafizs_items(where=f"hafiz_id = {hafiz_id}")
-
-    # Group item_ids by status
-    groups = {
-        STATUS_NOT_MEMORIZED: [],
-        STATUS_LEARNING: [],
-        STATUS_REPS: [],
-        STATUS_SOLID: [],
-        STATUS_STRUGGLING: [],
+    histogram = get_status_histogram(hafiz_id)
+    return {
+        key: format_number(histogram[key]["pages"])
+        for key in [*_HISTOGRAM_STATUSES, "total"]
     }
 
-    for hi in all_items:
-        status = get_status(hi)
-        if status in groups:
-            groups[status].append(hi.item_id)
 
-    # Calculate page count for each group
+def get_tab_counts(hafiz_id: int) -> dict:
+    """Get page counts for tab filter: all, memorized, unmemorized."""
+    histogram = get_status_histogram(hafiz_id)
     return {
-        STATUS_NOT_MEMORIZED: get_page_count(item_ids=groups[STATUS_NOT_MEMORIZED]),
-        STATUS_LEARNING: get_page_count(item_ids=groups[STATUS_LEARNING]),
-        STATUS_REPS: get_page_count(item_ids=groups[STATUS_REPS]),
-        STATUS_SOLID: get_page_count(item_ids=groups[STATUS_SOLID]),
-        STATUS_STRUGGLING: get_page_count(item_ids=groups[STATUS_STRUGGLING]),
-        "total": get_page_count(item_ids=[hi.item_id for hi in all_items]),
+        "all": format_number(histogram["total"]["pages"]),
+        "memorized": format_number(histogram["memorized"]["pages"]),
+        "unmemorized": format_number(histogram["unmemorized"]["pages"]),
     }
@@ -26,18 +26,27 @@ from constants import (
     DEFAULT_REP_COUNTS
 )
 
+# Marks PageDescription's description as not supplied (None is a valid value)
+_FETCH_DESCRIPTION = object()
+
+
 def PageDescription(
     item_id,
     link: str = None,
     is_link: bool = True,
     is_bold: bool = True,
     custom_text="",
+    description=_FETCH_DESCRIPTION,
 ):
     """
     Renders a description of the page (Page number - Surah name).
-    Fetches data from DB using item_id.
+    Fetches data from DB using item_id, unless the item's description
+    (items.description, possibly None) is passed in.
     """
-    item_description = items[item_id].description
+    if description is _FETCH_DESCRIPTION:
+        item_description = items[item_id].description
+    else:
+        item_description = description
     if not item_description:
         item_description = (
             Span(get_page_number(item_id), cls=TextPresets.bold_sm if is_bold else ""),
@@ -1,6 +1,6 @@
 from fasthtml.common import *
 from monsterui.all import *
-from database import hafizs
+from app.hafiz_context import get_hafiz
 from app.common_model import get_status_counts, get_status_display
 from constants import (
     STATUS_NOT_MEMORIZED,
@@ -49,7 +49,7 @@ def MainArea(*args, active=None, auth=None):
     hafiz_name_text = "Select hafiz"
     if auth is not None:
         try:
-             hafiz_name_text = hafizs[auth].name
+             hafiz_name_text = get_hafiz(auth).name
         except:
              pass
              
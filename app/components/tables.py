@@ -5,7 +5,7 @@ from app.common_model import (
     get_page_part_info, 
     get_page_number,
 )
-from database import surahs
+from app.quran_metadata import surah_name as get_surah_name_by_id
 from app.fixed_reps import REP_MODES_CONFIG
 from constants import (
     DAILY_REPS_MODE_CODE,
@@ -67,7 +67,7 @@ def SurahHeader(surah_id, juz_number, colspan=6):
         juz_number: Juz number (1-30)
         colspan: Number of columns to span for the label cell
     """
-    surah_name = surahs[surah_id].name
+    surah_name = get_surah_name_by_id(surah_id)
     
     # Checkbox with data attributes for Juz and Surah
     checkbox = fh.Input(
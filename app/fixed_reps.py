@@ -14,7 +14,6 @@ Related modules:
 - common_function.py: MODE_PREDICATES for filtering items in summary tables
 - srs_reps.py: SRS mode uses adaptive intervals (fundamentally different)
 """
-from app.common_model import get_hafizs_items, get_current_date, get_mode_count
 from constants import (
     DEFAULT_REP_COUNTS,
     DAILY_REPS_MODE_CODE,
@@ -23,7 +22,6 @@ from constants import (
     MONTHLY_REPS_MODE_CODE,
     FULL_CYCLE_MODE_CODE,
 )
-from database import hafizs_items
 from utils import add_days_to_date
 
 # Maps mode code to the corresponding custom threshold column name in hafizs_items
@@ -75,46 +73,3 @@ def get_threshold_for_mode(hafiz_item, mode_code):
 def set_next_review(hafiz_item, interval, current_date):
     hafiz_item.next_interval = interval
     hafiz_item.next_review = add_days_to_date(current_date, interval)
-
-
-def update_rep_item(rev):
-    """
-    Process a revision in any rep mode (Daily/Weekly/Fortnightly/Monthly).
-
-    Logic:
-    1. Check if item has completed threshold repetitions in current mode
-    2. If not complete: schedule next review with same interval
-    3. If complete: graduate to next mode with its interval (or Full Cycle)
-
-    This single function handles all rep modes uniformly using REP_MODES_CONFIG.
-    """
-    config = REP_MODES_CONFIG.get(rev.mode_code)
-    if not config:
-        return
-
-    hafiz_item = get_hafizs_items(rev.item_id)
-    if hafiz_item is None:
-        return
-    current_date = get_current_date(rev.hafiz_id)
-
-    # Preserve current interval before updating (for history tracking)
-    hafiz_item.last_interval = hafiz_item.next_interval
-
-    threshold = get_threshold_for_mode(hafiz_item, rev.mode_code)
-    if get_mode_count(rev.item_id, rev.mode_code, rev.hafiz_id) < threshold:
-        # Not yet at threshold: stay in current mode, schedule next review
-        set_next_review(hafiz_item, config["interval"], current_date)
-    else:
-        # Reached threshold: graduate to next mode
-        hafiz_item.mode_code = config["next_mode_code"]
-        if config["next_mode_code"] == FULL_CYCLE_MODE_CODE:
-            # Final graduation: clear scheduling fields for Full Cycle
-            hafiz_item.memorized = True
-            hafiz_item.next_interval = None
-            hafiz_item.next_review = None
-        else:
-            # Graduate to next rep mode: use that mode's interval
-            next_config = REP_MODES_CONFIG[config["next_mode_code"]]
-            set_next_review(hafiz_item, next_config["interval"], current_date)
-
-    hafizs_items.update(hafiz_item)
@@ -0,0 +1,318 @@
+"""
+Review Load Forecast
+
+Projects the pages each hafiz will have due per mode over the coming days,
+without closing any dates. The projection starts from the current hafizs_items
+state and assumes every page is revised on the day it falls due (overdue pages
+on the current date):
+
+- Rep modes (Daily/Weekly/Fortnightly/Monthly) repeat at their REP_MODES_CONFIG
+  interval until the item's threshold is reached, then graduate to the next
+  mode. Every item's whole chain of reviews is laid out with array arithmetic.
+- SRS pages move through the prime interval sequence with ratings drawn from an
+  assumed distribution, so the SRS load is an expectation: the page mass due on
+  a day is split by rating into (day, interval) buckets, which are carried
+  forward for all hafizs at once.
+- Full Cycle continues at the hafiz's recent pace (page equivalents per day over
+  the last FULL_CYCLE_PACE_DAYS in revision_daily_rollup). The pages left in
+  the open plan give the number of days until it completes.
+
+New Memorization is driven by the hafiz rather than a schedule and is not forecast.
+"""
+
+from types import SimpleNamespace
+import numpy as np
+from constants import (
+    FORECAST_DAYS,
+    FULL_CYCLE_MODE_CODE,
+    SRS_MODE_CODE,
+)
+from database import db
+from utils import add_days_to_date
+from app.fixed_reps import REP_MODES_CONFIG, get_threshold_for_mode
+from app.srs_reps import (
+    SRS_END_INTERVAL,
+    SRS_INTERVALS,
+    SRS_INTERVALS_ARRAY,
+    compute_srs_intervals,
+    step_srs_interval_indexes,
+)
+
+# Assumed share of Good/Ok/Bad ratings for SRS reviews
+DEFAULT_RATING_DISTRIBUTION = {1: 0.7, 0: 0.2, -1: 0.1}
+
+FULL_CYCLE_PACE_DAYS = 14  # Days of history that set the Full Cycle pace
+
+FORECAST_MODE_CODES = [*REP_MODES_CONFIG, SRS_MODE_CODE, FULL_CYCLE_MODE_CODE]
+
+
+# === Bulk Loaders ===
+
+
+def _load_hafizs(hafiz_ids: list[int] | None) -> list[dict]:
+    condition = ""
+    if hafiz_ids is not None:
+        condition = f"AND id IN ({', '.join(map(str, hafiz_ids)) or 'NULL'})"
+    return db.q(
+        f"""
+        SELECT id, "current_date" AS current_date FROM hafizs
+        WHERE "current_date" IS NOT NULL {condition}
+        ORDER BY id
+        """
+    )
+
+
+def _load_scheduled_items(hafiz_ids: list[int]) -> list[dict]:
+    """Rep mode and SRS items with their page portion, days until due and the
+    revisions each has in every rep mode before its hafiz's current date."""
+    rep_mode_counts = ", ".join(
+        f"SUM(revisions.mode_code = '{mode_code}') AS count_{mode_code}"
+        for mode_code in REP_MODES_CONFIG
+    )
+    scheduled_modes = ", ".join(f"'{mode_code}'" for mode_code in FORECAST_MODE_CODES[:-1])
+    return db.q(
+        f"""
+        SELECT
+            hafizs_items.*,
+            hafizs."current_date" AS current_date,
+            COALESCE(items.page_portion, 1) AS page_portion,
+            CAST(julianday(hafizs_items.next_review) - julianday(hafizs."current_date") AS INTEGER)
+                AS due_in,
+            {", ".join(f"COALESCE(mode_counts.count_{code}, 0) AS count_{code}" for code in REP_MODES_CONFIG)}
+        FROM hafizs_items
+        JOIN hafizs ON hafizs.id = hafizs_items.hafiz_id
+        LEFT JOIN items ON items.id = hafizs_items.item_id
+        LEFT JOIN (
+            SELECT revisions.hafiz_id, revisions.item_id, {rep_mode_counts}
+            FROM revisions
+            JOIN hafizs ON hafizs.id = revisions.hafiz_id
+            WHERE revisions.revision_date < hafizs."current_date"
+            GROUP BY revisions.hafiz_id, revisions.item_id
+        ) AS mode_counts
+            ON mode_counts.hafiz_id = hafizs_items.hafiz_id
+            AND mode_counts.item_id = hafizs_items.item_id
+        WHERE hafizs_items.hafiz_id IN ({", ".join(map(str, hafiz_ids))})
+            AND hafizs_items.mode_code IN ({scheduled_modes})
+        ORDER BY hafizs_items.id
+        """
+    )
+
+
+def _load_full_cycle_state(hafiz_ids: list[int]) -> dict:
+    """hafiz_id -> (pace in pages per day, pages left in the open plan or None)."""
+    id_list = ", ".join(map(str, hafiz_ids))
+    paces = db.q(
+        f"""
+        SELECT hafizs.id AS hafiz_id, COALESCE(SUM(rollup.page_equivalents), 0) AS pages
+        FROM hafizs
+        LEFT JOIN revision_daily_rollup AS rollup
+            ON rollup.hafiz_id = hafizs.id
+            AND rollup.mode_code = '{FULL_CYCLE_MODE_CODE}'
+            AND rollup.revision_date >= date(hafizs."current_date", '-{FULL_CYCLE_PACE_DAYS} day')
+            AND rollup.revision_date < hafizs."current_date"
+        WHERE hafizs.id IN ({id_list})
+        GROUP BY hafizs.id
+        """
+    )
+    # Memorized Full Cycle/SRS pages not yet revised in the latest open plan
+    plans_left = db.q(
+        f"""
+        SELECT open_plans.hafiz_id, COALESCE(SUM(items.page_portion), 0) AS pages
+        FROM (
+            SELECT hafiz_id, MAX(id) AS plan_id FROM plans
+            WHERE hafiz_id IN ({id_list}) AND completed <> 1
+            GROUP BY hafiz_id
+        ) AS open_plans
+        LEFT JOIN hafizs_items
+            ON hafizs_items.hafiz_id = open_plans.hafiz_id
+            AND hafizs_items.memorized = 1
+            AND hafizs_items.mode_code IN ('{FULL_CYCLE_MODE_CODE}', '{SRS_MODE_CODE}')
+            AND NOT EXISTS (
+                SELECT 1 FROM revisions
+                WHERE revisions.hafiz_id = hafizs_items.hafiz_id
+                    AND revisions.item_id = hafizs_items.item_id
+                    AND revisions.plan_id = open_plans.plan_id
+                    AND revisions.mode_code = '{FULL_CYCLE_MODE_CODE}'
+            )
+        LEFT JOIN items ON items.id = hafizs_items.item_id
+        GROUP BY open_plans.hafiz_id
+        """
+    )
+    pages_left = {row["hafiz_id"]: row["pages"] for row in plans_left}
+    return {
+        row["hafiz_id"]: (row["pages"] / FULL_CYCLE_PACE_DAYS, pages_left.get(row["hafiz_id"]))
+        for row in paces
+    }
+
+
+# === Projections ===
+
+
+def _item_arrays(items: list[dict], position: dict) -> tuple:
+    """Each item's hafiz index, days until due and page portion."""
+    hafiz_index = np.array([position[item["hafiz_id"]] for item in items], dtype=np.int64)
+    # Unscheduled and overdue pages are due on the current date
+    due_in = np.array([max(item["due_in"] or 0, 0) for item in items], dtype=np.int64)
+    pages = np.array([item["page_portion"] for item in items], dtype=np.float64)
+    return hafiz_index, due_in, pages
+
+
+def _add_load(load: np.ndarray, hafiz_index: np.ndarray, days: np.ndarray, pages: np.ndarray) -> None:
+    """Add pages to load[hafiz, day], dropping days past the horizon."""
+    in_horizon = (days >= 0) & (days < load.shape[1])
+    np.add.at(load, (hafiz_index[in_horizon], days[in_horizon]), pages[in_horizon])
+
+
+def _project_rep_modes(items: list[dict], hafiz_index, due_in, pages, loads: dict) -> None:
+    """Lay out every rep-mode item's remaining reviews through its graduations."""
+    mode_codes = np.array([item["mode_code"] for item in items], dtype=object)
+    # Reviews still needed in each mode: the revision at the threshold graduates
+    hafiz_item_rows = [SimpleNamespace(**item) for item in items]
+    reps_left = {
+        mode_code: np.array(
+            [
+                max(get_threshold_for_mode(row, mode_code) - getattr(row, f"count_{mode_code}"), 1)
+                for row in hafiz_item_rows
+            ],
+            dtype=np.int64,
+        )
+        for mode_code in REP_MODES_CONFIG
+    }
+
+    # Rows entering the mode, and the day of their first review in it
+    rows = np.array([], dtype=np.int64)
+    start_days = np.array([], dtype=np.int64)
+    for mode_code, config in REP_MODES_CONFIG.items():
+        in_mode = np.flatnonzero(mode_codes == mode_code)
+        rows = np.concatenate([rows, in_mode])
+        start_days = np.concatenate([start_days, due_in[in_mode]])
+
+        counts = reps_left[mode_code][rows]
+        # Review k of a row falls on start + k * interval
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        days = np.repeat(start_days, counts) + offsets * config["interval"]
+        _add_load(loads[mode_code], hafiz_index[np.repeat(rows, counts)], days, np.repeat(pages[rows], counts))
+
+        next_mode_code = config["next_mode_code"]
+        if next_mode_code == FULL_CYCLE_MODE_CODE:
+            break
+        # Graduates are first due one interval of the next mode after their last review
+        start_days = start_days + (counts - 1) * config["interval"] + REP_MODES_CONFIG[next_mode_code]["interval"]
+        still_in_horizon = start_days < loads[mode_code].shape[1]
+        rows, start_days = rows[still_in_horizon], start_days[still_in_horizon]
+
+
+def _project_srs(items: list[dict], hafiz_index, due_in, pages, load, rating_distribution: dict) -> None:
+    """Expected SRS load: page mass per (hafiz, day, interval index), carried forward by rating."""
+    days = load.shape[1]
+    # buckets[h, d, i]: pages due on day d that were scheduled with SRS_INTERVALS[i]
+    buckets = np.zeros((load.shape[0], days, len(SRS_INTERVALS)))
+
+    # The first review uses each item's real interval (it may be overdue)
+    _add_load(load, hafiz_index, due_in, pages)
+    review_dates = np.array([item["current_date"] for item in items], dtype="datetime64[D]") + due_in
+    for rating, probability in rating_distribution.items():
+        result = compute_srs_intervals(
+            review_dates,
+            [item["last_review"] for item in items],
+            [item["next_interval"] for item in items],
+            np.full(len(items), rating),
+        )
+        next_days = due_in + result["next_interval"]
+        keep = result["scheduled"] & ~result["graduated"] & (next_days < days)
+        np.add.at(
+            buckets,
+            (
+                hafiz_index[keep],
+                next_days[keep],
+                np.searchsorted(SRS_INTERVALS_ARRAY, result["next_interval"][keep]),
+            ),
+            pages[keep] * probability,
+        )
+
+    # Later reviews fall on time, so the actual interval is the planned one and
+    # a rating moves one step along the sequence from the bucket's interval
+    interval_indexes = np.arange(len(SRS_INTERVALS))
+    transitions = []
+    for rating, probability in rating_distribution.items():
+        next_indexes = step_srs_interval_indexes(interval_indexes, rating)
+        stays = SRS_INTERVALS_ARRAY[next_indexes] <= SRS_END_INTERVAL
+        transitions.append((interval_indexes[stays], next_indexes[stays], probability))
+
+    for day in range(days):
+        due = buckets[:, day, :]
+        load[:, day] += due.sum(axis=1)
+        for from_indexes, to_indexes, probability in transitions:
+            to_days = day + SRS_INTERVALS_ARRAY[to_indexes]
+            in_horizon = to_days < days
+            np.add.at(
+                buckets,
+                (slice(None), to_days[in_horizon], to_indexes[in_horizon]),
+                due[:, from_indexes[in_horizon]] * probability,
+            )
+
+
+def forecast_review_load(
+    hafiz_ids: list[int] = None, days: int = FORECAST_DAYS, rating_distribution: dict = None
+) -> dict:
+    """
+    Projected pages due per day and mode for the next `days` days of each hafiz.
+
+    hafiz_ids defaults to every hafiz with a current date. rating_distribution
+    maps SRS ratings (1/0/-1) to their assumed share (DEFAULT_RATING_DISTRIBUTION).
+
+    Returns hafiz_id -> forecast:
+        dates: The forecast dates, starting at the hafiz's current date
+        modes: mode_code -> array of page equivalents due on each date
+        total: Page equivalents due on each date across modes
+        full_cycle_pace: Full Cycle page equivalents revised per day
+        full_cycle_plan_days_left: Days until the open plan completes at that
+            pace (None without an open plan or without a pace)
+    """
+    rating_distribution = rating_distribution or DEFAULT_RATING_DISTRIBUTION
+    hafiz_rows = _load_hafizs(hafiz_ids)
+    if not hafiz_rows:
+        return {}
+    ids = [row["id"] for row in hafiz_rows]
+    position = {hafiz_id: index for index, hafiz_id in enumerate(ids)}
+    loads = {mode_code: np.zeros((len(ids), days)) for mode_code in FORECAST_MODE_CODES}
+
+    items = _load_scheduled_items(ids)
+    srs_items = [item for item in items if item["mode_code"] == SRS_MODE_CODE]
+    rep_items = [item for item in items if item["mode_code"] != SRS_MODE_CODE]
+    _project_rep_modes(rep_items, *_item_arrays(rep_items, position), loads)
+    _project_srs(
+        srs_items, *_item_arrays(srs_items, position), loads[SRS_MODE_CODE], rating_distribution
+    )
+
+    full_cycle_state = _load_full_cycle_state(ids)
+    paces = np.array([full_cycle_state[hafiz_id][0] for hafiz_id in ids])
+    loads[FULL_CYCLE_MODE_CODE][:] = paces[:, None]
+
+    total = sum(loads.values())
+    forecasts = {}
+    for row in hafiz_rows:
+        index = position[row["id"]]
+        pace, pages_left = full_cycle_state[row["id"]]
+        forecasts[row["id"]] = {
+            "dates": [add_days_to_date(row["current_date"], day) for day in range(days)],
+            "modes": {mode_code: loads[mode_code][index] for mode_code in FORECAST_MODE_CODES},
+            "total": total[index],
+            "full_cycle_pace": pace,
+            "full_cycle_plan_days_left": (
+                int(np.ceil(pages_left / pace)) if pages_left is not None and pace else None
+            ),
+        }
+    return forecasts
+
+
+def forecast_as_json(forecast: dict) -> dict:
+    """A forecast with its loads as lists rounded to 2 decimals, for JSON responses."""
+    return {
+        **forecast,
+        "modes": {
+            mode_code: np.round(load, 2).tolist() for mode_code, load in forecast["modes"].items()
+        },
+        "total": np.round(forecast["total"], 2).tolist(),
+        "full_cycle_pace": round(float(forecast["full_cycle_pace"]), 2),
+    }
@@ -0,0 +1,96 @@
+"""
+Request-scoped hafiz context.
+
+The hafiz_auth beforeware loads the authenticated hafiz once per request and
+stores it here, together with the values most model functions need
+(current_date, page_size and the open Full Cycle plan). Model code reads the
+context instead of fetching hafizs[auth] again.
+
+The context lives in a ContextVar, so each request (asyncio task) sees only its
+own hafiz; sync route handlers run in a thread with a copy of the request's
+context. Outside a request (tests, scripts) no context is set and callers fall
+back to querying the database.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from database import db, hafizs, Hafiz
+
+
+@dataclass
+class HafizContext:
+    hafiz: Hafiz
+    current_date: str | None
+    page_size: int | None
+    plan_id: int | None
+
+
+_hafiz_context: ContextVar[HafizContext | None] = ContextVar("hafiz_context", default=None)
+
+
+def _load_plan_id(hafiz_id: int) -> int | None:
+    """Return the hafiz's open plan id, or None unless exactly one plan is open."""
+    open_plans = db.q(
+        f"SELECT id FROM plans WHERE hafiz_id = {hafiz_id} AND completed <> 1 ORDER BY id DESC"
+    )
+    if len(open_plans) == 1:
+        return open_plans[0]["id"]
+    return None
+
+
+def build_hafiz_context(hafiz: Hafiz) -> HafizContext:
+    """Build the context for an already loaded hafiz row (reads the open plan)."""
+    return HafizContext(
+        hafiz=hafiz,
+        current_date=hafiz.current_date,
+        page_size=hafiz.page_size,
+        plan_id=_load_plan_id(hafiz.id),
+    )
+
+
+def load_hafiz_context(hafiz_id: int) -> HafizContext:
+    """Load the hafiz and build its context; raises NotFoundError for an unknown id.
+
+    Only reads the database, so it can run in a worker thread; the caller then
+    sets the result with use_hafiz_context.
+    """
+    return build_hafiz_context(hafizs[hafiz_id])
+
+
+def use_hafiz_context(context: HafizContext):
+    _hafiz_context.set(context)
+
+
+def set_hafiz_context(hafiz: Hafiz) -> HafizContext:
+    """Populate the context for the current request from an already loaded hafiz row."""
+    context = build_hafiz_context(hafiz)
+    use_hafiz_context(context)
+    return context
+
+
+def clear_hafiz_context():
+    _hafiz_context.set(None)
+
+
+def get_hafiz_context(hafiz_id: int = None) -> HafizContext | None:
+    """Return the current context, or None if unset or it belongs to another hafiz."""
+    context = _hafiz_context.get()
+    if context is None:
+        return None
+    if hafiz_id is not None and context.hafiz.id != hafiz_id:
+        return None
+    return context
+
+
+def get_hafiz(hafiz_id: int) -> Hafiz:
+    """Return the hafiz row, from the context when it holds this hafiz."""
+    context = get_hafiz_context(hafiz_id)
+    if context is not None:
+        return context.hafiz
+    return hafizs[hafiz_id]
+
+
+def refresh_hafiz_context(hafiz_id: int):
+    """Reload the context after the hafiz row or its plans were written."""
+    if get_hafiz_context(hafiz_id) is not None:
+        set_hafiz_context(hafizs[hafiz_id])
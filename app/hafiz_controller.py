@@ -4,11 +4,24 @@ from utils import standardize_column
 from app.common_function import (
     create_app_with_auth,
     main_area,
+    error_toast,
     populate_hafizs_items_stat_columns,
 )
-from app.hafiz_model import get_hafizs_for_user, populate_hafiz_items, create_new_plan, reset_table_filters
-from app.hafiz_view import render_hafiz_card, render_add_hafiz_form, render_hafiz_selection_page
+from app.hafiz_model import (
+    get_hafizs_for_user,
+    populate_hafiz_items,
+    clone_hafiz_template,
+    create_new_plan,
+    reset_table_filters,
+)
+from app.hafiz_view import (
+    render_hafiz_card,
+    render_add_hafiz_form,
+    render_clone_hafiz_form,
+    render_hafiz_selection_page,
+)
 from database import hafizs, Hafiz
+from app.hafiz_context import get_hafiz, refresh_hafiz_context
 
 
 hafiz_app, rt = create_app_with_auth()
@@ -30,8 +43,9 @@ def get(sess):
     user_hafizs = get_hafizs_for_user(user_auth)
     cards = [render_hafiz_card(h, auth) for h in user_hafizs]
     hafiz_form = render_add_hafiz_form()
+    clone_form = render_clone_hafiz_form(user_hafizs) if user_hafizs else None
 
-    return render_hafiz_selection_page(cards, hafiz_form)
+    return render_hafiz_selection_page(cards, hafiz_form, clone_form)
 
 
 @rt("/selection")
@@ -52,6 +66,24 @@ def post(hafiz: Hafiz, sess):
     return RedirectResponse("/hafiz/selection", status_code=303)
 
 
+@hafiz_app.post("/clone")
+def clone_hafizs(template_hafiz_id: int, names: str, sess):
+    """Create several hafizs at once, each starting from a template hafiz's pages"""
+    user_id = sess["user_auth"]
+    try:
+        template = hafizs[template_hafiz_id]
+    except NotFoundError:
+        error_toast(sess, "Template hafiz not found")
+        return RedirectResponse("/hafiz/selection", status_code=303)
+    if template.user_id != user_id:
+        return RedirectResponse("/hafiz/selection", status_code=303)
+
+    # One name per line
+    new_names = [name.strip() for name in names.splitlines() if name.strip()]
+    clone_hafiz_template(template_hafiz_id, user_id, new_names)
+    return RedirectResponse("/hafiz/selection", status_code=303)
+
+
 @rt("/delete/{hafiz_id}")
 def delete(hafiz_id: int, sess):
     """Delete hafiz profile and all related data"""
@@ -71,16 +103,16 @@ def delete(hafiz_id: int, sess):
 @hafiz_app.get("/update_stats_column")
 def update_stats_column(req, auth, item_id: int = None):
     if item_id:
-        populate_hafizs_items_stat_columns(item_id)
+        populate_hafizs_items_stat_columns(auth, item_ids=[item_id])
     else:
-        populate_hafizs_items_stat_columns()
+        populate_hafizs_items_stat_columns(auth)
 
     return RedirectResponse(req.headers.get("referer", "/"), status_code=303)
 
 
 @hafiz_app.get("/settings")
 def settings_page(auth):
-    current_hafiz = hafizs[auth]
+    current_hafiz = get_hafiz(auth)
 
     def render_field(label, field_type, required=True, **kwargs):
         field_name = standardize_column(label)
@@ -129,8 +161,9 @@ def update_setings(auth, hafiz_data: Hafiz):
 
     hafizs.update(
         hafiz_data,
-        hafizs[auth].id,
+        auth,
     )
+    refresh_hafiz_context(auth)
     return Redirect("/")
 
 
@@ -7,7 +7,6 @@ Extracted from users_model.py for better separation of concerns.
 from dataclasses import dataclass
 from database import *
 from constants import *
-from app.common_function import get_page_number
 
 
 # ============================================================================
@@ -46,33 +45,77 @@ def reset_table_filters():
     revisions.xtra()
 
 
+def _insert_missing_hafiz_items(hafiz_id: int):
+    db.execute(
+        """
+        INSERT INTO hafizs_items (hafiz_id, item_id, page_number, mode_code)
+        SELECT ?, items.id, pages.page_number, ?
+        FROM items
+        LEFT JOIN pages ON pages.id = items.page_id
+        LEFT JOIN hafizs_items ON items.id = hafizs_items.item_id AND hafizs_items.hafiz_id = ?
+        WHERE items.active <> 0 AND hafizs_items.item_id IS NULL
+        ORDER BY items.id
+        """,
+        (hafiz_id, FULL_CYCLE_MODE_CODE, hafiz_id),
+    )
+
+
 def populate_hafiz_items(hafiz_id: int):
     """
     Populate hafizs_items table with all active items for a new hafiz.
 
     This creates entries for all Quran items (pages/parts) that don't yet
     exist for this hafiz, setting them to Full Cycle mode by default.
+    Runs as a single INSERT ... SELECT in one transaction.
     """
     # Reset xtra attributes
     hafizs_items.xtra()
 
-    # Find all active items not yet in hafizs_items for this hafiz
-    qry = f"""
-    SELECT items.id from items
-    LEFT JOIN hafizs_items ON items.id = hafizs_items.item_id AND hafizs_items.hafiz_id = {hafiz_id}
-    WHERE items.active <> 0 AND hafizs_items.item_id IS Null;
+    with db.conn:
+        _insert_missing_hafiz_items(hafiz_id)
+
+
+def clone_hafiz_template(template_hafiz_id: int, user_id: int, names: list[str]) -> list[int]:
     """
-    ct = db.q(qry)
-    missing_item_ids = [r["id"] for r in ct]
-
-    if missing_item_ids:
-        for missing_item_id in missing_item_ids:
-            hafizs_items.insert(
-                hafiz_id=hafiz_id,
-                item_id=missing_item_id,
-                page_number=get_page_number(missing_item_id),
-                mode_code=FULL_CYCLE_MODE_CODE,
+    Create one hafiz per name, each starting from the template hafiz's pages.
+
+    Every new hafiz gets the template's mode, memorized flag, schedule
+    (next_review, next_interval) and custom rep thresholds for each item, so
+    pre-set memorized ranges carry over and rep-mode items stay due on the
+    template's dates. Any remaining active items go to Full Cycle, and each
+    hafiz gets a new plan. Revision history and the stats derived from it
+    (last_review, streaks) are not copied. All hafizs are created in one
+    transaction; returns their ids.
+    """
+    hafizs_items.xtra()
+    plans.xtra()
+
+    hafiz_ids = []
+    with db.conn:
+        for name in names:
+            hafiz_id = hafizs.insert(name=name, user_id=user_id).id
+            db.execute(
+                """
+                INSERT INTO hafizs_items (
+                    hafiz_id, item_id, page_number, mode_code, memorized,
+                    next_review, next_interval,
+                    custom_daily_threshold, custom_weekly_threshold,
+                    custom_fortnightly_threshold, custom_monthly_threshold
+                )
+                SELECT ?, item_id, page_number, mode_code, memorized,
+                    next_review, next_interval,
+                    custom_daily_threshold, custom_weekly_threshold,
+                    custom_fortnightly_threshold, custom_monthly_threshold
+                FROM hafizs_items
+                WHERE hafiz_id = ?
+                ORDER BY id
+                """,
+                (hafiz_id, template_hafiz_id),
             )
+            _insert_missing_hafiz_items(hafiz_id)
+            create_new_plan(hafiz_id)
+            hafiz_ids.append(hafiz_id)
+    return hafiz_ids
 
 
 def create_new_plan(hafiz_id: int):
@@ -13,18 +13,19 @@ from monsterui.all import *
 # ============================================================================
 
 
-def render_hafiz_selection_page(cards, hafiz_form):
+def render_hafiz_selection_page(cards, hafiz_form, clone_form=None):
     """
     Render the hafiz selection page.
 
-    Shows all hafizs for the current user with option to add new one.
+    Shows all hafizs for the current user with option to add new one,
+    or several at once from an existing hafiz.
     """
     return Titled(
         "Hafiz Selection",
         Container(
             Div(
                 Div(*cards, cls=(FlexT.block, FlexT.wrap, "gap-4")),
-                hafiz_form,
+                Div(hafiz_form, clone_form, cls=(FlexT.block, FlexT.wrap, "gap-4")),
                 cls="space-y-4",
             )
         ),
@@ -120,3 +121,30 @@ def render_add_hafiz_form():
         ),
         cls="w-[300px]",
     )
+
+
+def render_clone_hafiz_form(template_hafizs):
+    """Render form for creating several hafizs from a template hafiz"""
+    return Card(
+        Titled(
+            "Add Hafizs from Template",
+            Form(
+                LabelSelect(
+                    *[Option(h.name, value=h.id) for h in template_hafizs],
+                    label="Template",
+                    name="template_hafiz_id",
+                    data_testid="clone-template-select",
+                ),
+                LabelTextArea(
+                    label="Names (one per line)",
+                    name="names",
+                    required=True,
+                    data_testid="clone-names-input",
+                ),
+                Button("Add Hafizs"),
+                action="/hafiz/clone",
+                method="post",
+            ),
+        ),
+        cls="w-[300px]",
+    )
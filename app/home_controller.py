@@ -1,11 +1,10 @@
 from fasthtml.common import *
 from monsterui.all import *
 from utils import add_days_to_date, current_time, day_diff
-from app.revision_model import cycle_full_cycle_plan_if_completed
-from app.new_memorization import (
-    update_hafiz_item_for_new_memorization,
-    make_new_memorization_table,
-)
+from app.close_date import CloseDateConflict, catch_up_close_date, close_date
+from app.forecast import forecast_as_json, forecast_review_load
+from app.hafiz_context import get_hafiz, refresh_hafiz_context
+from app.new_memorization import make_new_memorization_table
 from app.common_function import (
     create_app_with_auth,
     get_current_date,
@@ -15,21 +14,17 @@ from app.common_function import (
     render_range_row,
     make_summary_table,
     add_revision_record,
-    populate_hafizs_items_stat_columns,
+    add_revisions_bulk,
     get_hafizs_items,
     get_current_plan_id,
+    get_mode_queue_counts,
 )
 from database import hafizs, hafizs_items, items, revisions
 from constants import *
-from app.fixed_reps import REP_MODES_CONFIG, update_rep_item
-from app.srs_reps import (
-    update_hafiz_item_for_srs,
-    start_srs_for_ok_and_bad_rating,
-)
 from app.home_view import (
     create_stat_table,
     datewise_summary_table,
-    update_hafiz_item_for_full_cycle,
+    render_forecast_chart,
     render_pages_revised_indicator,
 )
 
@@ -37,52 +32,67 @@ from app.home_view import (
 home_app, rt = create_app_with_auth()
 
 
+HOME_MODE_CODES = [
+    NEW_MEMORIZATION_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    SRS_MODE_CODE,
+    DAILY_REPS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+    FORTNIGHTLY_REPS_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+]
+
+
+def render_lazy_panel(mode_code):
+    """Placeholder that loads the mode's table the first time its tab is shown."""
+    return Div(
+        Span(cls="loading loading-spinner loading-md"),
+        id=f"summary_table_{mode_code}",
+        cls="flex justify-center py-8",
+        hx_get=f"/page/{mode_code}",
+        hx_trigger="intersect once",
+        hx_swap="outerHTML",
+    )
+
+
+def render_lazy_forecast_chart():
+    """Placeholder that loads the forecast chart once the report page is shown."""
+    return Div(
+        Span(cls="loading loading-spinner loading-md"),
+        id="review-load-forecast",
+        cls="flex justify-center py-8",
+        hx_get="/report/forecast/chart",
+        hx_trigger="intersect once",
+        hx_swap="outerHTML",
+    )
+
+
 @rt
 def index(auth, sess):
     # Get hafiz's page_size setting (fallback to default)
-    current_hafiz = hafizs[auth]
+    current_hafiz = get_hafiz(auth)
     items_per_page = current_hafiz.page_size or ITEMS_PER_PAGE
 
-    # Build panels - each returns (mode_code, panel) tuple
-    # Infinite scroll starts at offset 0
-    mode_panels = [
-        make_new_memorization_table(
-            auth,
-            items_per_page=ITEMS_PER_PAGE,
-        ),
-        make_summary_table(
-            FULL_CYCLE_MODE_CODE,
-            auth,
-            items_per_page=items_per_page,
-        ),
-        make_summary_table(
-            SRS_MODE_CODE,
-            auth,
-            items_per_page=items_per_page,
-        ),
-        make_summary_table(
-            DAILY_REPS_MODE_CODE,
-            auth,
-            items_per_page=items_per_page,
-        ),
-        make_summary_table(
-            WEEKLY_REPS_MODE_CODE,
-            auth,
-            items_per_page=items_per_page,
-        ),
-        make_summary_table(
-            FORTNIGHTLY_REPS_MODE_CODE,
-            auth,
-            items_per_page=ITEMS_PER_PAGE,
-        ),
-        make_summary_table(
-            MONTHLY_REPS_MODE_CODE,
-            auth,
-            items_per_page=ITEMS_PER_PAGE,
-        ),
-    ]
-    # Filter out modes with no items (make_summary_table returns None for empty modes)
-    mode_panels = [panel for panel in mode_panels if panel is not None]
+    # Tabs and badges come from one count query; modes with no items are hidden
+    mode_counts = get_mode_queue_counts(
+        auth, HOME_MODE_CODES, get_current_date(auth), get_current_plan_id()
+    )
+    mode_codes = [code for code in HOME_MODE_CODES if mode_counts.get(code)]
+
+    # Only the default Full Cycle table is built inline; the other tabs load
+    # over HTMX when first shown (hidden by x-show, so they don't intersect until
+    # then; x-cloak keeps them hidden until Alpine has applied x-show)
+    mode_panels = []
+    for mode_code in mode_codes:
+        panel = None
+        if mode_code == FULL_CYCLE_MODE_CODE:
+            panel = make_summary_table(
+                FULL_CYCLE_MODE_CODE,
+                auth,
+                table_only=True,
+                items_per_page=items_per_page,
+            )
+        mode_panels.append((mode_code, panel or render_lazy_panel(mode_code)))
 
     mode_icons = {
         NEW_MEMORIZATION_MODE_CODE: "🆕",
@@ -113,6 +123,11 @@ def index(auth, sess):
             Span(icon, cls="mr-1"),
             Span(full_name, cls="hidden sm:inline"),  # Full name on desktop
             Span(short_name, cls="sm:hidden"),  # Short name on mobile
+            Span(
+                mode_counts[mode_code],
+                cls="badge badge-sm ml-1",
+                data_testid=f"tab-count-{mode_code}",
+            ),
             cls="tab",
             role="tab",
             **{
@@ -123,7 +138,7 @@ def index(auth, sess):
 
     tab_buttons = [make_tab_button(code) for code, _ in mode_panels]
     tab_contents = [
-        Div(content, x_show=f"activeTab === '{code}'")
+        Div(content, x_show=f"activeTab === '{code}'", x_cloak=code != FULL_CYCLE_MODE_CODE)
         for code, content in mode_panels
     ]
 
@@ -158,7 +173,7 @@ def index(auth, sess):
 
 @home_app.get("/close_date")
 def close_date_confirmation_page(auth):
-    hafiz_data = hafizs[auth]
+    hafiz_data = get_hafiz(auth)
     today = current_time()
     days_elapsed = day_diff(hafiz_data.current_date, today)
 
@@ -198,6 +213,17 @@ def close_date_confirmation_page(auth):
                 data_testid="skip-to-date-input",
                 **{"@change": "selectedDate = $el.value; daysToSkip = Math.round((new Date($el.value) - new Date(currentDate)) / 86400000)"},
             ),
+            Label(
+                Input(
+                    type="checkbox",
+                    name="catch_up_enabled",
+                    value="true",
+                    cls="checkbox checkbox-sm",
+                    data_testid="catch-up-checkbox",
+                ),
+                Span("Process each skipped day", cls="ml-2 text-sm"),
+                cls="flex items-center ml-4",
+            ),
             cls="flex items-center",
             x_data=f"{{ selectedDate: '{today}', currentDate: '{current_date}', daysToSkip: {days_elapsed}, dateLabels: {{ {date_labels} }} }}",
         )
@@ -209,7 +235,7 @@ def close_date_confirmation_page(auth):
             hx_target="body",
             hx_push_url="true",
             hx_disabled_elt="this",
-            hx_include="[name='skip_enabled'], [name='skip_to_date']",
+            hx_include="[name='skip_enabled'], [name='skip_to_date'], [name='catch_up_enabled']",
             cls=(ButtonT.primary, "p-2"),
             data_testid="confirm-close-btn",
         ),
@@ -233,44 +259,67 @@ def close_date_confirmation_page(auth):
 
 
 @home_app.post("/close_date")
-def change_the_current_date(auth, skip_enabled: str = None, skip_to_date: str = None):
-    hafiz_data = hafizs[auth]
+def change_the_current_date(
+    auth, skip_enabled: str = None, skip_to_date: str = None, catch_up_enabled: str = None
+):
+    hafiz_data = get_hafiz(auth)
+
+    # Close every day up to the selected date in one pass
+    if skip_enabled == "true" and skip_to_date and catch_up_enabled == "true":
+        try:
+            catch_up_close_date(auth, skip_to_date)
+        except CloseDateConflict:
+            # Closed concurrently (e.g. by the scheduled worker); show the new date
+            refresh_hafiz_context(auth)
+        return Redirect("/")
 
     # Skip to selected date if checkbox is checked
     if skip_enabled == "true" and skip_to_date:
         hafiz_data.current_date = skip_to_date
         hafizs.update(hafiz_data)
+        refresh_hafiz_context(auth)
         return Redirect("/")
 
-    revision_data = revisions(where=f"revision_date = '{hafiz_data.current_date}'")
-    for rev in revision_data:
-        if rev.mode_code == FULL_CYCLE_MODE_CODE:
-            update_hafiz_item_for_full_cycle(rev)
-        elif rev.mode_code == NEW_MEMORIZATION_MODE_CODE:
-            update_hafiz_item_for_new_memorization(rev, current_date=hafiz_data.current_date)
-        elif rev.mode_code in REP_MODES_CONFIG:
-            update_rep_item(rev)
-        elif rev.mode_code == SRS_MODE_CODE:
-            update_hafiz_item_for_srs(rev)
+    # Apply the day's revisions and advance to the next date in one transaction
+    try:
+        close_date(auth)
+    except CloseDateConflict:
+        refresh_hafiz_context(auth)
 
-        # update all the non-mode specific columns (including the last_review column)
-        populate_hafizs_items_stat_columns(item_id=rev.item_id)
+    return Redirect("/")
 
-    start_srs_for_ok_and_bad_rating(auth)
 
-    # Check if the full cycle plan is completed, if so close and create a new plan
-    cycle_full_cycle_plan_if_completed()
+@home_app.get("/report")
+def datewise_summary_table_view(auth, until: str = None):
+    # Infinite scroll requests only need the next window's rows
+    if until:
+        return datewise_summary_table(hafiz_id=auth, until=until, rows_only=True)
+    # The forecast projects every scheduled item, so the chart loads on its own
+    return main_area(
+        render_lazy_forecast_chart(),
+        datewise_summary_table(hafiz_id=auth),
+        active="Report",
+        auth=auth,
+    )
 
-    # Change the current date to next date
-    hafiz_data.current_date = add_days_to_date(hafiz_data.current_date, 1)
-    hafizs.update(hafiz_data)
 
-    return Redirect("/")
+def _hafiz_forecast(auth, days: int = FORECAST_DAYS) -> dict:
+    """The hafiz's forecast, initialising a missing current_date like the other pages."""
+    get_current_date(auth)
+    return forecast_review_load([auth], days=days)[auth]
 
 
-@home_app.get("/report")
-def datewise_summary_table_view(auth):
-    return main_area(datewise_summary_table(hafiz_id=auth), active="Report", auth=auth)
+@home_app.get("/report/forecast")
+def review_load_forecast(auth, days: int = FORECAST_DAYS):
+    """Projected pages due per day and mode, as JSON."""
+    days = min(max(days, 1), FORECAST_MAX_DAYS)
+    return forecast_as_json(_hafiz_forecast(auth, days=days))
+
+
+@home_app.get("/report/forecast/chart")
+def review_load_forecast_chart(auth):
+    """The forecast chart shown at the top of /report."""
+    return render_forecast_chart(_hafiz_forecast(auth))
 
 
 @home_app.get("/page/{mode_code}")
@@ -283,7 +332,7 @@ def change_page(sess, auth, mode_code: str, offset: int = 0, show_loved_only: st
     sess["loved_filter"][mode_code] = loved_only
 
     # Get hafiz's page_size setting (fallback to default)
-    current_hafiz = hafizs[auth]
+    current_hafiz = get_hafiz(auth)
     items_per_page = current_hafiz.page_size or ITEMS_PER_PAGE
 
     # Handle NM mode separately (uses different table function)
@@ -309,7 +358,7 @@ def change_page(sess, auth, mode_code: str, offset: int = 0, show_loved_only: st
 def load_more_rows(auth, mode_code: str, offset: int = 0, show_loved_only: str = "false"):
     """Handle infinite scroll - return additional rows only."""
     # Get hafiz's page_size setting (fallback to default)
-    current_hafiz = hafizs[auth]
+    current_hafiz = get_hafiz(auth)
     items_per_page = current_hafiz.page_size or ITEMS_PER_PAGE
     loved_only = show_loved_only.lower() == "true"
 
@@ -430,19 +479,19 @@ def bulk_rate(
 ):
     plan_id_int = int(plan_id) if plan_id else None
 
-    # Add revision records for each item
-    for item_id in item_ids:
-        add_revision_record(
-            item_id=item_id,
-            hafiz_id=auth,
-            mode_code=mode_code,
-            revision_date=date,
-            rating=rating,
-            plan_id=plan_id_int,
-        )
+    # Add revision records for all items in one transaction; like single adds,
+    # the streak columns are left for Close Date
+    add_revisions_bulk(
+        auth,
+        [(item_id, rating) for item_id in item_ids],
+        mode_code=mode_code,
+        revision_date=date,
+        plan_id=plan_id_int,
+        update_stats=False,
+    )
 
     # Get hafiz's page_size setting (fallback to default)
-    current_hafiz = hafizs[auth]
+    current_hafiz = get_hafiz(auth)
     items_per_page = current_hafiz.page_size or ITEMS_PER_PAGE
 
     updated_table = make_summary_table(
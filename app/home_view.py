@@ -9,37 +9,36 @@ This module contains:
 - Mode filter predicates
 """
 
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 import pandas as pd
 from fasthtml.common import *
 import fasthtml.common as fh
 from monsterui.all import *
 from utils import (
     flatten_list,
-    compact_format,
+    encode_page_ranges,
     sub_days_to_date,
-    add_days_to_date,
     date_to_human_readable,
     day_diff,
     format_number,
 )
+from app import quran_metadata
 from app.common_model import (
     get_current_date,
     get_current_plan_id,
-    get_full_review_item_ids,
-    get_last_added_full_cycle_page,
-    get_hafizs_items,
-    get_actual_interval,
+    get_mode_condition,
+    get_mode_queue_page,
+    is_full_cycle_plan_finished,
     get_earliest_revision_date,
     get_datewise_revisions,
-    get_mode_specific_hafizs_items,
-    get_mode_name,
+    get_revision_daily_rollup,
+    get_daily_page_equivalents,
+    get_mode_day_revisions,
     get_page_number,
     get_surah_name,
     get_juz_name,
-    get_item_page_portion,
     get_page_part_info,
-    get_page_count,
 )
 from app.components.forms import (
     RatingDropdown,
@@ -69,13 +68,13 @@ from database import (
 
 
 def get_today_vs_yesterday_stats(auth):
-    """Calculate today vs yesterday page counts and comparison."""
-    current_date = get_current_date(auth)
-    today = current_date
+    """Calculate today vs yesterday page counts, read from the daily rollup."""
+    today = get_current_date(auth)
     yesterday = sub_days_to_date(today, 1)
+    page_equivalents = get_daily_page_equivalents(auth, [today, yesterday])
 
-    today_count = get_page_count(revisions(where=f"revision_date = '{today}'"))
-    yesterday_count = get_page_count(revisions(where=f"revision_date = '{yesterday}'"))
+    today_count = format_number(page_equivalents.get(today, 0))
+    yesterday_count = format_number(page_equivalents.get(yesterday, 0))
 
     return today_count, yesterday_count
 
@@ -86,96 +85,63 @@ def render_pages_revised_indicator(auth):
     return TrendIndicator(today, yesterday)
 
 
-def get_revision_data(mode_code: str, revision_date: str):
-    """Returns the revision count and revision ID for a specific date and mode code."""
-    records = revisions(
-        where=f"mode_code = '{mode_code}' AND revision_date = '{revision_date}'"
-    )
-    rev_ids = ",".join(str(r.id) for r in records)
-    count = get_page_count(records)
-    return count, rev_ids
-
-
-def split_page_range(page_range: str):
-    """Split a page range string like '1-5' into (start, end) tuple."""
-    start_id, end_id = (
-        page_range.split("-") if "-" in page_range else [page_range, None]
-    )
-    start_id = int(start_id)
-    end_id = int(end_id) if end_id else None
-    return start_id, end_id
-
+def datewise_summary_table(hafiz_id=None, until=None, rows_only=False):
+    """Render a table showing revisions grouped by date and mode.
 
-def datewise_summary_table(show=None, hafiz_id=None):
-    """Render a table showing revisions grouped by date and mode."""
-    earliest_date = get_earliest_revision_date(hafiz_id)
+    Shows REPORT_WINDOW_DAYS days ending at `until` (default: the current date);
+    the last row loads the previous window on scroll. rows_only returns just the
+    window's rows, for those infinite scroll requests.
+    """
     current_date = get_current_date(hafiz_id)
+    end_date = until or current_date
+    earliest_date = get_earliest_revision_date(hafiz_id) or current_date
+    start_date = max(earliest_date, sub_days_to_date(end_date, REPORT_WINDOW_DAYS - 1))
 
-    date_range = pd.date_range(
-        start=(earliest_date or current_date), end=current_date, freq="D"
-    )
+    date_range = pd.date_range(start=start_date, end=end_date, freq="D")
     date_range = [date.strftime("%Y-%m-%d") for date in date_range][::-1]
-    date_range = date_range[:show] if show else date_range
 
-    # Bulk query: fetch all revisions for date range in single query
-    all_revisions = get_datewise_revisions(date_range, hafiz_id)
+    # Per date/mode totals come from the rollup
+    rollup_by_date = defaultdict(list)
+    for row in get_revision_daily_rollup(hafiz_id, start_date, end_date):
+        rollup_by_date[row["revision_date"]].append(row)
 
-    # Group revisions by date and mode
+    # The window's revisions (in page order) give each range's pages and links,
+    # and the item descriptions that label the range endpoints
     revisions_by_date_mode = defaultdict(lambda: defaultdict(list))
-    for rev in all_revisions:
+    descriptions = {}
+    for rev in get_datewise_revisions(hafiz_id, start_date, end_date):
         revisions_by_date_mode[rev["revision_date"]][rev["mode_code"]].append(rev)
+        descriptions[rev["item_id"]] = rev["description"]
+    mode_names = {mode.code: mode.name for mode in modes()}
 
     def _render_datewise_row(date):
-        mode_data = revisions_by_date_mode.get(date, {})
-        unique_modes = sorted(mode_data.keys())
-
-        mode_with_ids_and_pages = []
-        for mode_code in unique_modes:
-            mode_with_ids_and_pages.append(
-                {
-                    "mode_code": mode_code,
-                    "revision_data": mode_data[mode_code],
-                }
-            )
+        mode_rows = rollup_by_date.get(date, [])
 
         def _render_pages_range(revisions_data: list):
-            page_ranges = compact_format(sorted([r["page_id"] for r in revisions_data]))
-
-            def _render_page(page):
-                item_id = [
-                    r["item_id"] for r in revisions_data if r["page_id"] == page
-                ][0]
-                return PageDescription(item_id=item_id, is_link=False)
-
-            def get_ids_for_page_range(data, min_page, max_page=None):
-                result = []
-                for item in data:
-                    page_id = item["page_id"]
-                    if max_page is None:
-                        if page_id == min_page:
-                            result.append(item["id"])
-                    else:
-                        if min_page <= page_id <= max_page:
-                            result.append(item["id"])
-                return list(map(str, sorted(result)))
+            def _render_page(item_id):
+                return PageDescription(
+                    item_id=item_id, is_link=False, description=descriptions[item_id]
+                )
 
             ctn = []
-            for page_range in page_ranges.split(","):
-                start_page, end_page = split_page_range(page_range)
-                if end_page:
+            # revisions_data is in page order, so the ranges come out of one pass
+            for page_range in encode_page_ranges(
+                (r["page_id"], r["item_id"], r["id"]) for r in revisions_data
+            ):
+                if page_range["end_page"]:
                     range_desc = (
-                        _render_page(start_page),
+                        _render_page(page_range["start_item_id"]),
                         Span(" -> "),
-                        _render_page(end_page),
+                        _render_page(page_range["end_item_id"]),
                     )
                 else:
-                    range_desc = _render_page(start_page)
+                    range_desc = _render_page(page_range["start_item_id"])
 
                 ctn.append(
                     Span(
                         A(
                             *range_desc,
-                            hx_get=f"/revision/bulk_edit?ids={','.join(get_ids_for_page_range(revisions_data, start_page, end_page))}",
+                            hx_get=f"/revision/bulk_edit?ids={','.join(map(str, page_range['revision_ids']))}",
                             hx_push_url="true",
                             hx_target="body",
                             cls=(AT.classic),
@@ -189,7 +155,7 @@ def datewise_summary_table(show=None, hafiz_id=None):
                 cls="space-y-3",
             )
 
-        if not mode_with_ids_and_pages:
+        if not mode_rows:
             return [
                 Tr(
                     Td(date_to_human_readable(date)),
@@ -207,29 +173,38 @@ def datewise_summary_table(show=None, hafiz_id=None):
                     (
                         Td(
                             date_to_human_readable(date),
-                            rowspan=f"{len(mode_with_ids_and_pages)}",
+                            rowspan=f"{len(mode_rows)}",
                         ),
                         Td(
-                            sum(
-                                [
-                                    len(i["revision_data"])
-                                    for i in mode_with_ids_and_pages
-                                ]
-                            ),
-                            rowspan=f"{len(mode_with_ids_and_pages)}",
+                            sum(o["revision_count"] for o in mode_rows),
+                            rowspan=f"{len(mode_rows)}",
                         ),
                     )
-                    if mode_with_ids_and_pages[0]["mode_code"] == o["mode_code"]
+                    if mode_rows[0]["mode_code"] == o["mode_code"]
                     else ()
                 ),
-                Td(get_mode_name(o["mode_code"])),
-                Td(len(o["revision_data"])),
-                Td(_render_pages_range(o["revision_data"])),
+                Td(mode_names.get(o["mode_code"], o["mode_code"])),
+                Td(o["revision_count"]),
+                Td(_render_pages_range(revisions_by_date_mode[date][o["mode_code"]])),
             )
-            for o in mode_with_ids_and_pages
+            for o in mode_rows
         ]
         return rows
 
+    body_rows = flatten_list(map(_render_datewise_row, date_range))
+    if start_date > earliest_date and body_rows:
+        # The next window ends the day before this one starts
+        body_rows[-1].attrs.update(
+            {
+                "hx-get": f"/report?until={sub_days_to_date(start_date, 1)}",
+                "hx-trigger": "revealed",
+                "hx-swap": "afterend",
+            }
+        )
+
+    if rows_only:
+        return tuple(body_rows)
+
     datewise_table = Div(
         Table(
             Thead(
@@ -241,25 +216,104 @@ def datewise_summary_table(show=None, hafiz_id=None):
                     Th("Range"),
                 )
             ),
-            Tbody(*flatten_list(map(_render_datewise_row, date_range))),
+            Tbody(*body_rows),
         ),
         cls="uk-overflow-auto",
     )
     return datewise_table
 
 
+# Bar colors of each mode in the forecast chart (matching ModeBadge)
+FORECAST_MODE_COLORS = {
+    DAILY_REPS_MODE_CODE: "bg-yellow-400",
+    WEEKLY_REPS_MODE_CODE: "bg-amber-400",
+    FORTNIGHTLY_REPS_MODE_CODE: "bg-orange-400",
+    MONTHLY_REPS_MODE_CODE: "bg-orange-600",
+    SRS_MODE_CODE: "bg-red-400",
+    FULL_CYCLE_MODE_CODE: "bg-purple-400",
+}
+
+
+def render_forecast_chart(forecast: dict):
+    """Stacked bar chart of the projected pages due per day and mode."""
+    mode_names = {mode.code: mode.name for mode in modes()}
+    peak = max(forecast["total"].max(), 1)
+
+    def _day_bar(day, date):
+        segments = [
+            Div(
+                cls=FORECAST_MODE_COLORS[mode_code],
+                style=f"height: {load[day] / peak * 100:.2f}%",
+            )
+            for mode_code, load in forecast["modes"].items()
+            if load[day] > 0
+        ]
+        return Div(
+            *segments,
+            title=f"{date_to_human_readable(date)}: {format_number(forecast['total'][day])} pages",
+            cls="flex flex-col-reverse flex-1 h-full",
+        )
+
+    legend = Div(
+        *(
+            Span(
+                Span(cls=f"inline-block w-3 h-3 mr-1 {color}"),
+                mode_names.get(mode_code, mode_code),
+                cls="whitespace-nowrap",
+            )
+            for mode_code, color in FORECAST_MODE_COLORS.items()
+        ),
+        cls="flex flex-wrap gap-3 text-xs",
+    )
+    plan_days_left = forecast["full_cycle_plan_days_left"]
+    return Div(
+        H2("Forecast"),
+        Subtitle(
+            f"Pages due over the next {len(forecast['dates'])} days"
+            + (f" · Full Cycle plan completes in {plan_days_left} days" if plan_days_left is not None else "")
+        ),
+        Div(
+            *(_day_bar(day, date) for day, date in enumerate(forecast["dates"])),
+            cls="flex items-end gap-px h-40 border-b",
+        ),
+        Div(
+            Span(date_to_human_readable(forecast["dates"][0])),
+            Span(f"peak {format_number(peak)} pages"),
+            Span(date_to_human_readable(forecast["dates"][-1])),
+            cls="flex justify-between text-xs text-gray-500",
+        ),
+        legend,
+        id="review-load-forecast",
+        cls="space-y-2 mb-6",
+    )
+
+
 def create_stat_table(auth):
     """Create the statistics table showing today/yesterday revision counts by mode."""
     current_date = get_current_date(auth)
     today = current_date
     yesterday = sub_days_to_date(today, 1)
-    today_completed_count = get_page_count(
-        revisions(where=f"revision_date = '{today}'")
-    )
-    yesterday_completed_count = get_page_count(
-        revisions(where=f"revision_date = '{yesterday}'")
-    )
-    mode_codes = [mode.code for mode in modes()]
+    # One grouped query gives every cell of the table
+    mode_day_revisions = get_mode_day_revisions(auth, [today, yesterday])
+    no_revisions = {"page_count": 0, "revision_ids": ""}
+
+    def get_revision_data(mode_code: str, revision_date: str):
+        """Returns the page count and revision IDs for a mode on a date."""
+        data = mode_day_revisions.get((mode_code, revision_date), no_revisions)
+        return format_number(data["page_count"]), data["revision_ids"]
+
+    def day_total(revision_date):
+        return format_number(
+            sum(
+                data["page_count"]
+                for (_, date), data in mode_day_revisions.items()
+                if date == revision_date
+            )
+        )
+
+    today_completed_count = day_total(today)
+    yesterday_completed_count = day_total(yesterday)
+    mode_names = {mode.code: mode.name for mode in modes()}
 
     def render_count(count, item_ids):
         if count == 0:
@@ -275,13 +329,13 @@ def create_stat_table(auth):
             return None
 
         return Tr(
-            Td(get_mode_name(current_mode_code)),
+            Td(mode_names[current_mode_code]),
             Td(render_count(today_count, today_ids)),
             Td(render_count(yesterday_count, yesterday_ids)),
             id=f"stat-row-{current_mode_code}",
         )
 
-    rows = [row for row in map(render_stat_rows, mode_codes) if row is not None]
+    rows = [row for row in map(render_stat_rows, mode_names) if row is not None]
 
     return Table(
         Thead(
@@ -304,25 +358,6 @@ def create_stat_table(auth):
     )
 
 
-# Update logic
-
-def update_hafiz_item_for_full_cycle(rev):
-    """Update hafiz_items record when a Full Cycle revision is processed on close date."""
-    hafiz_item_details = get_hafizs_items(rev.item_id)
-    if hafiz_item_details is None:
-        return  # Skip if no hafiz_items record exists
-
-    currrent_date = get_current_date(rev.hafiz_id)
-    # when a SRS page is revised in full-cycle mode, we need to move the next review of that page using the current next_interval
-    if hafiz_item_details.mode_code == SRS_MODE_CODE:
-        hafiz_item_details.next_review = add_days_to_date(
-            currrent_date, hafiz_item_details.next_interval
-        )
-
-    hafiz_item_details.last_interval = get_actual_interval(rev.item_id)
-    hafizs_items.update(hafiz_item_details)
-
-
 # === Summary Table Functions ===
 
 
@@ -337,20 +372,68 @@ def row_background_color(rating):
     return bg_color
 
 
-def get_mode_condition(mode_code: str):
-    mode_code_mapping = {
-        FULL_CYCLE_MODE_CODE: [f"'{FULL_CYCLE_MODE_CODE}'", f"'{SRS_MODE_CODE}'"],
-    }
-    retrieved_mode_codes = mode_code_mapping.get(mode_code)
-    if retrieved_mode_codes is None:
-        mode_condition = f"mode_code = '{mode_code}'"
-    else:
-        mode_condition = f"mode_code IN ({', '.join(retrieved_mode_codes)})"
-    return mode_condition
-
-
-def render_range_row(records, current_date=None, mode_code=None, plan_id=None, hide_start_text=False, loved=False):
-    """Render a single table row for an item in the summary table."""
+class _RowFragmentCache:
+    """LRU of rendered row cells (HTML), bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, html: str):
+        size = len(html.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (html, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_row_cells_cache = _RowFragmentCache(ROW_CACHE_MAX_BYTES)
+
+
+def get_row_cache_stats() -> dict:
+    """Hit/miss counters and size of the summary table row cache."""
+    return _row_cells_cache.stats()
+
+
+def clear_row_cache():
+    _row_cells_cache.clear()
+
+
+def _render_row_cells(records, current_date, mode_code, plan_id, hide_start_text, loved):
     item_id = records["item"].id
     rating = records["revision"].rating if records["revision"] else None
     row_id = f"row-{mode_code}-{item_id}"
@@ -388,7 +471,7 @@ def render_range_row(records, current_date=None, mode_code=None, plan_id=None, h
         title="Toggle favorite",
     )
 
-    return Tr(
+    return (
         checkbox_cell,
         PageNumberCell(item_id),
         StartTextCell(records["item"].start_text, hide_text=hide_start_text),
@@ -402,7 +485,43 @@ def render_range_row(records, current_date=None, mode_code=None, plan_id=None, h
                 cls="flex items-center gap-2",
             ),
         ),
-        id=row_id,
+    )
+
+
+def render_range_row(records, current_date=None, mode_code=None, plan_id=None, hide_start_text=False, loved=False):
+    """Render a single table row for an item in the summary table.
+
+    The cells are rendered once per distinct set of inputs and reused from
+    _row_cells_cache; the Tr itself is new on every call so callers can add
+    attributes to it. The key includes the Quran metadata version, so edits to
+    page numbers or parts render fresh cells.
+    """
+    item = records["item"]
+    revision = records["revision"]
+    rating = revision.rating if revision else None
+    key = (
+        item.id,
+        mode_code,
+        revision.id if revision else None,
+        rating,
+        bool(loved),
+        current_date,
+        plan_id,
+        hide_start_text,
+        item.start_text,
+        quran_metadata.quran_metadata_version(),
+    )
+    cells_html = _row_cells_cache.get(key)
+    if cells_html is None:
+        cells_html = "".join(
+            to_xml(cell, indent=False)
+            for cell in _render_row_cells(records, current_date, mode_code, plan_id, hide_start_text, loved)
+        )
+        _row_cells_cache.put(key, cells_html)
+
+    return Tr(
+        NotStr(cells_html),
+        id=f"row-{mode_code}-{item.id}",
         cls=row_background_color(rating),
     )
 
@@ -460,30 +579,17 @@ def render_bulk_action_bar(mode_code, current_date, plan_id):
     return Div(spacer, bar)
 
 
-def render_summary_table(auth, mode_code, item_ids, is_plan_finished, offset=0, items_per_page=None, show_loved_only=False, rows_only=False):
+def render_summary_table(auth, mode_code, item_ids, is_plan_finished, offset=0, items_per_page=None, show_loved_only=False, rows_only=False, has_more=False):
+    """Render one page of a mode's table; item_ids is the page, has_more whether another follows."""
     current_date = get_current_date(auth)
     plan_id = get_current_plan_id()
 
-    total_items = len(item_ids)
-
-    if item_ids:
-        total_page_equivalents = sum(get_item_page_portion(item_id) for item_id in item_ids)
-    else:
-        total_page_equivalents = 0
-
-    if items_per_page and items_per_page > 0:
-        start_idx = offset
-        end_idx = offset + items_per_page
-        paginated_item_ids = item_ids[start_idx:end_idx]
-        has_more = end_idx < total_items
-    else:
-        paginated_item_ids = item_ids
-        has_more = False
+    paginated_item_ids = item_ids
 
     plan_condition = f"AND plan_id = {plan_id}" if plan_id else ""
     if paginated_item_ids:
         today_revisions = revisions(
-            where=f"revision_date = '{current_date}' AND item_id IN ({', '.join(map(str, paginated_item_ids))}) AND {get_mode_condition(mode_code)} {plan_condition}"
+            where=f"hafiz_id = {auth} AND revision_date = '{current_date}' AND item_id IN ({', '.join(map(str, paginated_item_ids))}) AND {get_mode_condition(mode_code)} {plan_condition}"
         )
     else:
         today_revisions = []
@@ -491,14 +597,21 @@ def render_summary_table(auth, mode_code, item_ids, is_plan_finished, offset=0,
 
     if paginated_item_ids:
         hafiz_items_data = hafizs_items(
-            where=f"item_id IN ({', '.join(map(str, paginated_item_ids))})"
+            where=f"hafiz_id = {auth} AND item_id IN ({', '.join(map(str, paginated_item_ids))})"
         )
     else:
         hafiz_items_data = []
     loved_lookup = {hi.item_id: bool(hi.loved) for hi in hafiz_items_data}
 
+    if paginated_item_ids:
+        items_lookup = {
+            item.id: item
+            for item in items(where=f"id IN ({', '.join(map(str, paginated_item_ids))})")
+        }
+    else:
+        items_lookup = {}
     items_with_revisions = [
-        {"item": items[item_id], "revision": revisions_lookup.get(item_id)}
+        {"item": items_lookup[item_id], "revision": revisions_lookup.get(item_id)}
         for item_id in paginated_item_ids
     ]
 
@@ -597,6 +710,8 @@ def render_summary_table(auth, mode_code, item_ids, is_plan_finished, offset=0,
 
 
 # === Mode Filter Predicates ===
+# The definition of which items each tab lists. The queues are selected in SQL
+# (common_model.get_mode_queue_sql); test_mode_queue.py keeps the two in step.
 
 
 def _is_review_due(item: dict, current_date: str) -> bool:
@@ -702,53 +817,28 @@ def make_summary_table(
     rows_only=False,
 ):
     current_date = get_current_date(auth)
+    plan_id = get_current_plan_id()
 
-    mode_condition = get_mode_condition(mode_code)
-    mode_specific_hafizs_items_records = get_mode_specific_hafizs_items(auth, mode_condition)
-
-    predicate = MODE_PREDICATES[mode_code]
-    filtered_records = [
-        item
-        for item in mode_specific_hafizs_items_records
-        if predicate(item, current_date)
-    ]
-
-    def get_unique_item_ids(records):
-        return list(dict.fromkeys(record["item_id"] for record in records))
-
-    if mode_code == SRS_MODE_CODE:
-        exclude_start_page = get_last_added_full_cycle_page(auth)
-
-        if exclude_start_page is not None:
-            SRS_EXCLUSION_ZONE = 60
-            exclude_end_page = exclude_start_page + SRS_EXCLUSION_ZONE
-
-            filtered_records = [
-                record
-                for record in filtered_records
-                if record["page_number"] < exclude_start_page
-                or record["page_number"] > exclude_end_page
-            ]
-
-        if show_loved_only:
-            filtered_records = [
-                record for record in filtered_records if record.get("loved")
-            ]
+    # Only the requested page is selected; filtering and ordering run in SQL
+    item_ids, has_more = get_mode_queue_page(
+        auth,
+        mode_code,
+        current_date,
+        offset=offset,
+        limit=items_per_page,
+        plan_id=plan_id,
+        show_loved_only=show_loved_only and mode_code == SRS_MODE_CODE,
+    )
 
-    item_ids = get_unique_item_ids(filtered_records)
+    # An empty first page means the mode has nothing to show
+    if not item_ids and offset == 0:
+        return None
 
-    if mode_code == FULL_CYCLE_MODE_CODE:
-        is_plan_finished, item_ids = get_full_review_item_ids(
-            auth=auth,
-            mode_specific_hafizs_items_records=mode_specific_hafizs_items_records,
-            item_ids=item_ids,
-        )
+    if mode_code == FULL_CYCLE_MODE_CODE and not rows_only:
+        is_plan_finished = is_full_cycle_plan_finished(auth, current_date, plan_id)
     else:
         is_plan_finished = False
 
-    if not item_ids:
-        return None
-
     result = render_summary_table(
         auth=auth,
         mode_code=mode_code,
@@ -758,6 +848,7 @@ def make_summary_table(
         items_per_page=items_per_page,
         show_loved_only=show_loved_only,
         rows_only=rows_only,
+        has_more=has_more,
     )
     if rows_only:
         return result
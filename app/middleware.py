@@ -1,6 +1,9 @@
+import asyncio
 from fasthtml.common import *
 from monsterui.all import *
-from database import users, hafizs, revisions, hafizs_items, plans
+from database import db, users, hafizs, revisions, hafizs_items, plans
+from app.hafiz_context import load_hafiz_context, use_hafiz_context
+from app.quran_metadata import check_quran_metadata_version
 
 # DaisyUI (Tailwind component library)
 daisyui_css = Link(
@@ -31,28 +34,60 @@ def user_auth(req, sess):
             user_id = None
     if not user_id:
         return RedirectResponse("/users/login", status_code=303)
+    # Pick up metadata edits made by other worker processes
+    check_quran_metadata_version()
 
 user_bware = Beforeware(
     user_auth,
     skip=["/users/login", "/users/logout", "/users/signup"],
 )
 
-def hafiz_auth(req, sess):
+# Pure read routes are served from the read-only connection
+READ_ONLY_ROUTES = ["/report", "/page_details"]
+
+
+def is_read_only_route(req) -> bool:
+    path = req.url.path
+    return req.method == "GET" and any(
+        path == route or path.startswith(f"{route}/") for route in READ_ONLY_ROUTES
+    )
+
+
+def _load_request_hafiz(hafiz_id):
+    """The hafiz_auth lookups: the hafiz's context, or None for an unknown hafiz."""
+    try:
+        return load_hafiz_context(hafiz_id)
+    except NotFoundError:
+        return None
+
+
+# Async so the hafiz context and the table xtra() filters set here are visible
+# to the route handler (sync beforeware runs in a worker thread with its own
+# copy of the context). Both are per-request, so concurrent requests for
+# different hafizs do not see each other's rows. The database lookups run in a
+# worker thread (on that thread's connection), so they don't block the event
+# loop; only setting the context happens here.
+async def hafiz_auth(req, sess):
     # Check hafiz authentication
     hafiz_id = req.scope["auth"] = sess.get("auth", None)
+    context = None
     if hafiz_id:
-        try:
-            hafizs[hafiz_id]
-        except NotFoundError:
+        context = await asyncio.to_thread(_load_request_hafiz, hafiz_id)
+        if context is None:
             del sess["auth"]
-            hafiz_id = None
-    if not hafiz_id:
+    if context is None:
         return RedirectResponse("/hafiz/selection", status_code=303)
 
+    use_hafiz_context(context)
+
     revisions.xtra(hafiz_id=hafiz_id)
     hafizs_items.xtra(hafiz_id=hafiz_id)
     plans.xtra(hafiz_id=hafiz_id)
 
+    # get_current_date initialises a missing current_date, which needs a write
+    if is_read_only_route(req) and context.current_date is not None:
+        db.use_read_only()
+
 hafiz_bware = Beforeware(
     hafiz_auth,
     skip=[
@@ -63,6 +98,7 @@ hafiz_bware = Beforeware(
         "/users/account",
         "/hafiz/selection",
         "/hafiz/add",
+        "/hafiz/clone",
     ],
 )
 
@@ -3,9 +3,7 @@ import fasthtml.common as fh
 from monsterui.all import *
 from constants import *
 from app.common_function import create_app_with_auth
-from app.common_model import get_current_date, get_juz_name, get_hafizs_items, get_unmemorized_items
-from utils import add_days_to_date
-from app.fixed_reps import REP_MODES_CONFIG, MODE_TO_THRESHOLD_COLUMN
+from app.common_model import get_current_date, get_juz_name, get_hafizs_items, get_mode_queue_page
 from database import items, revisions, hafizs_items
 
 from app.components.tables import (
@@ -131,36 +129,31 @@ def make_new_memorization_table(auth, offset=0, items_per_page=None, table_only=
     current_date = get_current_date(auth)
     mode_code = NEW_MEMORIZATION_MODE_CODE
 
-    # Query unmemorized items using centralized function
-    unmemorized_records = get_unmemorized_items(auth)
-    unmemorized_item_ids = set(r["item_id"] for r in unmemorized_records)
-
-    # Get today's NM revisions (to show "memorized today" state)
-    today_nm_revisions = revisions(
-        where=f"revision_date = '{current_date}' AND mode_code = '{NEW_MEMORIZATION_MODE_CODE}' AND hafiz_id = {auth}"
+    # Unmemorized + memorized today, one infinite scroll batch selected in SQL
+    paginated_item_ids, has_more = get_mode_queue_page(
+        auth, mode_code, current_date, offset=offset, limit=items_per_page
     )
-    today_nm_item_ids = set(r.item_id for r in today_nm_revisions)
-
-    # Combine: unmemorized + memorized today (union)
-    all_item_ids = sorted(unmemorized_item_ids | today_nm_item_ids)
 
     # Hide tab entirely if no items to display
-    if not all_item_ids:
+    if not paginated_item_ids and offset == 0:
         return None
 
-    # Infinite scroll batch
-    total_items = len(all_item_ids)
-    if items_per_page and items_per_page > 0:
-        start_idx = offset
-        end_idx = offset + items_per_page
-        paginated_item_ids = all_item_ids[start_idx:end_idx]
-        has_more = end_idx < total_items
+    if paginated_item_ids:
+        id_list = ", ".join(map(str, paginated_item_ids))
+        # Today's NM revisions on this batch (to show "memorized today" state)
+        today_nm_item_ids = {
+            r.item_id
+            for r in revisions(
+                where=f"revision_date = '{current_date}' AND mode_code = '{NEW_MEMORIZATION_MODE_CODE}' AND hafiz_id = {auth} AND item_id IN ({id_list})"
+            )
+        }
+        items_lookup = {item.id: item for item in items(where=f"id IN ({id_list})")}
     else:
-        paginated_item_ids = all_item_ids
-        has_more = False
+        today_nm_item_ids = set()
+        items_lookup = {}
 
     # Get item details for paginated items
-    items_data = [items[item_id] for item_id in paginated_item_ids]
+    items_data = [items_lookup[item_id] for item_id in paginated_item_ids]
 
     # Render rows with surah headers
     body_rows = []
@@ -231,41 +224,6 @@ def make_new_memorization_table(auth, offset=0, items_per_page=None, table_only=
     return (mode_code, table)
 
 
-def update_hafiz_item_for_new_memorization(rev, mode_code=None, rep_count=None, current_date=None):
-    """
-    Update hafiz_item after new memorization revision (called by Close Date).
-
-    Args:
-        rev: The revision record
-        mode_code: Target rep mode (defaults to DAILY_REPS_MODE_CODE)
-        rep_count: Custom repetition threshold (defaults to mode's default)
-        current_date: Current date for scheduling (optional)
-    """
-    hafiz_item_details = get_hafizs_items(rev.item_id)
-    if hafiz_item_details is None:
-        return  # Skip if no hafiz_items record exists
-
-    target_mode = mode_code or DAILY_REPS_MODE_CODE
-    hafiz_item_details.mode_code = target_mode
-    hafiz_item_details.memorized = True
-
-    # Set custom threshold if provided
-    if rep_count is not None and target_mode in MODE_TO_THRESHOLD_COLUMN:
-        column = MODE_TO_THRESHOLD_COLUMN[target_mode]
-        setattr(hafiz_item_details, column, int(rep_count))
-
-    # Set next_review and next_interval based on mode
-    if target_mode in REP_MODES_CONFIG and current_date:
-        config = REP_MODES_CONFIG[target_mode]
-        hafiz_item_details.next_interval = config["interval"]
-        hafiz_item_details.next_review = add_days_to_date(current_date, config["interval"])
-    elif target_mode == FULL_CYCLE_MODE_CODE:
-        hafiz_item_details.next_interval = None
-        hafiz_item_details.next_review = None
-
-    hafizs_items.update(hafiz_item_details)
-
-
 # === Routes for NM Tab on Home Page ===
 
 
@@ -16,7 +16,7 @@ from constants import (
     STATUS_DISPLAY,
 )
 from database import db, hafizs_items
-from app.common_model import get_page_count
+from app.common_model import get_status_counts, get_tab_counts
 from app.fixed_reps import REP_MODES_CONFIG
 from utils import add_days_to_date
 
@@ -55,35 +55,6 @@ def get_status_display(status: str) -> tuple[str, str]:
     return STATUS_DISPLAY.get(status, ("❓", "Unknown"))
 
 
-def get_status_counts(hafiz_id: int) -> dict:
-    """Get page count for each status for dashboard stats."""
-    all_items = hafizs_items(where=f"hafiz_id = {hafiz_id}")
-
-    # Group item_ids by status
-    groups = {
-        STATUS_NOT_MEMORIZED: [],
-        STATUS_LEARNING: [],
-        STATUS_REPS: [],
-        STATUS_SOLID: [],
-        STATUS_STRUGGLING: [],
-    }
-
-    for hi in all_items:
-        status = get_status(hi)
-        if status in groups:
-            groups[status].append(hi.item_id)
-
-    # Calculate page count for each group
-    return {
-        STATUS_NOT_MEMORIZED: get_page_count(item_ids=groups[STATUS_NOT_MEMORIZED]),
-        STATUS_LEARNING: get_page_count(item_ids=groups[STATUS_LEARNING]),
-        STATUS_REPS: get_page_count(item_ids=groups[STATUS_REPS]),
-        STATUS_SOLID: get_page_count(item_ids=groups[STATUS_SOLID]),
-        STATUS_STRUGGLING: get_page_count(item_ids=groups[STATUS_STRUGGLING]),
-        "total": get_page_count(item_ids=[hi.item_id for hi in all_items]),
-    }
-
-
 def apply_status_to_item(hafiz_item, status, current_date):
     """Apply status changes to a hafiz_item. Returns True if applied."""
     if status == STATUS_NOT_MEMORIZED:
@@ -117,28 +88,6 @@ def apply_status_to_item(hafiz_item, status, current_date):
     return True
 
 
-def get_tab_counts(hafiz_id: int) -> dict:
-    """Get page counts for tab filter: all, memorized, unmemorized."""
-    all_items = hafizs_items(where=f"hafiz_id = {hafiz_id}")
-    
-    memorized_item_ids = []
-    unmemorized_item_ids = []
-    
-    for hi in all_items:
-        if hi.memorized:
-            memorized_item_ids.append(hi.item_id)
-        else:
-            unmemorized_item_ids.append(hi.item_id)
-    
-    all_item_ids = [hi.item_id for hi in all_items]
-    
-    return {
-        "all": get_page_count(item_ids=all_item_ids),
-        "memorized": get_page_count(item_ids=memorized_item_ids),
-        "unmemorized": get_page_count(item_ids=unmemorized_item_ids),
-    }
-
-
 def get_profile_data(auth, status_filter=None):
     """Get profile data with optional status filter."""
     # Build filter condition
@@ -0,0 +1,218 @@
+"""In-process index of static Quran metadata (items, pages, surahs).
+
+Items, pages and surahs are reference data that only change through the
+admin table editor, so they are loaded once into lists keyed by item_id /
+page_id / surah_id and served without SQL. Any code path that writes to
+those tables must call invalidate_quran_metadata() so the next lookup
+reloads the index.
+
+That only drops this process's index. Triggers bump quran_metadata_version
+on every edit, and check_quran_metadata_version() (run once per request)
+drops an index built from an older version, so the other worker processes
+pick up the edit too.
+"""
+
+import numpy as np
+from database import db
+from fasthtml.common import NotFoundError
+
+# Tables whose edits must rebuild the index
+METADATA_TABLES = ("items", "pages", "surahs")
+
+_index = None
+
+
+def _stored_version() -> int:
+    rows = db.q("SELECT version FROM quran_metadata_version WHERE id = 1")
+    return rows[0]["version"] if rows else 0
+
+
+def _build_index() -> dict:
+    """Load items, pages and surahs into dense lists indexed by primary key."""
+    # Read before the tables, so an edit made while loading leaves the index
+    # with an older version and the next check reloads it
+    version = _stored_version()
+    item_rows = db.q(
+        "SELECT id, surah_id, page_id, active, page_portion FROM items ORDER BY id"
+    )
+    page_rows = db.q("SELECT id, page_number, juz_number FROM pages ORDER BY id")
+    surah_rows = db.q("SELECT id, name FROM surahs ORDER BY id")
+
+    max_item_id = item_rows[-1]["id"] if item_rows else 0
+    max_page_id = page_rows[-1]["id"] if page_rows else 0
+    max_surah_id = surah_rows[-1]["id"] if surah_rows else 0
+
+    item_page_id = [None] * (max_item_id + 1)
+    item_surah_id = [None] * (max_item_id + 1)
+    item_part_index = [0] * (max_item_id + 1)
+    item_part_count = [0] * (max_item_id + 1)
+    # Page portions (maintained on items by triggers) as an array, so that
+    # page counts for a set of items are a single vectorized sum
+    item_page_portion = np.zeros(max_item_id + 1)
+    page_number = [None] * (max_page_id + 1)
+    page_juz_number = [None] * (max_page_id + 1)
+    surah_name = [None] * (max_surah_id + 1)
+    # First item (by id, active or not) on each page, used for page -> surah lookups
+    page_first_item_id = {}
+    # Active items on each page in id order, used for part numbering
+    page_active_item_ids = {}
+
+    for row in item_rows:
+        item_id, page_id = row["id"], row["page_id"]
+        item_page_id[item_id] = page_id
+        item_surah_id[item_id] = row["surah_id"]
+        item_page_portion[item_id] = row["page_portion"]
+        page_first_item_id.setdefault(page_id, item_id)
+        if row["active"] == 1:
+            page_active_item_ids.setdefault(page_id, []).append(item_id)
+
+    for item_ids in page_active_item_ids.values():
+        for idx, item_id in enumerate(item_ids):
+            item_part_index[item_id] = idx + 1
+            item_part_count[item_id] = len(item_ids)
+
+    for row in page_rows:
+        page_number[row["id"]] = row["page_number"]
+        page_juz_number[row["id"]] = row["juz_number"]
+
+    # Surah and juz of every item as arrays (0 where unknown), so batch views
+    # find the surah/juz boundaries of a run of items with array operations
+    item_surah_ids = np.array([surah_id or 0 for surah_id in item_surah_id], dtype=np.int64)
+    item_juz_numbers = np.array(
+        [page_juz_number[page_id] or 0 if page_id is not None else 0 for page_id in item_page_id],
+        dtype=np.int64,
+    )
+
+    for row in surah_rows:
+        surah_name[row["id"]] = row["name"]
+
+    return {
+        "version": version,
+        "item_page_id": item_page_id,
+        "item_surah_id": item_surah_id,
+        "item_part_index": item_part_index,
+        "item_part_count": item_part_count,
+        "item_page_portion": item_page_portion,
+        "item_surah_ids": item_surah_ids,
+        "item_juz_numbers": item_juz_numbers,
+        "page_number": page_number,
+        "page_juz_number": page_juz_number,
+        "page_first_item_id": page_first_item_id,
+        "surah_name": surah_name,
+    }
+
+
+def load_quran_metadata() -> dict:
+    """Return the metadata index, building it on first use."""
+    global _index
+    if _index is None:
+        _index = _build_index()
+    return _index
+
+
+def invalidate_quran_metadata(table: str = None):
+    """Drop the cached index so the next lookup reloads it.
+
+    Args:
+        table: Name of the edited table. When given, the index is only
+            dropped if the table is one of METADATA_TABLES.
+    """
+    global _index
+    if table is None or table in METADATA_TABLES:
+        _index = None
+
+
+def quran_metadata_version() -> int:
+    """Version of the metadata the index was built from, for keying derived caches."""
+    return load_quran_metadata()["version"]
+
+
+def check_quran_metadata_version():
+    """Drop the index if the metadata tables were edited since it was built (by any process)."""
+    if _index is not None and _index["version"] != _stored_version():
+        invalidate_quran_metadata()
+
+
+def _lookup(column: str, key):
+    values = load_quran_metadata()[column]
+    if key is None or not 0 <= key < len(values) or values[key] is None:
+        raise NotFoundError(f"{column}: {key}")
+    return values[key]
+
+
+def item_page_id(item_id: int) -> int:
+    return _lookup("item_page_id", item_id)
+
+
+def item_surah_id(item_id: int) -> int:
+    return _lookup("item_surah_id", item_id)
+
+
+def item_page_number(item_id: int) -> int:
+    return _lookup("page_number", item_page_id(item_id))
+
+
+def item_juz_number(item_id: int) -> int:
+    return _lookup("page_juz_number", item_page_id(item_id))
+
+
+def item_page_portion(item_id: int) -> float:
+    item_page_id(item_id)
+    return float(load_quran_metadata()["item_page_portion"][item_id])
+
+
+def items_page_count(item_ids) -> float:
+    """Page-equivalent size of item_ids (duplicates count once per occurrence)."""
+    portions = load_quran_metadata()["item_page_portion"]
+    item_ids = np.fromiter(item_ids, dtype=np.int64)
+    if item_ids.size == 0:
+        return 0.0
+    if item_ids.min() < 0 or item_ids.max() >= len(portions):
+        raise NotFoundError(f"item_page_portion: {item_ids.tolist()}")
+    return float(portions[item_ids].sum())
+
+
+def item_boundaries(item_ids) -> dict:
+    """Surah and juz of each of item_ids, and where they change along the list.
+
+    Returns numpy arrays aligned with item_ids: surah_id, juz_number, and
+    surah_starts / juz_starts, which are True where an item is in a different
+    surah / juz than the item before it (never for the first item).
+    """
+    index = load_quran_metadata()
+    item_ids = np.fromiter(item_ids, dtype=np.int64)
+    surah_ids, juz_numbers = index["item_surah_ids"], index["item_juz_numbers"]
+    if item_ids.size and (item_ids.min() < 0 or item_ids.max() >= len(surah_ids)):
+        raise NotFoundError(f"item_ids: {item_ids.tolist()}")
+    surah_id, juz_number = surah_ids[item_ids], juz_numbers[item_ids]
+    return {
+        "surah_id": surah_id,
+        "juz_number": juz_number,
+        "surah_starts": np.diff(surah_id, prepend=surah_id[:1]) != 0,
+        "juz_starts": np.diff(juz_number, prepend=juz_number[:1]) != 0,
+    }
+
+
+def item_part_info(item_id: int) -> tuple[int, int] | None:
+    """Returns (part_number, total_parts) for split pages, None otherwise."""
+    item_page_id(item_id)
+    index = load_quran_metadata()
+    part_count = index["item_part_count"][item_id]
+    if part_count <= 1:
+        return None
+    return (index["item_part_index"][item_id], part_count)
+
+
+def page_juz_number(page_id: int) -> int:
+    return _lookup("page_juz_number", page_id)
+
+
+def page_surah_id(page_id: int) -> int:
+    first_item_id = load_quran_metadata()["page_first_item_id"].get(page_id)
+    if first_item_id is None:
+        raise NotFoundError(f"page_id: {page_id}")
+    return item_surah_id(first_item_id)
+
+
+def surah_name(surah_id: int) -> str:
+    return _lookup("surah_name", surah_id)
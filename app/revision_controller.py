@@ -1,7 +1,9 @@
+import numpy as np
 from fasthtml.common import *
 from monsterui.all import *
 from utils import *
 from constants import *
+from app import quran_metadata
 from app.common_function import *
 from app.revision_view import *
 from app.revision_model import *
@@ -19,8 +21,8 @@ def post(type: str, page: str, plan_id: int):
 
 
 @revision_app.get("/")
-def revision(auth, idx: int | None = 1):
-    return render_revision_table(auth, idx)
+def revision(auth, cursor: int | None = None):
+    return render_revision_table(auth, cursor)
 
 
 @rt("/edit/{revision_id}")
@@ -53,7 +55,9 @@ def post(revision_details: Revision, backlink: str, auth):
     revision_details.plan_id = set_zero_to_none(revision_details.plan_id)
     current_revision = update_revision(revision_details)
     update_stats_and_interval(
-        item_id=current_revision.item_id, mode_code=current_revision.mode_code
+        hafiz_id=current_revision.hafiz_id,
+        item_id=current_revision.item_id,
+        mode_code=current_revision.mode_code,
     )
     return Redirect(backlink)
 
@@ -63,7 +67,9 @@ def delete(revision_id: int, auth):
     current_revision = get_revision_by_id(revision_id)
     delete_revision(revision_id)
     update_stats_and_interval(
-        item_id=current_revision.item_id, mode_code=current_revision.mode_code
+        hafiz_id=current_revision.hafiz_id,
+        item_id=current_revision.item_id,
+        mode_code=current_revision.mode_code,
     )
 
 
@@ -73,7 +79,9 @@ def revision_delete_all(ids: List[int], auth):
         current_revision = revisions[id]
         revisions.delete(id)
         update_stats_and_interval(
-            item_id=current_revision.item_id, mode_code=current_revision.mode_code
+            hafiz_id=current_revision.hafiz_id,
+            item_id=current_revision.item_id,
+            mode_code=current_revision.mode_code,
         )
     return RedirectResponse(revision, status_code=303)
 
@@ -193,6 +201,7 @@ async def bulk_edit_save(revision_date: str, req, auth):
                     )
                 )
                 update_stats_and_interval(
+                    hafiz_id=current_revision.hafiz_id,
                     item_id=current_revision.item_id,
                     mode_code=current_revision.mode_code,
                 )
@@ -281,7 +290,7 @@ def post(revision_details: Revision):
     item_id = revision_details.item_id
 
     rev = insert_revision(revision_details)
-    populate_hafizs_items_stat_columns(item_id=item_id)
+    update_stats_for_new_revision(rev.hafiz_id, item_id, rev.rating, rev.revision_date)
 
     next_item_id = find_next_memorized_item_id(item_id)
 
@@ -361,36 +370,46 @@ def get(
         if not item_ids[-1] == max_item_id:
             item_ids = item_ids[: item_ids.index(max_item_id)]
 
-    _temp_item_ids = []
-    page_surah = get_surah_name(item_id=item_id)
-    page_juz = get_juz_name(item_id=item_id)
-
-    for _item_id in item_ids:
-        current_surah = get_surah_name(item_id=_item_id)
-        current_juz = get_juz_name(item_id=_item_id)
-
-        if current_surah != page_surah and current_juz != page_juz:
-            _temp_item_ids.append(f"{page_surah} surah and Juz {page_juz} ends")
-            page_surah, page_juz = current_surah, current_juz
-        elif current_surah != page_surah:
-            _temp_item_ids.append(f"{page_surah} surah ends")
-            page_surah = current_surah
-        elif current_juz != page_juz:
-            _temp_item_ids.append(f"Juz {page_juz} ends")
-            page_juz = current_juz
-
-        _temp_item_ids.append(_item_id)
-
-    if _temp_item_ids:
-        item_ids = _temp_item_ids
+    # Surah/juz of the starting item followed by the batch, from the boundary index
+    batch_item_ids = item_ids
+    boundaries = quran_metadata.item_boundaries([item_id, *batch_item_ids])
+    surah_ids = boundaries["surah_id"]
+    juz_numbers = boundaries["juz_number"]
+    surah_starts = boundaries["surah_starts"][1:]
+    juz_starts = boundaries["juz_starts"][1:]
+
+    # A separator goes before every item that starts a new surah or juz, naming
+    # the previous item's (surah_ids/juz_numbers are offset by the starting item)
+    item_ids = []
+    start = 0
+    for position in np.flatnonzero(surah_starts | juz_starts):
+        item_ids += batch_item_ids[start:position]
+        ended_surah = quran_metadata.surah_name(int(surah_ids[position]))
+        ended_juz = int(juz_numbers[position])
+        if surah_starts[position] and juz_starts[position]:
+            item_ids.append(f"{ended_surah} surah and Juz {ended_juz} ends")
+        elif surah_starts[position]:
+            item_ids.append(f"{ended_surah} surah ends")
+        else:
+            item_ids.append(f"Juz {ended_juz} ends")
+        start = position
+    item_ids += batch_item_ids[start:]
+
+    # The batch's items, loaded at once for the rows' descriptions and start texts
+    batch_items = {}
+    if batch_item_ids:
+        batch_items = {
+            item.id: item
+            for item in items(where=f"id IN ({', '.join(map(str, batch_item_ids))})")
+        }
 
     def _render_row(current_item_id):
         if isinstance(current_item_id, str):
             return Tr(Td(P(current_item_id), colspan="5", cls="text-center"))
 
-        current_page_details = items[current_item_id]
+        current_page_details = batch_items[current_item_id]
         return Tr(
-            Td(get_page_description(current_item_id)),
+            Td(get_page_description(current_item_id, description=current_page_details.description)),
             Td(P(current_page_details.start_text, cls=(TextT.lg))),
             Td(
                 CheckboxX(
@@ -436,32 +455,19 @@ def get(
         cls=(FlexT.block, FlexT.around, FlexT.middle, "w-full"),
     )
 
-    def get_description(type):
-        get_type_function = {
-            "surah": get_surah_name,
-            "juz": get_juz_name,
-            "page": get_page_number,
-        }
-        if type not in get_type_function.keys():
+    def get_description(values, format_value=lambda value: value):
+        """The batch's only value, or its first and last distinct values."""
+        unique_values = [format_value(value) for value in dict.fromkeys(values)]
+        if not unique_values:
             return ""
-
-        unique_type = list(
-            dict.fromkeys(
-                [
-                    get_type_function[type](item_id=item_id)
-                    for item_id in item_ids
-                    if isinstance(item_id, int)
-                ]
-            )
-        )
-        if len(unique_type) == 1:
-            return unique_type[0]
+        if len(unique_values) == 1:
+            return unique_values[0]
         else:
-            return f"{unique_type[0]} => {unique_type[-1]}"
+            return f"{unique_values[0]} => {unique_values[-1]}"
 
-    surah_description = get_description("surah")
-    juz_description = get_description("juz")
-    page_description = get_description("page")
+    surah_description = get_description(surah_ids[1:].tolist(), quran_metadata.surah_name)
+    juz_description = get_description(juz_numbers[1:].tolist())
+    page_description = get_description(map(get_page_number, batch_item_ids))
 
     return main_area(
         Div(
@@ -516,29 +522,21 @@ async def post(
     form_data = await req.form()
     item_ids = form_data.getlist("ids")
 
-    parsed_data = []
-    for name, value in form_data.items():
-        if name.startswith("rating-"):
-            item_id = name.split("-")[1]
-            if item_id in item_ids:
-                parsed_data.append(
-                    Revision(
-                        item_id=int(item_id),
-                        rating=int(value),
-                        hafiz_id=auth,
-                        revision_date=revision_date,
-                        mode_code=FULL_CYCLE_MODE_CODE,
-                        plan_id=plan_id,
-                    )
-                )
-
-    insert_revisions_bulk(parsed_data)
-
-    for rec in parsed_data:
-        populate_hafizs_items_stat_columns(item_id=rec.item_id)
+    item_ratings = [
+        (int(name.split("-")[1]), int(value))
+        for name, value in form_data.items()
+        if name.startswith("rating-") and name.split("-")[1] in item_ids
+    ]
+    add_revisions_bulk(
+        auth,
+        item_ratings,
+        mode_code=FULL_CYCLE_MODE_CODE,
+        revision_date=revision_date,
+        plan_id=plan_id,
+    )
 
-    if parsed_data:
-        last_item_id = parsed_data[-1].item_id
+    if item_ratings:
+        last_item_id = item_ratings[-1][0]
     else:
         # If none were selected, then navigate to next set of pages
         rating_date = [
@@ -3,14 +3,31 @@ from app.common_function import *
 from database import *
 
 
-def update_stats_and_interval(item_id: int, mode_code: str):
-    populate_hafizs_items_stat_columns(item_id=item_id)
+def update_stats_and_interval(hafiz_id: int, item_id: int, mode_code: str):
+    recompute_item_stats(hafiz_id, item_id)
 
 
-def get_revision_table_data(part_num: int = 1, size: int = 20):
-    start = (part_num - 1) * size
-    end = start + size
-    return revisions(order_by="id desc")[start:end]
+def get_revision_log(hafiz_id: int, cursor: int | None = None, size: int = 20) -> list[dict]:
+    """Newest-first page of the hafiz's revisions, with item/page/surah fields joined.
+
+    Keyset pagination: pass the id of the last row of the previous page as
+    cursor to get the next page, so every page costs the same regardless of
+    how much history precedes it.
+    """
+    cursor_condition = f"AND revisions.id < {cursor}" if cursor is not None else ""
+    return db.q(f"""
+        SELECT revisions.id, revisions.item_id, revisions.mode_code, revisions.plan_id,
+               revisions.rating, revisions.revision_date,
+               items.description, items.page_id, pages.page_number,
+               items.surah_id, surahs.name AS surah_name
+        FROM revisions
+        JOIN items ON items.id = revisions.item_id
+        LEFT JOIN pages ON pages.id = items.page_id
+        LEFT JOIN surahs ON surahs.id = items.surah_id
+        WHERE revisions.hafiz_id = {hafiz_id} {cursor_condition}
+        ORDER BY revisions.id DESC
+        LIMIT {size}
+    """)
 
 
 def get_revision_by_id(revision_id: int):
@@ -29,10 +46,6 @@ def insert_revision(revision_details: Revision):
     return revisions.insert(revision_details)
 
 
-def insert_revisions_bulk(revision_list):
-    return revisions.insert_all(revision_list)
-
-
 def get_items_by_page_id(page_id: int, active_only: bool = True):
     where_clause = f"page_id = {page_id}"
     if active_only:
@@ -8,7 +8,7 @@ from app.common_view import (
 )
 from app.components.display import PageDescription
 from app.components.forms import RatingRadio
-from app.revision_model import get_revision_table_data
+from app.revision_model import get_revision_log
 from database import *
 
 
@@ -48,13 +48,15 @@ def action_buttons():
     )
 
 
-def generate_revision_table_part(part_num: int = 1, size: int = 20) -> Tuple[Tr]:
-    def _render_rows(rev: Revision):
+def generate_revision_table_part(
+    hafiz_id: int, cursor: int | None = None, size: int = 20
+) -> Tuple[Tr]:
+    def _render_rows(rev: dict):
         return Tr(
             Td(
                 CheckboxX(
                     name="ids",
-                    value=rev.id,
+                    value=rev["id"],
                     cls="revision_ids",
                     # To trigger the checkboxChanged event to the bulk edit and bulk delete buttons
                     _="on click send checkboxChanged to .toggle_btn",
@@ -62,31 +64,37 @@ def generate_revision_table_part(part_num: int = 1, size: int = 20) -> Tuple[Tr]
                 )
             ),
             Td(
-                PageDescription(item_id=rev.item_id, is_link=False),
+                PageDescription(
+                    item_id=rev["item_id"],
+                    is_link=False,
+                    description=rev["description"],
+                ),
             ),
-            Td(rev.mode_code),
-            Td(rev.plan_id),
-            Td(render_rating(rev.rating)),
-            Td(date_to_human_readable(rev.revision_date)),
+            Td(rev["mode_code"]),
+            Td(rev["plan_id"]),
+            Td(render_rating(rev["rating"])),
+            Td(date_to_human_readable(rev["revision_date"])),
             Td(
                 A(
                     "Delete",
-                    hx_delete=f"/revision/delete/{rev.id}",
-                    target_id=f"revision-{rev.id}",
+                    hx_delete=f"/revision/delete/{rev['id']}",
+                    target_id=f"revision-{rev['id']}",
                     hx_swap="outerHTML",
                     hx_confirm="Are you sure?",
                     cls=AT.muted,
                 ),
             ),
-            id=f"revision-{rev.id}",
+            id=f"revision-{rev['id']}",
         )
 
-    paginated = [_render_rows(i) for i in get_revision_table_data(part_num, size)]
+    rows = get_revision_log(hafiz_id, cursor, size)
+    paginated = [_render_rows(rev) for rev in rows]
 
-    if len(paginated) == 20:
+    if len(paginated) == size:
+        # The next page starts after the last row shown
         paginated[-1].attrs.update(
             {
-                "get": f"revision?idx={part_num + 1}",
+                "get": f"revision?cursor={rows[-1]['id']}",
                 "hx-trigger": "revealed",
                 "hx-swap": "afterend",
                 "hx-select": "tbody > tr",
@@ -138,7 +146,7 @@ def create_revision_form(type, auth, backlink="/"):
     )
 
 
-def render_revision_table(auth, idx: int | None = 1):
+def render_revision_table(auth, cursor: int | None = None):
     table = Table(
         Thead(
             Tr(
@@ -151,7 +159,7 @@ def render_revision_table(auth, idx: int | None = 1):
                 Th("Action"),
             )
         ),
-        Tbody(*generate_revision_table_part(part_num=idx)),
+        Tbody(*generate_revision_table_part(hafiz_id=auth, cursor=cursor)),
         x_data=select_all_checkbox_x_data(class_name="revision_ids"),
     )
     return main_area(
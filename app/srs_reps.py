@@ -23,17 +23,7 @@ The separation between SRS and fixed reps (fixed_reps.py) is intentional and sho
 be maintained - they solve fundamentally different problems.
 """
 
-from constants import FULL_CYCLE_MODE_CODE, SRS_MODE_CODE
-from database import (
-    db,
-    hafizs_items,
-    revisions,
-)
-from utils import add_days_to_date, calculate_days_difference
-from app.common_function import (
-    get_hafizs_items,
-    get_current_date,
-)
+import numpy as np
 
 # Starting intervals when entering SRS mode
 SRS_START_INTERVAL = {
@@ -74,181 +64,61 @@ SRS_INTERVALS = [
 ]
 
 
-def binary_search_less_than(input_list: list[int], target: int) -> dict:
-    """Find the largest element in a sorted list that is <= target."""
-    left = 0
-    right = len(input_list) - 1
-    possible_answer = {"index": None, "value": None}
+# Share of the actual interval a rating keeps, indexed by rating + 1:
+# Bad=35%, Ok=50%, Good=100%
+_RATING_MULTIPLIERS = np.array([0.35, 0.5, 1], dtype=np.float64)
 
-    while left <= right:
-        middle = (left + right) // 2
-        middle_value = input_list[middle]
+SRS_INTERVALS_ARRAY = np.array(SRS_INTERVALS, dtype=np.int64)
 
-        if middle_value <= target:
-            left = middle + 1
-            possible_answer["index"] = middle
-            possible_answer["value"] = middle_value
-        else:
-            right = middle - 1
 
-    return possible_answer
-
-
-def get_interval_triplet(target_interval: int, interval_list: list[int]) -> list[int]:
+def step_srs_interval_indexes(interval_indexes, ratings):
     """
-    Return [left, current, right] intervals for rating-based progression.
-    Index maps to rating+1: Bad(-1)→0, Ok(0)→1, Good(1)→2.
+    Move indexes into SRS_INTERVALS one step by rating: Bad(-1) left, Ok(0)
+    stay, Good(1) right, clamped to the ends of the sequence.
     """
-    result = binary_search_less_than(input_list=interval_list, target=target_interval)
-    i = result["index"]
-
-    # If no match found (target < first element), start at index 0
-    if i is None:
-        i = 0
-
-    # Build triplet with bounds checking
-    left = interval_list[i - 1] if i > 0 else interval_list[i]
-    right = interval_list[i + 1] if i < len(interval_list) - 1 else interval_list[i]
-    return [left, interval_list[i], right]
-
-
-def start_srs(item_id: int, auth: int, rating: int) -> None:
-    """Move an item from Full Cycle into SRS mode."""
-    current_date = get_current_date(auth)
-    next_interval = SRS_START_INTERVAL[rating]
-    next_review_date = add_days_to_date(current_date, next_interval)
-
-    current_hafiz_items = hafizs_items(where=f"item_id = {item_id}")
-    if current_hafiz_items:
-        current_hafiz_items = current_hafiz_items[0]
-        current_hafiz_items.mode_code = SRS_MODE_CODE
-        current_hafiz_items.next_interval = next_interval
-        current_hafiz_items.srs_start_date = current_date
-        current_hafiz_items.next_review = next_review_date
-        hafizs_items.update(current_hafiz_items)
-
-
-def get_actual_interval(item_id: int) -> int | None:
-    """Return days since last review (may differ from planned if reviewed early/late)."""
-    hafiz_items_details = get_hafizs_items(item_id)
-    if hafiz_items_details is None:
-        return None
-    current_date = get_current_date(hafiz_items_details.hafiz_id)
-
-    last_review = hafiz_items_details.last_review
-    if not last_review:
-        return None
-    return calculate_days_difference(last_review, current_date)
-
+    return np.clip(np.asarray(interval_indexes) + ratings, 0, len(SRS_INTERVALS) - 1)
 
-def apply_rating_penalty(actual_interval: int, rating: int) -> int:
-    """Apply rating penalty: Good=100%, Ok=50%, Bad=35% of actual interval."""
-    rating_multipliers = {1: 1, 0: 0.5, -1: 0.35}
-    return round(actual_interval * rating_multipliers[rating])
 
-
-def get_planned_next_interval(item_id: int) -> int | None:
-    hafiz_items_details = get_hafizs_items(item_id)
-    if hafiz_items_details is None:
-        return None
-    return hafiz_items_details.next_interval
-
-
-def get_next_interval_based_on_rating(current_interval: int, rating: int) -> int:
-    rating_intervals = get_interval_triplet(
-        target_interval=current_interval,
-        interval_list=SRS_INTERVALS,
-    )
-    # Convert rating (-1, 0, 1) to index (0, 1, 2)
-    return rating_intervals[rating + 1]
-
-
-def get_next_interval(item_id: int, rating: int) -> int | None:
+def compute_srs_intervals(current_date, last_reviews, next_intervals, ratings) -> dict:
     """
-    Calculate next SRS interval using max(planned, adjusted_actual) as base,
-    then look up next interval from prime sequence based on rating.
-    """
-    actual_interval = get_actual_interval(item_id)
-    if not actual_interval:
-        return None
-
-    # Apply rating-based penalty to actual interval
-    adjusted_actual = apply_rating_penalty(actual_interval, rating)
-
-    planned_interval = get_planned_next_interval(item_id)
-    if not planned_interval:
-        return None
-
-    # Use whichever interval is larger as the base for progression
-    current_interval = max(planned_interval, adjusted_actual)
-
-    return get_next_interval_based_on_rating(current_interval, rating)
-
-
-def update_hafiz_item_for_srs(rev) -> None:
-    """Process SRS revision: schedule next review or graduate to Full Cycle if interval > 99."""
-    hafiz_items_details = get_hafizs_items(rev.item_id)
-    if hafiz_items_details is None:
-        return  # Skip if no hafiz_items record exists
-    current_date = get_current_date(rev.hafiz_id)
-    next_interval = get_next_interval(item_id=rev.item_id, rating=rev.rating)
-
-    # Save current interval as last_interval before updating
-    hafiz_items_details.last_interval = hafiz_items_details.next_interval
-
-    if next_interval <= SRS_END_INTERVAL:
-        # Stay in SRS: schedule next review
-        hafiz_items_details.next_interval = next_interval
-        hafiz_items_details.next_review = add_days_to_date(current_date, next_interval)
-    else:
-        # Graduate to Full Cycle: clear SRS fields
-        hafiz_items_details.mode_code = FULL_CYCLE_MODE_CODE
-        hafiz_items_details.memorized = True
-        hafiz_items_details.last_interval = calculate_days_difference(
-            hafiz_items_details.last_review, current_date
-        )
-        hafiz_items_details.next_interval = None
-        hafiz_items_details.next_review = None
-        hafiz_items_details.srs_start_date = None
-
-    hafizs_items.update(hafiz_items_details)
-
-    # Also store next_interval on the revision record for history
-    rev.next_interval = next_interval
-    revisions.update(rev, rev.id)
-
-
-def start_srs_for_ok_and_bad_rating(auth: int) -> None:
-    """Called during Close Date: move today's Ok/Bad Full Cycle items into SRS."""
-    current_date = get_current_date(auth)
-
-    # Build query in readable stages
-    query_base = """
-        SELECT revisions.item_id, revisions.rating
-        FROM revisions
-        LEFT JOIN hafizs_items
-            ON revisions.item_id = hafizs_items.item_id
-            AND hafizs_items.hafiz_id = revisions.hafiz_id
+    Next SRS intervals for many revisions on current_date in one vectorized pass.
+
+    Takes parallel sequences of each item's last_review (date string; None or ""
+    if never reviewed), planned next_interval (None if unset) and the rating.
+    current_date is one date for all revisions, or a sequence with each one's date.
+    Returns arrays:
+        next_interval: The next interval (0 where not scheduled)
+        scheduled: Whether an interval could be computed (needs a planned
+            interval and a last review on another day than current_date)
+        graduated: Scheduled and past SRS_END_INTERVAL (back to Full Cycle)
     """
+    ratings = np.asarray(ratings, dtype=np.int64)
+    has_review = np.array([bool(date) for date in last_reviews], dtype=bool)
+    current_dates = np.broadcast_to(np.asarray(current_date, dtype="datetime64[D]"), ratings.shape)
+    review_dates = np.where(
+        has_review,
+        np.array([date if date else "NaT" for date in last_reviews], dtype="datetime64[D]"),
+        current_dates,
+    )
+    actual_intervals = (current_dates - review_dates).astype(np.int64)
+    planned_intervals = np.array(
+        [interval or 0 for interval in next_intervals], dtype=np.int64
+    )
+    scheduled = has_review & (actual_intervals != 0) & (planned_intervals != 0)
 
-    # Build WHERE conditions
-    conditions = [
-        # Only process today's revisions (during Close Date)
-        f"revisions.revision_date = '{current_date}'",
-        # Filter to current hafiz
-        f"revisions.hafiz_id = {auth}",
-        # Only Ok (0) or Bad (-1) ratings trigger SRS entry
-        "revisions.rating IN (-1, 0)",
-        # The revision was performed in Full Cycle mode
-        f"revisions.mode_code = '{FULL_CYCLE_MODE_CODE}'",
-        # The item is currently still in Full Cycle mode (prevents re-processing items already in SRS)
-        f"hafizs_items.mode_code = '{FULL_CYCLE_MODE_CODE}'",
-    ]
-    where_clause = "WHERE " + " AND ".join(conditions)
-
-    # Assemble final query
-    query = f"{query_base} {where_clause}"
-
-    # Execute and process results
-    for item in db.q(query):
-        start_srs(item["item_id"], auth, rating=item["rating"])
+    # Rating penalty on the actual interval, rounded half to even
+    adjusted_actual = np.rint(actual_intervals * _RATING_MULTIPLIERS[ratings + 1]).astype(np.int64)
+    current_intervals = np.maximum(planned_intervals, adjusted_actual)
+
+    # Step from the largest interval <= current (else the first)
+    index = np.maximum(
+        np.searchsorted(SRS_INTERVALS_ARRAY, current_intervals, side="right") - 1, 0
+    )
+    index = step_srs_interval_indexes(index, ratings)
+    next_intervals = np.where(scheduled, SRS_INTERVALS_ARRAY[index], 0)
+
+    return {
+        "next_interval": next_intervals,
+        "scheduled": scheduled,
+        "graduated": scheduled & (next_intervals > SRS_END_INTERVAL),
+    }
@@ -10,6 +10,10 @@ SRS_MODE_CODE = "SR"
 # Pagination configuration (applies to all modes)
 ITEMS_PER_PAGE = 25  # Default batch size for infinite scroll (configurable per hafiz in settings)
 FULL_CYCLE_EXTRA_ROWS = 5  # Extra rows added when Full Cycle limit is reached
+REPORT_WINDOW_DAYS = 30  # Days per infinite scroll batch of the datewise report
+FORECAST_DAYS = 90  # Days projected by the review load forecast
+FORECAST_MAX_DAYS = 365  # Longest forecast the /report/forecast endpoint returns
+ROW_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Rendered summary table rows kept for reuse
 
 RATING_MAP = {"1": "✅ Good", "0": "😄 Ok", "-1": "❌ Bad"}
 
@@ -1,6 +1,12 @@
 import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+import apsw
 from fasthtml.common import database
+from fastlite import Database, Table
 from fastmigrate.core import (
     create_db,
     run_migrations,
@@ -31,16 +37,135 @@ def create_and_migrate_db(db_path):
         print("Database migration failed!")
 
 
+# Applied to every connection handed out by the ConnectionManager. There can be
+# two connections per worker thread (see ConnectionManager), so the page cache
+# is sized per connection: at anyio's default of 40 worker threads that is at
+# most 80 connections x 2 MB = 160 MB per process. The mmap is backed by the
+# OS page cache, which all connections to the file share, so it does not add
+# up per connection.
+CONNECTION_PRAGMAS = {
+    "synchronous": "NORMAL",  # Safe with WAL; fsync only at checkpoints
+    "busy_timeout": 5000,  # Wait up to 5s for the writer instead of "database is locked"
+    "cache_size": -2000,  # 2 MB page cache per connection
+    "mmap_size": 67108864,  # Memory-map up to 64 MB of the database file
+    "wal_autocheckpoint": 50,  # Checkpoint every 50 pages to prevent large WAL files
+}
+
+
+class ConnectionManager:
+    """Hands out one configured fastlite Database per thread.
+
+    A single shared connection serialises every request, and apsw connections
+    must not be used from several threads at once. Each thread gets its own
+    read-write connection, plus a read-only one that is used while
+    use_read_only() is in effect for the current request. Attribute access is
+    delegated to the current connection, so `db.q(...)`, `db.execute(...)`,
+    `db.conn` and `db.t` work as they did on the single Database.
+
+    Connections live as long as their thread, so the number open is bounded by
+    the worker thread pool (anyio's 40 threads by default): at most two per
+    thread plus the event loop's. Raising the thread limit raises the memory
+    held by connection caches accordingly (see CONNECTION_PRAGMAS).
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._read_only = ContextVar("db_read_only", default=False)
+        self._tracers = []
+
+    def _connect(self, read_only: bool) -> Database:
+        if read_only:
+            conn = apsw.Connection(self.db_path, flags=apsw.SQLITE_OPEN_READONLY)
+            connection = Database(conn)
+        else:
+            connection = self._open_read_write()
+        for name, value in CONNECTION_PRAGMAS.items():
+            connection.execute(f"PRAGMA {name}={value};")
+        connection._tracer = self._trace
+        return connection
+
+    def _open_read_write(self) -> Database:
+        # apsw's connection hooks run "PRAGMA optimize" on open with a short busy
+        # timeout, which fails while another connection holds the write lock
+        deadline = time.monotonic() + CONNECTION_PRAGMAS["busy_timeout"] / 1000
+        while True:
+            try:
+                return database(self.db_path)  # Enables WAL
+            except apsw.BusyError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def current(self) -> Database:
+        """Return this thread's connection for the current request's access mode."""
+        read_only = self._read_only.get()
+        attr = "read_only_db" if read_only else "db"
+        connection = getattr(self._local, attr, None)
+        if connection is None:
+            connection = self._connect(read_only)
+            setattr(self._local, attr, connection)
+        return connection
+
+    def use_read_only(self, read_only: bool = True):
+        """Route the rest of the current request (or context) to the read-only connection."""
+        self._read_only.set(read_only)
+
+    @contextmanager
+    def read_only(self):
+        token = self._read_only.set(True)
+        try:
+            yield self
+        finally:
+            self._read_only.reset(token)
+
+    def _trace(self, sql, params):
+        for tracer in self._tracers:
+            tracer(sql, params)
+
+    @contextmanager
+    def tracer(self, tracer=None):
+        """Like Database.tracer, but sees statements run on every thread's connection."""
+        tracer = tracer or print
+        self._tracers.append(tracer)
+        try:
+            yield self
+        finally:
+            self._tracers.remove(tracer)
+
+    @property
+    def t(self):
+        return _CurrentTables(self)
+
+    def __getattr__(self, name):
+        return getattr(self.current(), name)
+
+
+class _CurrentTables:
+    """`db.t` that looks tables up on the calling thread's connection.
+
+    Modules keep `tables = db.t` at import time; this keeps those lookups
+    per-thread instead of pinning them to the importing thread's connection.
+    """
+
+    def __init__(self, manager: ConnectionManager):
+        self._manager = manager
+
+    def __getitem__(self, table_name):
+        return self._manager.current().t[table_name]
+
+    def __getattr__(self, name):
+        return getattr(self._manager.current().t, name)
+
+    def __str__(self):
+        return str(self._manager.current().t)
+
+
 def get_database_connection():
-    """Get configured database connection with migrations"""
+    """Get the connection manager for the migrated database"""
     DB_PATH = get_database_path()
     create_and_migrate_db(DB_PATH)
-    db = database(DB_PATH)
-
-    # Configure auto-checkpoint every 50 pages to prevent large WAL files
-    db.execute("PRAGMA wal_autocheckpoint=50;")
-
-    return db
+    return ConnectionManager(DB_PATH)
 
 
 def get_database_path():
@@ -103,6 +228,57 @@ def backup_database(backup_dir="data/backup"):
 
 db = get_database_connection()
 
+
+class ScopedTable:
+    """Thread-safe stand-in for a module-level fastlite table.
+
+    fastlite keeps per-call state on the Table object (the xtra() filter, the
+    last inserted rowid, the last update result), so a single shared Table is
+    not safe under concurrent requests. Each thread gets its own Table, bound to
+    that thread's connection, and the xtra() filter is held in a ContextVar so
+    it only applies to the request (or test) that set it. Everything else is
+    delegated to the Table.
+    """
+
+    def __init__(self, table_name: str, dataclass):
+        self.table_name = table_name
+        self.dataclass_ref = dataclass
+        self._local = threading.local()
+        self._xtra = ContextVar(f"{table_name}_xtra", default={})
+
+    def _table(self) -> Table:
+        # One Table per thread connection (read-write and read-only)
+        connection = db.current()
+        tables = self._local.__dict__.setdefault("tables", {})
+        table = tables.get(connection)
+        if table is None:
+            table = Table(connection, self.table_name)
+            table.cls = self.dataclass_ref
+            tables[connection] = table
+        table.xtra_id = self._xtra.get()
+        return table
+
+    def xtra(self, **kwargs):
+        """Scope subsequent reads and writes in the current context to kwargs."""
+        self._xtra.set(kwargs)
+
+    @property
+    def xtra_id(self) -> dict:
+        return self._xtra.get()
+
+    def __call__(self, *args, **kwargs):
+        return self._table()(*args, **kwargs)
+
+    def __getitem__(self, pk_values):
+        return self._table()[pk_values]
+
+    def __getattr__(self, name):
+        return getattr(self._table(), name)
+
+    def __repr__(self):
+        return f"<ScopedTable {self.table_name}>"
+
+
 # List of database table names
 _TABLE_NAMES = [
     "hafizs",
@@ -122,10 +298,10 @@ _TABLE_NAMES = [
 for table_name in _TABLE_NAMES:
     table_ref = getattr(db.t, table_name)
     dataclass_name = table_to_dataclass_name(table_name)
-    # Make each database table available as a global variable like 'hafizs', 'items', etc.
-    globals()[table_name] = table_ref
     # Also expose the dataclass that mirrors each table's schema, e.g., 'Hafiz', 'Item', etc.
     globals()[dataclass_name] = table_ref.dataclass()
+    # Make each database table available as a global variable like 'hafizs', 'items', etc.
+    globals()[table_name] = ScopedTable(table_name, globals()[dataclass_name])
 
 # Explicit exports - all public functions, table references, and dataclasses
 # Hides private/internal implementation: _TABLE_NAMES, DB_CONFIG, create_and_migrate_db, get_database_connection, DB_PATH, get_database_path
@@ -7,7 +7,9 @@ from app.page_details_controller import page_details_app
 from app.profile_controller import profile_app
 from app.hafiz_controller import hafiz_app
 from app.home_controller import home_app
+from app.close_date_scheduler import nightly_close_date_lifespan
 from app.common_function import create_app_with_auth
+from app.quran_metadata import load_quran_metadata
 
 app, rt = create_app_with_auth(
     routes=[
@@ -19,9 +21,14 @@ app, rt = create_app_with_auth(
         Mount("/profile", profile_app, name="profile"),
         Mount("/hafiz", hafiz_app, name="hafiz"),
         Mount("/", home_app, name="home"),
-    ]
+    ],
+    # Optional nightly Close Date worker (enabled with NIGHTLY_CLOSE_DATE=true)
+    lifespan=nightly_close_date_lifespan,
 )
 
 print("-" * 15, "ROUTES=", app.routes)
 
+# Static items/pages/surahs metadata is served from memory after this
+load_quran_metadata()
+
 serve()
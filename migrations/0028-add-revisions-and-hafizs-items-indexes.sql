@@ -0,0 +1,27 @@
+-- Composite indexes for the hot revisions and hafizs_items filters
+
+-- Dashboard, Close Date and datewise report: a hafiz's revisions on a date, per mode
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_date_mode
+    ON revisions (hafiz_id, revision_date, mode_code);
+
+-- Streaks and last_review: a hafiz's revisions of one item in date order
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_item_date
+    ON revisions (hafiz_id, item_id, revision_date);
+
+-- Rep-mode counts and page details: revisions of one item in a mode
+CREATE INDEX IF NOT EXISTS idx_revisions_item_mode
+    ON revisions (item_id, mode_code);
+
+-- Full Cycle plan progress: revisions in a plan, per mode
+CREATE INDEX IF NOT EXISTS idx_revisions_plan_mode
+    ON revisions (plan_id, mode_code);
+
+-- hafizs_items lookups by item, and by mode/memorized status
+CREATE INDEX IF NOT EXISTS idx_hafizs_items_hafiz_item
+    ON hafizs_items (hafiz_id, item_id);
+
+CREATE INDEX IF NOT EXISTS idx_hafizs_items_hafiz_mode_memorized
+    ON hafizs_items (hafiz_id, mode_code, memorized);
+
+-- Superseded by the composite indexes above (hafiz_id is their leading column)
+DROP INDEX IF EXISTS idx_hafizs_items_hafiz_id;
@@ -0,0 +1,57 @@
+-- Materialize each item's share of its page, so page-equivalent counts are a SUM
+-- instead of a per-item lookup. An item's portion is 1 / (active items on its
+-- page); every item on the page shares it, and a page without active items is 0.
+ALTER TABLE items ADD COLUMN page_portion REAL NOT NULL DEFAULT 0;
+
+-- Active items per page, for the backfill and the triggers below
+CREATE INDEX IF NOT EXISTS idx_items_page_active
+    ON items (page_id, active);
+
+UPDATE items
+SET page_portion = COALESCE(
+    (SELECT 1.0 / COUNT(*) FROM items AS page_items
+     WHERE page_items.page_id = items.page_id AND page_items.active = 1
+     HAVING COUNT(*) > 0),
+    0
+);
+
+-- Keep page_portion in sync when items are added, removed, moved or (de)activated
+
+CREATE TRIGGER IF NOT EXISTS items_page_portion_after_insert
+AFTER INSERT ON items
+BEGIN
+    UPDATE items
+    SET page_portion = COALESCE(
+        (SELECT 1.0 / COUNT(*) FROM items AS page_items
+         WHERE page_items.page_id = NEW.page_id AND page_items.active = 1
+         HAVING COUNT(*) > 0),
+        0
+    )
+    WHERE page_id = NEW.page_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_page_portion_after_update
+AFTER UPDATE OF page_id, active ON items
+BEGIN
+    UPDATE items
+    SET page_portion = COALESCE(
+        (SELECT 1.0 / COUNT(*) FROM items AS page_items
+         WHERE page_items.page_id = items.page_id AND page_items.active = 1
+         HAVING COUNT(*) > 0),
+        0
+    )
+    WHERE page_id IN (OLD.page_id, NEW.page_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_page_portion_after_delete
+AFTER DELETE ON items
+BEGIN
+    UPDATE items
+    SET page_portion = COALESCE(
+        (SELECT 1.0 / COUNT(*) FROM items AS page_items
+         WHERE page_items.page_id = OLD.page_id AND page_items.active = 1
+         HAVING COUNT(*) > 0),
+        0
+    )
+    WHERE page_id = OLD.page_id;
+END;
@@ -0,0 +1,32 @@
+-- Per-hafiz change counter for hafizs_items, used to invalidate cached
+-- aggregates (status histogram). Bumped by triggers on any insert, delete or
+-- change to the columns that decide an item's status.
+-- No foreign key to hafizs: the row outlives a deleted hafiz, so a reused
+-- hafiz id never matches an aggregate cached for the old one.
+CREATE TABLE IF NOT EXISTS hafizs_items_versions (
+    hafiz_id INTEGER PRIMARY KEY,
+    version  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS hafizs_items_version_after_insert
+AFTER INSERT ON hafizs_items
+BEGIN
+    INSERT INTO hafizs_items_versions (hafiz_id, version) VALUES (NEW.hafiz_id, 1)
+    ON CONFLICT (hafiz_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS hafizs_items_version_after_update
+AFTER UPDATE OF hafiz_id, item_id, memorized, mode_code ON hafizs_items
+BEGIN
+    INSERT INTO hafizs_items_versions (hafiz_id, version) VALUES (OLD.hafiz_id, 1)
+    ON CONFLICT (hafiz_id) DO UPDATE SET version = version + 1;
+    INSERT INTO hafizs_items_versions (hafiz_id, version) VALUES (NEW.hafiz_id, 1)
+    ON CONFLICT (hafiz_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS hafizs_items_version_after_delete
+AFTER DELETE ON hafizs_items
+BEGIN
+    INSERT INTO hafizs_items_versions (hafiz_id, version) VALUES (OLD.hafiz_id, 1)
+    ON CONFLICT (hafiz_id) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,4 @@
+-- Keyset pagination of the revision log: a hafiz's revisions in id order, so
+-- "WHERE hafiz_id = ? AND id < ? ORDER BY id DESC LIMIT n" reads only n rows
+CREATE INDEX IF NOT EXISTS idx_revisions_hafiz_id
+    ON revisions (hafiz_id, id);
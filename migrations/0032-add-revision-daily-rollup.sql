@@ -0,0 +1,96 @@
+-- Per hafiz, date and mode totals of revisions, for the datewise report and
+-- the dashboard's pages-revised indicator. page_equivalents is the sum of the
+-- revised items' page portions. The report builds its page ranges from the
+-- window's revisions, so they are not stored here.
+-- Kept current by the triggers below, which apply each revision insert, delete
+-- or move, and each change to an item's page portion, as a delta. No foreign
+-- key to hafizs: a deleted hafiz's revisions cascade away and their delete
+-- triggers empty it.
+CREATE TABLE IF NOT EXISTS revision_daily_rollup (
+    hafiz_id         INTEGER NOT NULL,
+    revision_date    TEXT NOT NULL,
+    mode_code        CHAR(2) NOT NULL,
+    revision_count   INTEGER NOT NULL,
+    page_equivalents REAL NOT NULL,
+    PRIMARY KEY (hafiz_id, revision_date, mode_code)
+) WITHOUT ROWID;
+
+-- Backfill
+INSERT OR REPLACE INTO revision_daily_rollup
+    (hafiz_id, revision_date, mode_code, revision_count, page_equivalents)
+SELECT
+    day.hafiz_id, day.revision_date, day.mode_code,
+    COUNT(*), COALESCE(SUM(items.page_portion), 0)
+FROM revisions AS day
+LEFT JOIN items ON items.id = day.item_id
+GROUP BY day.hafiz_id, day.revision_date, day.mode_code;
+
+CREATE TRIGGER IF NOT EXISTS revision_daily_rollup_after_insert
+AFTER INSERT ON revisions
+BEGIN
+    INSERT INTO revision_daily_rollup
+        (hafiz_id, revision_date, mode_code, revision_count, page_equivalents)
+    VALUES (
+        NEW.hafiz_id, NEW.revision_date, NEW.mode_code, 1,
+        COALESCE((SELECT page_portion FROM items WHERE id = NEW.item_id), 0)
+    )
+    ON CONFLICT (hafiz_id, revision_date, mode_code) DO UPDATE SET
+        revision_count = revision_count + 1,
+        page_equivalents = page_equivalents + excluded.page_equivalents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS revision_daily_rollup_after_delete
+AFTER DELETE ON revisions
+BEGIN
+    UPDATE revision_daily_rollup SET
+        revision_count = revision_count - 1,
+        page_equivalents = page_equivalents
+            - COALESCE((SELECT page_portion FROM items WHERE id = OLD.item_id), 0)
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_code = OLD.mode_code;
+    DELETE FROM revision_daily_rollup
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_code = OLD.mode_code
+        AND revision_count <= 0;
+END;
+
+-- A moved revision (other hafiz, date, mode or item) leaves its old row and joins its new one
+CREATE TRIGGER IF NOT EXISTS revision_daily_rollup_after_update
+AFTER UPDATE OF hafiz_id, revision_date, mode_code, item_id ON revisions
+BEGIN
+    UPDATE revision_daily_rollup SET
+        revision_count = revision_count - 1,
+        page_equivalents = page_equivalents
+            - COALESCE((SELECT page_portion FROM items WHERE id = OLD.item_id), 0)
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_code = OLD.mode_code;
+    DELETE FROM revision_daily_rollup
+    WHERE hafiz_id = OLD.hafiz_id AND revision_date = OLD.revision_date AND mode_code = OLD.mode_code
+        AND revision_count <= 0;
+
+    INSERT INTO revision_daily_rollup
+        (hafiz_id, revision_date, mode_code, revision_count, page_equivalents)
+    VALUES (
+        NEW.hafiz_id, NEW.revision_date, NEW.mode_code, 1,
+        COALESCE((SELECT page_portion FROM items WHERE id = NEW.item_id), 0)
+    )
+    ON CONFLICT (hafiz_id, revision_date, mode_code) DO UPDATE SET
+        revision_count = revision_count + 1,
+        page_equivalents = page_equivalents + excluded.page_equivalents;
+END;
+
+-- A page portion change (items added to, removed from or moved between pages,
+-- see 0029) shifts every row holding a revision of the item by the difference
+CREATE TRIGGER IF NOT EXISTS revision_daily_rollup_after_page_portion_update
+AFTER UPDATE OF page_portion ON items
+WHEN NEW.page_portion IS NOT OLD.page_portion
+BEGIN
+    UPDATE revision_daily_rollup SET
+        page_equivalents = page_equivalents + (NEW.page_portion - OLD.page_portion) * (
+            SELECT COUNT(*) FROM revisions
+            WHERE revisions.item_id = NEW.id
+                AND revisions.hafiz_id = revision_daily_rollup.hafiz_id
+                AND revisions.revision_date = revision_daily_rollup.revision_date
+                AND revisions.mode_code = revision_daily_rollup.mode_code
+        )
+    WHERE (hafiz_id, revision_date, mode_code) IN (
+        SELECT hafiz_id, revision_date, mode_code FROM revisions WHERE item_id = NEW.id
+    );
+END;
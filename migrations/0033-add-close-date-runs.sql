@@ -0,0 +1,14 @@
+-- One row per run of the scheduled Close Date worker (app/close_date_scheduler.py).
+-- run_date is the date every hafiz behind it was closed up to; finished_at
+-- stays NULL if the run was interrupted. failures lists each hafiz that could
+-- not be closed as "hafiz_id: error", one per line.
+CREATE TABLE IF NOT EXISTS close_date_runs (
+    id             INTEGER PRIMARY KEY,
+    run_date       TEXT NOT NULL,
+    started_at     TEXT NOT NULL,
+    finished_at    TEXT,
+    hafiz_count    INTEGER NOT NULL DEFAULT 0,
+    closed_days    INTEGER NOT NULL DEFAULT 0,
+    revision_count INTEGER NOT NULL DEFAULT 0,
+    failures       TEXT NOT NULL DEFAULT ''
+);
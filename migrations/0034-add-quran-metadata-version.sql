@@ -0,0 +1,64 @@
+-- Change counter for the static metadata tables (items, pages, surahs).
+-- Each worker process keeps an in-memory index of them (app/quran_metadata.py)
+-- and compares this version with the one it was built from, so an edit made
+-- in one process is picked up by the others.
+CREATE TABLE IF NOT EXISTS quran_metadata_version (
+    id      INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO quran_metadata_version (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS items_metadata_version_after_insert
+AFTER INSERT ON items
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_metadata_version_after_update
+AFTER UPDATE ON items
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_metadata_version_after_delete
+AFTER DELETE ON items
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS pages_metadata_version_after_insert
+AFTER INSERT ON pages
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS pages_metadata_version_after_update
+AFTER UPDATE ON pages
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS pages_metadata_version_after_delete
+AFTER DELETE ON pages
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS surahs_metadata_version_after_insert
+AFTER INSERT ON surahs
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS surahs_metadata_version_after_update
+AFTER UPDATE ON surahs
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS surahs_metadata_version_after_delete
+AFTER DELETE ON surahs
+BEGIN
+    UPDATE quran_metadata_version SET version = version + 1 WHERE id = 1;
+END;
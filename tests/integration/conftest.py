@@ -4,6 +4,7 @@ Integration tests use dev database with master data (items, pages, surahs, modes
 Test users are cleaned up after each test to avoid pollution.
 """
 
+import time
 import pytest
 from fasthtml.core import Client
 
@@ -70,3 +71,51 @@ def auth_session(test_user):
     client.cookies = response.cookies
 
     return client
+
+
+@pytest.fixture
+def selected_hafiz_client(client):
+    """Logged-in client with a freshly added hafiz selected. Usage: selected_hafiz_client.get("/")"""
+    from app.users_model import create_user
+    from database import hafizs, users
+
+    email = f"selected_hafiz_test_{int(time.time() * 1000)}@example.com"
+    user_id = create_user(email, "password123", "Selected Hafiz Test User")
+    response = client.post(
+        "/users/login",
+        data={"email": email, "password": "password123"},
+        follow_redirects=False,
+    )
+    client.cookies = response.cookies
+    client.post("/hafiz/add", data={"name": "Selected Hafiz"}, follow_redirects=False)
+    hafiz_id = hafizs(where=f"user_id={user_id}")[0].id
+    hafizs.update({"current_date": "2024-01-15"}, hafiz_id)
+    response = client.post(
+        "/hafiz/selection",
+        data={"current_hafiz_id": hafiz_id},
+        follow_redirects=False,
+    )
+    client.cookies = response.cookies
+
+    yield client
+
+    users.delete(user_id)
+
+
+@pytest.fixture
+def add_revision():
+    """Insert a revision row directly. Usage: add_revision(hafiz_id, item_id, "2024-01-15", mode_code, rating=1)"""
+    from constants import FULL_CYCLE_MODE_CODE
+    from database import revisions
+
+    def _add_revision(hafiz_id, item_id, revision_date, mode_code=FULL_CYCLE_MODE_CODE, rating=1):
+        revisions.xtra()
+        return revisions.insert(
+            hafiz_id=hafiz_id,
+            item_id=item_id,
+            revision_date=revision_date,
+            mode_code=mode_code,
+            rating=rating,
+        )
+
+    return _add_revision
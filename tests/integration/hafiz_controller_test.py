@@ -99,6 +99,30 @@ def test_add_hafiz_populates_items(auth_session, test_user):
     hafizs.delete(hafiz_id)
 
 
+def test_clone_hafiz_without_selected_hafiz(auth_session, test_user):
+    """POST /hafiz/clone works from the selection page, before any hafiz is selected."""
+    from database import hafizs
+
+    suffix = int(time.time() * 1000)
+    template_name = f"Clone Template {suffix}"
+    auth_session.post("/hafiz/add", data={"name": template_name}, follow_redirects=False)
+    template_id = hafizs(where=f"user_id={test_user['user_id']} AND name='{template_name}'")[0].id
+
+    response = auth_session.post(
+        "/hafiz/clone",
+        data={"template_hafiz_id": template_id, "names": f"Clone A {suffix}\nClone B {suffix}"},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 303
+    assert response.headers["location"] == "/hafiz/selection"
+
+    clones = hafizs(where=f"user_id={test_user['user_id']} AND name LIKE 'Clone _ {suffix}'")
+    assert len(clones) == 2
+    for hafiz in [*clones, hafizs[template_id]]:
+        hafizs.delete(hafiz.id)
+
+
 # ============================================================================
 # Delete Hafiz Tests
 # ============================================================================
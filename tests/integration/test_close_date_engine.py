@@ -0,0 +1,400 @@
+"""Integration tests for the batched Close Date engine (app/close_date.py).
+
+Tests verify that:
+1. Each mode's transition matches the per-item Close Date functions
+2. Streak columns and last_review are refreshed for revised items
+3. All writes happen in one transaction (nothing is written on failure)
+4. The returned summary reports the transitions made
+5. catch_up_close_date gives the same result as closing each day in turn
+6. A close that started from a date another close already advanced is rejected
+"""
+
+import threading
+import pytest
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    NEW_MEMORIZATION_MODE_CODE,
+    SRS_MODE_CODE,
+)
+from database import db, hafizs, hafizs_items, plans, revisions
+from app.close_date import CloseDateConflict, catch_up_close_date, close_date
+from app.hafiz_context import refresh_hafiz_context
+
+
+def _hafiz_item(hafiz_id, item_id):
+    hafizs_items.xtra()
+    return hafizs_items(where=f"hafiz_id = {hafiz_id} AND item_id = {item_id}")[0]
+
+
+def _unmemorized_item_ids(hafiz_id, count):
+    hafizs_items.xtra()
+    rows = hafizs_items(
+        where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=count
+    )
+    return [row.item_id for row in rows]
+
+
+class TestCloseDateTransitions:
+    """Mode transitions applied by close_date()."""
+
+    def test_new_memorization_moves_to_daily(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        add_revision(hafiz_id, item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+
+        summary = close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert hafiz_item.mode_code == DAILY_REPS_MODE_CODE
+        assert hafiz_item.memorized == 1
+        assert hafiz_item.next_interval == 1
+        assert hafiz_item.next_review == "2024-01-16"
+        assert (item_id, FULL_CYCLE_MODE_CODE, DAILY_REPS_MODE_CODE) in summary["transitions"]
+
+    def test_daily_graduates_to_weekly_at_threshold(self, progression_test_hafiz, add_revision):
+        """The fixture's Daily item has custom_daily_threshold=2."""
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        hafizs_items.xtra()
+        daily_item = hafizs_items(
+            where=f"hafiz_id = {hafiz_id} AND mode_code = '{DAILY_REPS_MODE_CODE}'"
+        )[0]
+        add_revision(hafiz_id, daily_item.item_id, "2024-01-14", DAILY_REPS_MODE_CODE)
+        add_revision(hafiz_id, daily_item.item_id, current_date, DAILY_REPS_MODE_CODE)
+
+        summary = close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, daily_item.item_id)
+        assert hafiz_item.mode_code == WEEKLY_REPS_MODE_CODE
+        assert hafiz_item.next_interval == 7
+        assert hafiz_item.next_review == "2024-01-22"
+        assert hafiz_item.last_interval == 1
+        assert summary["transitions"] == [
+            (daily_item.item_id, DAILY_REPS_MODE_CODE, WEEKLY_REPS_MODE_CODE)
+        ]
+
+    def test_daily_below_threshold_stays(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        hafizs_items.xtra()
+        daily_item = hafizs_items(
+            where=f"hafiz_id = {hafiz_id} AND mode_code = '{DAILY_REPS_MODE_CODE}'"
+        )[0]
+        add_revision(hafiz_id, daily_item.item_id, current_date, DAILY_REPS_MODE_CODE)
+
+        summary = close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, daily_item.item_id)
+        assert hafiz_item.mode_code == DAILY_REPS_MODE_CODE
+        assert hafiz_item.next_review == "2024-01-16"
+        assert summary["transitions"] == []
+
+    def test_full_cycle_ok_rating_starts_srs(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        hafizs_items.update({"memorized": True}, _hafiz_item(hafiz_id, item_id).id)
+        add_revision(hafiz_id, item_id, "2024-01-05", FULL_CYCLE_MODE_CODE)
+        add_revision(hafiz_id, item_id, current_date, FULL_CYCLE_MODE_CODE, rating=0)
+        hafizs_items.update({"last_review": "2024-01-05"}, _hafiz_item(hafiz_id, item_id).id)
+
+        summary = close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert hafiz_item.mode_code == SRS_MODE_CODE
+        assert hafiz_item.next_interval == 10
+        assert hafiz_item.next_review == "2024-01-25"
+        assert hafiz_item.srs_start_date == current_date
+        assert hafiz_item.last_interval == 10
+        assert (item_id, FULL_CYCLE_MODE_CODE, SRS_MODE_CODE) in summary["transitions"]
+
+    def test_srs_schedules_next_interval_and_records_it(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        hafizs_items.update(
+            {
+                "mode_code": SRS_MODE_CODE,
+                "memorized": True,
+                "next_interval": 7,
+                "last_review": "2024-01-07",
+            },
+            _hafiz_item(hafiz_id, item_id).id,
+        )
+        rev = add_revision(hafiz_id, item_id, current_date, SRS_MODE_CODE, rating=1)
+
+        close_date(hafiz_id)
+
+        # max(planned 7, actual 8) steps from 7 in the sequence; Good moves to 11
+        expected = 11
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert hafiz_item.mode_code == SRS_MODE_CODE
+        assert hafiz_item.last_interval == 7
+        assert hafiz_item.next_interval == expected
+        assert revisions[rev.id].next_interval == expected
+
+    def test_srs_without_actual_interval_is_left_unscheduled(self, progression_test_hafiz, add_revision):
+        """An SRS item with no prior review has no interval to grow from."""
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        hafizs_items.update(
+            {
+                "mode_code": SRS_MODE_CODE,
+                "memorized": True,
+                "next_interval": 7,
+                "next_review": current_date,
+            },
+            _hafiz_item(hafiz_id, item_id).id,
+        )
+        add_revision(hafiz_id, item_id, current_date, SRS_MODE_CODE, rating=1)
+
+        summary = close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert summary["srs_unscheduled"] == [item_id]
+        assert hafiz_item.next_interval == 7
+        assert hafiz_item.next_review == current_date
+        assert hafiz_item.last_review == current_date
+
+
+class TestCloseDateBookkeeping:
+    """Stats, date advance and transactional behaviour of close_date()."""
+
+    def test_streaks_and_last_review_refreshed(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        add_revision(hafiz_id, item_id, "2024-01-10", FULL_CYCLE_MODE_CODE, rating=1)
+        add_revision(hafiz_id, item_id, "2024-01-12", FULL_CYCLE_MODE_CODE, rating=-1)
+        add_revision(hafiz_id, item_id, current_date, FULL_CYCLE_MODE_CODE, rating=-1)
+
+        close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert hafiz_item.bad_streak == 2
+        assert hafiz_item.good_streak == 0
+        assert hafiz_item.last_review == current_date
+
+    def test_summary_and_date_advance(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_ids = _unmemorized_item_ids(hafiz_id, 3)
+        for item_id in item_ids:
+            add_revision(hafiz_id, item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+
+        summary = close_date(hafiz_id)
+
+        assert summary["current_date"] == current_date
+        assert summary["next_date"] == "2024-01-16"
+        assert summary["revision_count"] == 3
+        assert summary["updated_item_ids"] == sorted(item_ids)
+        assert hafizs[hafiz_id].current_date == "2024-01-16"
+
+    def test_only_closes_given_hafiz(self, progression_test_hafiz, multi_mode_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        other_hafiz_id = multi_mode_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        other_item_id = _unmemorized_item_ids(other_hafiz_id, 1)[0]
+        add_revision(other_hafiz_id, other_item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+
+        summary = close_date(hafiz_id)
+
+        assert summary["revision_count"] == 0
+        assert _hafiz_item(other_hafiz_id, other_item_id).memorized == 0
+        assert hafizs[other_hafiz_id].current_date == current_date
+
+    def test_failure_rolls_back_every_write(self, progression_test_hafiz, monkeypatch, add_revision):
+        import app.close_date as close_date_module
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        add_revision(hafiz_id, item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+
+        def failing_plan_cycle(hafiz_id):
+            raise RuntimeError("plan update failed")
+
+        monkeypatch.setattr(close_date_module, "_cycle_full_cycle_plan", failing_plan_cycle)
+        with pytest.raises(RuntimeError):
+            close_date(hafiz_id)
+
+        hafiz_item = _hafiz_item(hafiz_id, item_id)
+        assert hafiz_item.mode_code == FULL_CYCLE_MODE_CODE
+        assert hafiz_item.memorized == 0
+        assert hafizs[hafiz_id].current_date == current_date
+
+
+class TestConcurrentCloseDate:
+    """Two closes of the same day apply it once."""
+
+    def test_stale_close_is_rejected(self, progression_test_hafiz, add_revision):
+        import app.close_date as close_date_module
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        add_revision(hafiz_id, item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+        close_date(hafiz_id)
+        closed = _hafiz_snapshot(hafiz_id)
+
+        # A close that read the date before the first one committed
+        with pytest.raises(CloseDateConflict):
+            close_date_module._close_dates(hafiz_id, [current_date])
+
+        assert _hafiz_snapshot(hafiz_id) == closed
+
+    def test_concurrent_closes_apply_the_day_once(self, progression_test_hafiz, monkeypatch, add_revision):
+        import app.close_date as close_date_module
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_id = _unmemorized_item_ids(hafiz_id, 1)[0]
+        add_revision(hafiz_id, item_id, current_date, NEW_MEMORIZATION_MODE_CODE)
+
+        # Both closes read the current date before either starts writing
+        barrier = threading.Barrier(2)
+        get_hafiz = close_date_module.get_hafiz
+
+        def get_hafiz_together(hafiz_id):
+            hafiz = get_hafiz(hafiz_id)
+            barrier.wait(timeout=5)
+            return hafiz
+
+        monkeypatch.setattr(close_date_module, "get_hafiz", get_hafiz_together)
+        outcomes = []
+
+        def close():
+            try:
+                outcomes.append(close_date(hafiz_id)["current_date"])
+            except CloseDateConflict:
+                outcomes.append("conflict")
+
+        threads = [threading.Thread(target=close) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(outcomes) == sorted([current_date, "conflict"])
+        assert hafizs[hafiz_id].current_date == "2024-01-16"
+        assert _hafiz_item(hafiz_id, item_id).mode_code == DAILY_REPS_MODE_CODE
+
+
+def _hafiz_snapshot(hafiz_id):
+    """Everything Close Date writes for a hafiz."""
+    return {
+        "current_date": db.q(f'SELECT "current_date" AS d FROM hafizs WHERE id = {hafiz_id}')[0]["d"],
+        "hafizs_items": db.q(f"SELECT * FROM hafizs_items WHERE hafiz_id = {hafiz_id} ORDER BY id"),
+        "revisions": db.q(f"SELECT id, next_interval FROM revisions WHERE hafiz_id = {hafiz_id} ORDER BY id"),
+        "plans": db.q(f"SELECT completed FROM plans WHERE hafiz_id = {hafiz_id} ORDER BY id"),
+        "rollup": db.q(f"SELECT * FROM revision_daily_rollup WHERE hafiz_id = {hafiz_id} ORDER BY 2, 3"),
+    }
+
+
+class _Rollback(Exception):
+    pass
+
+
+class TestCatchUpCloseDate:
+    """catch_up_close_date() over a range of skipped dates."""
+
+    @pytest.fixture
+    def week_of_revisions(self, progression_test_hafiz, add_revision):
+        """Five days of mixed revisions: new pages, Daily reps, SRS entry,
+        an SRS review and a fully revised Full Cycle plan."""
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        plans.xtra()
+        plan_id = plans.insert(hafiz_id=hafiz_id, completed=0).id
+        item_ids = _unmemorized_item_ids(hafiz_id, 6)
+        new_ids, full_cycle_ids, srs_id = item_ids[:2], item_ids[2:5], item_ids[5]
+        for item_id in new_ids:
+            add_revision(hafiz_id, item_id, "2024-01-15", NEW_MEMORIZATION_MODE_CODE)
+            add_revision(hafiz_id, item_id, "2024-01-16", DAILY_REPS_MODE_CODE)
+
+        for item_id in full_cycle_ids:
+            hafizs_items.update(
+                {"mode_code": FULL_CYCLE_MODE_CODE, "memorized": True},
+                _hafiz_item(hafiz_id, item_id).id,
+            )
+        for item_id, date, rating in zip(
+            full_cycle_ids, ["2024-01-16", "2024-01-16", "2024-01-17"], [1, 0, 1]
+        ):
+            revisions.xtra()
+            revisions.insert(
+                hafiz_id=hafiz_id, item_id=item_id, mode_code=FULL_CYCLE_MODE_CODE,
+                revision_date=date, rating=rating, plan_id=plan_id,
+            )
+
+        hafizs_items.update(
+            {"mode_code": SRS_MODE_CODE, "next_interval": 7, "last_review": "2024-01-11"},
+            _hafiz_item(hafiz_id, srs_id).id,
+        )
+        add_revision(hafiz_id, srs_id, "2024-01-18", SRS_MODE_CODE, rating=1)
+        # Nothing is revised on 2024-01-19
+        return hafiz_id
+
+    def test_matches_closing_each_day(self, week_of_revisions):
+        hafiz_id = week_of_revisions
+
+        # Close the days one by one, record the outcome, then roll it back
+        try:
+            with db.conn:
+                sequential = [close_date(hafiz_id) for _ in range(5)]
+                sequential_state = _hafiz_snapshot(hafiz_id)
+                raise _Rollback
+        except _Rollback:
+            refresh_hafiz_context(hafiz_id)
+        assert hafizs[hafiz_id].current_date == "2024-01-15"
+
+        caught_up = catch_up_close_date(hafiz_id, "2024-01-20")
+
+        assert caught_up == sequential
+        assert _hafiz_snapshot(hafiz_id) == sequential_state
+        assert [summary["current_date"] for summary in caught_up] == [
+            "2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18", "2024-01-19",
+        ]
+        assert hafizs[hafiz_id].current_date == "2024-01-20"
+        # The scenario covers SRS entry and the plan rollover (every page of the
+        # plan is already revised, so it completes on the first day)
+        assert [summary["plan_completed"] for summary in caught_up] == [True, False, False, False, False]
+        assert any(to_mode == SRS_MODE_CODE for _, _, to_mode in caught_up[1]["transitions"])
+
+    def test_failure_rolls_back_the_whole_range(self, week_of_revisions, monkeypatch):
+        import app.close_date as close_date_module
+
+        hafiz_id = week_of_revisions
+        before = _hafiz_snapshot(hafiz_id)
+        close_day = close_date_module._close_day
+
+        def failing_close_day(hafiz_id, current_date, *args):
+            if current_date == "2024-01-18":
+                raise RuntimeError("close failed")
+            return close_day(hafiz_id, current_date, *args)
+
+        monkeypatch.setattr(close_date_module, "_close_day", failing_close_day)
+        with pytest.raises(RuntimeError):
+            catch_up_close_date(hafiz_id, "2024-01-20")
+
+        assert _hafiz_snapshot(hafiz_id) == before
+
+    def test_until_date_not_ahead_closes_nothing(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        assert catch_up_close_date(hafiz_id, progression_test_hafiz["current_date"]) == []
+        assert hafizs[hafiz_id].current_date == progression_test_hafiz["current_date"]
+
+    def test_route_catches_up_to_selected_date(self, week_of_revisions):
+        from app.home_controller import change_the_current_date
+
+        hafiz_id = week_of_revisions
+        change_the_current_date(
+            auth=hafiz_id, skip_enabled="true", skip_to_date="2024-01-20", catch_up_enabled="true"
+        )
+
+        assert hafizs[hafiz_id].current_date == "2024-01-20"
+        hafizs_items.xtra()
+        # The new pages were memorized and moved on to Daily Reps
+        assert len(hafizs_items(where=f"hafiz_id = {hafiz_id} AND mode_code = '{DAILY_REPS_MODE_CODE}'")) >= 2
@@ -0,0 +1,125 @@
+"""Integration tests for the scheduled Close Date worker (app/close_date_scheduler.py).
+
+Tests verify that:
+1. Every hafiz behind the run date is caught up to it and the run is reported
+2. A failing hafiz is recorded without stopping the others
+3. No more than the configured number of hafizs close at once
+4. The app lifespan only starts the nightly loop when enabled
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+import pytest
+from constants import NEW_MEMORIZATION_MODE_CODE
+from database import db, hafizs, hafizs_items, revisions
+import app.close_date_scheduler as scheduler
+
+
+def _run_row(run_id):
+    return db.q("SELECT * FROM close_date_runs WHERE id = ?", [run_id])[0]
+
+
+def test_catches_up_hafizs_and_reports_run(progression_test_hafiz, multi_mode_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    other_hafiz_id = multi_mode_test_hafiz["hafiz_id"]
+    hafizs_items.xtra()
+    item_id = hafizs_items(where=f"hafiz_id = {hafiz_id} AND memorized = 0", limit=1)[0].item_id
+    revisions.xtra()
+    revisions.insert(
+        hafiz_id=hafiz_id, item_id=item_id, mode_code=NEW_MEMORIZATION_MODE_CODE,
+        revision_date="2024-01-15", rating=1,
+    )
+
+    report = asyncio.run(scheduler.run_scheduled_close_date("2024-01-18"))
+
+    assert report["failures"] == {}
+    assert hafizs[hafiz_id].current_date == "2024-01-18"
+    assert hafizs[other_hafiz_id].current_date == "2024-01-18"
+    assert report["hafiz_count"] >= 2
+    assert report["closed_days"] >= 6
+    assert report["revision_count"] >= 1
+
+    row = _run_row(report["run_id"])
+    assert row["run_date"] == "2024-01-18"
+    assert row["finished_at"] is not None
+    assert (row["hafiz_count"], row["closed_days"], row["revision_count"], row["failures"]) == (
+        report["hafiz_count"], report["closed_days"], report["revision_count"], "",
+    )
+
+    # Nobody is behind any more
+    assert hafiz_id not in scheduler.get_hafiz_ids_behind("2024-01-18")
+
+
+def test_failure_is_recorded_and_others_close(progression_test_hafiz, multi_mode_test_hafiz, monkeypatch):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    other_hafiz_id = multi_mode_test_hafiz["hafiz_id"]
+    catch_up_close_date = scheduler.catch_up_close_date
+
+    def failing_catch_up(failing_id, run_date):
+        if failing_id == hafiz_id:
+            raise RuntimeError("close failed")
+        return catch_up_close_date(failing_id, run_date)
+
+    monkeypatch.setattr(scheduler, "catch_up_close_date", failing_catch_up)
+    report = asyncio.run(scheduler.run_scheduled_close_date("2024-01-16"))
+
+    assert report["failures"] == {hafiz_id: "RuntimeError: close failed"}
+    assert hafizs[hafiz_id].current_date == "2024-01-15"
+    assert hafizs[other_hafiz_id].current_date == "2024-01-16"
+    assert f"{hafiz_id}: RuntimeError: close failed" in _run_row(report["run_id"])["failures"]
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_concurrency_is_bounded(monkeypatch, concurrency):
+    lock = threading.Lock()
+    active, peak, closed = [0], [0], []
+
+    def slow_catch_up(hafiz_id, run_date):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+            closed.append(hafiz_id)
+        return []
+
+    monkeypatch.setattr(scheduler, "get_hafiz_ids_behind", lambda run_date: list(range(1, 11)))
+    monkeypatch.setattr(scheduler, "catch_up_close_date", slow_catch_up)
+    report = asyncio.run(
+        scheduler.run_scheduled_close_date("2024-01-16", batch_size=4, concurrency=concurrency)
+    )
+
+    assert sorted(closed) == list(range(1, 11))
+    assert peak[0] == concurrency
+    assert report["hafiz_count"] == 10
+
+
+def test_seconds_until_next_run():
+    now = datetime(2024, 1, 15, 23, 0)
+    assert scheduler.seconds_until("00:05", now) == 65 * 60
+    assert scheduler.seconds_until("23:30", now) == 30 * 60
+
+
+@pytest.mark.parametrize("enabled, expected_runs", [("true", 1), ("", 0)])
+def test_lifespan_starts_nightly_loop_when_enabled(monkeypatch, enabled, expected_runs):
+    runs = []
+
+    async def fake_run_scheduled_close_date():
+        runs.append(1)
+
+    monkeypatch.setenv("NIGHTLY_CLOSE_DATE", enabled)
+    monkeypatch.setattr(scheduler, "seconds_until", lambda clock_time: 0)
+    monkeypatch.setattr(scheduler, "run_scheduled_close_date", fake_run_scheduled_close_date)
+
+    async def serve_briefly():
+        async with scheduler.nightly_close_date_lifespan(app=None):
+            while len(runs) < expected_runs:
+                await asyncio.sleep(0)
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+    asyncio.run(asyncio.wait_for(serve_briefly(), timeout=5))
+    assert bool(runs) == bool(expected_runs)
@@ -0,0 +1,103 @@
+"""Integration tests for the per-thread ConnectionManager in database.py.
+
+Tests verify that:
+1. Each connection is configured with WAL and the tuning pragmas
+2. Threads get their own connections, and readers are not blocked by a writer
+3. Read-only routes run on the read-only connection
+"""
+
+import threading
+import apsw
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from database import db, items
+
+
+def _pragma(name):
+    return db.q(f"PRAGMA {name}")[0]
+
+
+class TestConnectionConfiguration:
+    """Pragmas applied to every connection."""
+
+    def test_read_write_pragmas(self):
+        assert _pragma("journal_mode")["journal_mode"] == "wal"
+        assert _pragma("synchronous")["synchronous"] == 1  # NORMAL
+        assert _pragma("busy_timeout")["timeout"] == 5000
+        assert _pragma("cache_size")["cache_size"] == -2000
+        assert _pragma("mmap_size")["mmap_size"] > 0
+
+    def test_read_only_connection_rejects_writes(self):
+        with db.read_only():
+            assert db.conn.readonly("main")
+            assert _pragma("busy_timeout")["timeout"] == 5000
+            with pytest.raises(apsw.ReadOnlyError):
+                db.execute("UPDATE modes SET name = name")
+        assert not db.conn.readonly("main")
+
+
+class TestPerThreadConnections:
+    """Each thread has its own connection."""
+
+    def test_threads_get_distinct_connections(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            other = pool.submit(lambda: db.current()).result()
+        assert other is not db.current()
+        assert db.current() is db.current()
+
+    def test_table_getter_follows_thread(self):
+        tables = db.t
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(lambda: (tables["items"].db, db.current())).result()
+        assert other[0] is other[1]
+        assert tables["items"].db is db.current()
+
+    def test_readers_not_blocked_by_open_write_transaction(self):
+        write_started = threading.Event()
+        reads_done = threading.Event()
+        readers = ThreadPoolExecutor(max_workers=4)
+        # Open every reader thread's connection first, as long-lived server threads would have
+        warmed = threading.Barrier(4)
+        list(readers.map(lambda _: (db.current(), warmed.wait()), range(4)))
+
+        def writer():
+            with db.conn:
+                db.execute("UPDATE modes SET name = name")
+                write_started.set()
+                reads_done.wait(timeout=10)
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        try:
+            assert write_started.wait(timeout=10)
+            counts = list(readers.map(lambda _: len(items(limit=5)), range(8)))
+            assert counts == [5] * 8
+        finally:
+            reads_done.set()
+            writer_thread.join()
+            readers.shutdown()
+
+
+class TestReadOnlyRoutes:
+    """/report and /page_details read through the read-only connection."""
+
+    def _revision_query_modes(self, client, path):
+        modes = []
+
+        def tracer(sql, params):
+            if "revisions" in sql:
+                modes.append(db.conn.readonly("main"))
+
+        with db.tracer(tracer):
+            response = client.get(path)
+        assert response.status_code == 200
+        return modes
+
+    @pytest.mark.parametrize("path", ["/report", "/page_details/"])
+    def test_read_route_uses_read_only_connection(self, selected_hafiz_client, path):
+        modes = self._revision_query_modes(selected_hafiz_client, path)
+        assert modes and all(modes)
+
+    def test_dashboard_uses_read_write_connection(self, selected_hafiz_client):
+        modes = self._revision_query_modes(selected_hafiz_client, "/")
+        assert modes and not any(modes)
@@ -0,0 +1,252 @@
+"""Integration tests for the review load forecast (app/forecast.py).
+
+Tests verify that:
+1. Rep-mode loads match replaying Close Date with every due page revised
+2. SRS loads follow the prime intervals and split by the rating distribution
+3. Full Cycle load is the recent pace, with the plan's remaining days
+4. The whole forecast takes a fixed number of queries
+5. The JSON endpoint and the lazily loaded /report chart render it, also for a
+   hafiz without a current date
+"""
+
+import json
+import re
+import pytest
+from fasthtml.common import to_xml
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+    SRS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+)
+from database import db, hafizs, hafizs_items, plans, revisions
+from app.close_date import close_date
+from app.common_model import get_item_page_portion
+from app.fixed_reps import REP_MODES_CONFIG
+from app.forecast import FULL_CYCLE_PACE_DAYS, forecast_review_load
+from utils import sub_days_to_date
+
+REPLAY_DAYS = 40
+
+
+def _replay_close_date(hafiz_id, days, rating=1):
+    """Revise every due rep-mode/SRS page each day and close the date.
+
+    Returns mode_code -> pages revised on each day.
+    """
+    loads = {mode_code: [0.0] * days for mode_code in [*REP_MODES_CONFIG, SRS_MODE_CODE]}
+    for day in range(days):
+        current_date = db.q(f'SELECT "current_date" AS d FROM hafizs WHERE id = {hafiz_id}')[0]["d"]
+        hafizs_items.xtra()
+        due = hafizs_items(
+            where=f"""hafiz_id = {hafiz_id}
+            AND mode_code IN ({", ".join(f"'{code}'" for code in loads)})
+            AND (COALESCE(next_review, '') = '' OR next_review <= '{current_date}')"""
+        )
+        revisions.xtra()
+        for hafiz_item in due:
+            revisions.insert(
+                hafiz_id=hafiz_id,
+                item_id=hafiz_item.item_id,
+                mode_code=hafiz_item.mode_code,
+                revision_date=current_date,
+                rating=rating,
+            )
+            loads[hafiz_item.mode_code][day] += get_item_page_portion(hafiz_item.item_id)
+        close_date(hafiz_id)
+    return loads
+
+
+def _set_items(hafiz_id, count, **columns):
+    hafizs_items.xtra()
+    rows = hafizs_items(where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=count)
+    for row in rows:
+        hafizs_items.update({"memorized": True, **columns}, row.id)
+    return [row.item_id for row in rows]
+
+
+class TestRepModeForecast:
+    """Fixed-interval modes and their graduations."""
+
+    def test_fixture_item_chain(self, progression_test_hafiz):
+        """The fixture's Daily item (thresholds 2/3/4/5) walks through the modes."""
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        forecast = forecast_review_load([hafiz_id])[hafiz_id]
+
+        def review_days(mode_code):
+            return [day for day, pages in enumerate(forecast["modes"][mode_code]) if pages]
+
+        assert forecast["dates"][0] == progression_test_hafiz["current_date"]
+        assert review_days(DAILY_REPS_MODE_CODE) == [0, 1]
+        assert review_days(WEEKLY_REPS_MODE_CODE) == [8, 15, 22]
+        assert review_days("FR") == [36, 50, 64, 78]
+        # The first Monthly review (day 108) is past the horizon
+        assert review_days(MONTHLY_REPS_MODE_CODE) == []
+
+    def test_matches_close_date_replay(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        _set_items(hafiz_id, 3, mode_code=WEEKLY_REPS_MODE_CODE, next_interval=7, next_review="2024-01-18")
+        _set_items(hafiz_id, 2, mode_code=DAILY_REPS_MODE_CODE, next_interval=1, next_review="2024-01-10")
+        item_id = _set_items(hafiz_id, 1, mode_code="FR", next_interval=14, next_review="2024-01-20")[0]
+        # Earlier Fortnightly revisions count towards the threshold
+        for offset in (14, 28):
+            revisions.insert(
+                hafiz_id=hafiz_id, item_id=item_id, mode_code="FR",
+                revision_date=sub_days_to_date(current_date, offset), rating=1,
+            )
+
+        forecast = forecast_review_load([hafiz_id], days=REPLAY_DAYS)[hafiz_id]
+        replayed = _replay_close_date(hafiz_id, REPLAY_DAYS)
+
+        for mode_code in REP_MODES_CONFIG:
+            assert forecast["modes"][mode_code].tolist() == pytest.approx(replayed[mode_code])
+
+
+class TestSrsForecast:
+    """SRS pages under an assumed rating distribution."""
+
+    @pytest.fixture
+    def srs_hafiz(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        _set_items(
+            hafiz_id, 4, mode_code=SRS_MODE_CODE, next_interval=10,
+            next_review="2024-01-17", last_review="2024-01-07",
+        )
+        _set_items(
+            hafiz_id, 2, mode_code=SRS_MODE_CODE, next_interval=3,
+            next_review="2024-01-13", last_review="2024-01-10",
+        )
+        return hafiz_id
+
+    @pytest.mark.parametrize("rating", [1, 0, -1])
+    def test_single_rating_matches_close_date_replay(self, srs_hafiz, rating):
+        forecast = forecast_review_load([srs_hafiz], days=REPLAY_DAYS, rating_distribution={rating: 1.0})
+        replayed = _replay_close_date(srs_hafiz, REPLAY_DAYS, rating=rating)
+
+        assert forecast[srs_hafiz]["modes"][SRS_MODE_CODE].tolist() == pytest.approx(
+            replayed[SRS_MODE_CODE]
+        )
+
+    def test_mixed_ratings_split_the_load(self, srs_hafiz):
+        distribution = {1: 0.5, 0: 0.3, -1: 0.2}
+        mixed = forecast_review_load([srs_hafiz], rating_distribution=distribution)[srs_hafiz]
+        singles = {
+            rating: forecast_review_load([srs_hafiz], rating_distribution={rating: 1.0})[srs_hafiz]
+            for rating in distribution
+        }
+
+        # Until follow-ups of follow-ups are due (day 0 + 2 + 2), each day's load
+        # is the rating-weighted average of the single-rating loads
+        for day in range(4):
+            assert mixed["modes"][SRS_MODE_CODE][day] == pytest.approx(
+                sum(p * singles[r]["modes"][SRS_MODE_CODE][day] for r, p in distribution.items())
+            )
+        assert mixed["modes"][SRS_MODE_CODE][2] > singles[1]["modes"][SRS_MODE_CODE][2]
+
+
+class TestFullCycleForecast:
+    """Full Cycle continues at the recent pace."""
+
+    def test_pace_and_plan_days_left(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        item_ids = _set_items(hafiz_id, 20, mode_code=FULL_CYCLE_MODE_CODE)
+        plans.xtra()
+        plan_id = plans.insert(hafiz_id=hafiz_id, completed=0).id
+        revisions.xtra()
+        # 7 pages in the pace window, 3 of them in the open plan
+        for offset, item_id in enumerate(item_ids[:7], start=1):
+            revisions.insert(
+                hafiz_id=hafiz_id, item_id=item_id, mode_code=FULL_CYCLE_MODE_CODE,
+                revision_date=sub_days_to_date(current_date, offset), rating=1,
+                plan_id=plan_id if offset <= 3 else None,
+            )
+        # Older revisions don't set the pace
+        revisions.insert(
+            hafiz_id=hafiz_id, item_id=item_ids[10], mode_code=FULL_CYCLE_MODE_CODE,
+            revision_date=sub_days_to_date(current_date, FULL_CYCLE_PACE_DAYS + 1), rating=1,
+        )
+
+        forecast = forecast_review_load([hafiz_id])[hafiz_id]
+
+        pace = sum(map(get_item_page_portion, item_ids[:7])) / FULL_CYCLE_PACE_DAYS
+        plan_pages_left = sum(map(get_item_page_portion, item_ids[3:]))
+        assert forecast["full_cycle_pace"] == pytest.approx(pace)
+        assert forecast["modes"][FULL_CYCLE_MODE_CODE].tolist() == pytest.approx([pace] * 90)
+        assert forecast["full_cycle_plan_days_left"] == -(-plan_pages_left // pace)
+
+    def test_no_history_has_no_pace(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        forecast = forecast_review_load([hafiz_id])[hafiz_id]
+        assert not forecast["modes"][FULL_CYCLE_MODE_CODE].any()
+        assert forecast["full_cycle_plan_days_left"] is None
+
+
+def test_query_count_independent_of_hafizs(progression_test_hafiz, multi_mode_test_hafiz):
+    def forecast_queries(hafiz_ids):
+        statements = []
+        with db.tracer(lambda sql, params: statements.append(sql)):
+            forecast = forecast_review_load(hafiz_ids)
+        return len(statements), forecast
+
+    one_count, _ = forecast_queries([progression_test_hafiz["hafiz_id"]])
+    all_count, forecast = forecast_queries(None)
+
+    assert all_count == one_count
+    assert progression_test_hafiz["hafiz_id"] in forecast
+    assert multi_mode_test_hafiz["hafiz_id"] in forecast
+
+
+class TestForecastRoutes:
+    """GET /report/forecast and the /report chart."""
+
+    def test_json_endpoint(self, progression_test_hafiz):
+        from app.home_controller import review_load_forecast
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        result = json.loads(json.dumps(review_load_forecast(auth=hafiz_id, days=10)))
+
+        assert len(result["dates"]) == 10
+        assert set(result["modes"]) == {*REP_MODES_CONFIG, SRS_MODE_CODE, FULL_CYCLE_MODE_CODE}
+        assert result["total"] == [
+            pytest.approx(sum(load[day] for load in result["modes"].values())) for day in range(10)
+        ]
+
+    def test_days_are_bounded(self, progression_test_hafiz):
+        from app.home_controller import review_load_forecast
+
+        result = review_load_forecast(auth=progression_test_hafiz["hafiz_id"], days=0)
+        assert len(result["dates"]) == 1
+
+    def test_report_loads_chart_lazily(self, progression_test_hafiz):
+        from app.home_controller import datewise_summary_table_view
+
+        html = to_xml(datewise_summary_table_view(auth=progression_test_hafiz["hafiz_id"]))
+        placeholder = re.search(r'<div[^>]*id="review-load-forecast"[^>]*>', html).group(0)
+        assert 'hx-get="/report/forecast/chart"' in placeholder
+        assert 'class="bg-yellow-400"' not in html
+
+    def test_chart_endpoint(self, progression_test_hafiz):
+        from app.home_controller import review_load_forecast_chart
+
+        html = to_xml(review_load_forecast_chart(auth=progression_test_hafiz["hafiz_id"]))
+        assert 'id="review-load-forecast"' in html
+        # The fixture's Daily item is due today and tomorrow
+        assert html.count('class="bg-yellow-400"') == 2
+
+    def test_hafiz_without_current_date(self, progression_test_hafiz):
+        """A hafiz whose current_date was never set gets it initialised, not a KeyError."""
+        from app.home_controller import review_load_forecast, review_load_forecast_chart
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        hafizs.update({"current_date": None}, hafiz_id)
+
+        result = review_load_forecast(auth=hafiz_id, days=10)
+        current_date = hafizs[hafiz_id].current_date
+        assert current_date is not None
+        assert result["dates"][0] == current_date
+
+        hafizs.update({"current_date": None}, hafiz_id)
+        assert 'id="review-load-forecast"' in to_xml(review_load_forecast_chart(auth=hafiz_id))
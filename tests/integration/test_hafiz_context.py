@@ -0,0 +1,94 @@
+"""Integration tests for the request-scoped hafiz context (app/hafiz_context.py).
+
+Tests verify that:
+1. Model functions read current_date and plan_id from the context
+2. The context is ignored for a different hafiz
+3. A full home page request fetches the hafiz row only once
+4. hafiz_auth loads the hafiz off the event loop
+"""
+
+import asyncio
+import re
+import pytest
+from database import db, hafizs
+from app.hafiz_context import (
+    clear_hafiz_context,
+    get_hafiz_context,
+    refresh_hafiz_context,
+    set_hafiz_context,
+)
+from app.common_model import get_current_date, get_current_plan_id
+
+
+@pytest.fixture
+def hafiz_context(progression_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    context = set_hafiz_context(hafizs[hafiz_id])
+    yield context
+    clear_hafiz_context()
+
+
+class TestHafizContext:
+    """Reading from and refreshing the context."""
+
+    def test_current_date_served_from_context(self, hafiz_context):
+        hafiz_id = hafiz_context.hafiz.id
+        # Written behind the context's back: the request keeps its snapshot
+        hafizs.update({"current_date": "2030-01-01"}, hafiz_id)
+        assert get_current_date(hafiz_id) == hafiz_context.current_date
+
+    def test_refresh_picks_up_writes(self, hafiz_context):
+        hafiz_id = hafiz_context.hafiz.id
+        hafizs.update({"current_date": "2030-01-01"}, hafiz_id)
+        refresh_hafiz_context(hafiz_id)
+        assert get_current_date(hafiz_id) == "2030-01-01"
+
+    def test_plan_id_served_from_context(self, hafiz_context):
+        hafiz_context.plan_id = 12345
+        assert get_current_plan_id() == 12345
+
+    def test_other_hafiz_ignores_context(self, hafiz_context, multi_mode_test_hafiz):
+        other_hafiz_id = multi_mode_test_hafiz["hafiz_id"]
+        assert get_hafiz_context(other_hafiz_id) is None
+        hafizs.update({"current_date": "2030-02-02"}, other_hafiz_id)
+        assert get_current_date(other_hafiz_id) == "2030-02-02"
+
+    def test_no_context_outside_request(self):
+        assert get_hafiz_context() is None
+
+
+class TestHafizLookupsPerRequest:
+    """The hafizs table is read once per request."""
+
+    def test_home_page_reads_hafiz_row_once(self, selected_hafiz_client):
+        hafiz_queries = []
+
+        def tracer(sql, params):
+            if re.search(r"\bFROM\s+\[?hafizs\]?(?!_)", sql, re.IGNORECASE):
+                hafiz_queries.append(sql)
+
+        with db.tracer(tracer):
+            response = selected_hafiz_client.get("/")
+
+        assert response.status_code == 200
+        assert len(hafiz_queries) == 1
+
+    def test_hafiz_loaded_off_event_loop(self, selected_hafiz_client, monkeypatch):
+        import app.middleware as middleware
+
+        loaded_on_event_loop = []
+        load_hafiz_context = middleware.load_hafiz_context
+
+        def traced_load(hafiz_id):
+            try:
+                asyncio.get_running_loop()
+                loaded_on_event_loop.append(True)
+            except RuntimeError:
+                loaded_on_event_loop.append(False)
+            return load_hafiz_context(hafiz_id)
+
+        monkeypatch.setattr(middleware, "load_hafiz_context", traced_load)
+        response = selected_hafiz_client.get("/")
+
+        assert response.status_code == 200
+        assert loaded_on_event_loop == [False]
@@ -0,0 +1,119 @@
+"""Concurrency tests for per-request table scoping (ScopedTable in database.py).
+
+Tests verify that:
+1. xtra() filters set in one thread do not leak into another
+2. Interleaved requests for two hafizs only ever see their own revisions
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fasthtml.core import Client
+from constants import FULL_CYCLE_MODE_CODE
+from database import hafizs, revisions, users
+
+REVISION_ROW_ID = re.compile(r'id="revision-(\d+)"')
+
+
+def _create_hafiz_with_revisions(client, label):
+    """Log in as a fresh user, add and select a hafiz, and give it some revisions."""
+    from app.users_model import create_user
+
+    email = f"scoping_{label}_{int(time.time() * 1000)}@example.com"
+    user_id = create_user(email, "password123", f"Scoping {label}")
+    response = client.post(
+        "/users/login",
+        data={"email": email, "password": "password123"},
+        follow_redirects=False,
+    )
+    client.cookies = response.cookies
+    client.post("/hafiz/add", data={"name": f"Hafiz {label}"}, follow_redirects=False)
+    hafiz_id = hafizs(where=f"user_id={user_id}")[0].id
+    hafizs.update({"current_date": "2024-01-15"}, hafiz_id)
+    response = client.post(
+        "/hafiz/selection",
+        data={"current_hafiz_id": hafiz_id},
+        follow_redirects=False,
+    )
+    client.cookies = response.cookies
+
+    revisions.xtra()
+    revision_ids = {
+        revisions.insert(
+            hafiz_id=hafiz_id,
+            item_id=item_id,
+            mode_code=FULL_CYCLE_MODE_CODE,
+            revision_date="2024-01-14",
+            rating=1,
+        ).id
+        for item_id in range(1, 6)
+    }
+    return {"user_id": user_id, "hafiz_id": hafiz_id, "revision_ids": revision_ids}
+
+
+@pytest.fixture
+def two_hafiz_clients():
+    from main import app
+
+    clients = {}
+    for label in ["a", "b"]:
+        client = Client(app)
+        clients[label] = (client, _create_hafiz_with_revisions(client, label))
+
+    yield clients
+
+    for _, details in clients.values():
+        users.delete(details["user_id"])
+
+
+class TestScopedTableThreads:
+    """xtra() state is private to the thread/context that set it."""
+
+    def test_xtra_does_not_leak_between_threads(self, two_hafiz_clients):
+        hafiz_ids = [details["hafiz_id"] for _, details in two_hafiz_clients.values()]
+        barrier = threading.Barrier(len(hafiz_ids))
+        seen = {}
+
+        def scoped_read(hafiz_id):
+            revisions.xtra(hafiz_id=hafiz_id)
+            # Both threads have set their filter before either one reads
+            barrier.wait()
+            seen[hafiz_id] = {rev.hafiz_id for rev in revisions()}
+
+        threads = [threading.Thread(target=scoped_read, args=(h,)) for h in hafiz_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == {hafiz_id: {hafiz_id} for hafiz_id in hafiz_ids}
+
+    def test_filter_unset_in_fresh_thread(self, two_hafiz_clients):
+        _, details = two_hafiz_clients["a"]
+        revisions.xtra(hafiz_id=details["hafiz_id"])
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert pool.submit(lambda: revisions.xtra_id).result() == {}
+        finally:
+            revisions.xtra()
+
+
+class TestConcurrentRequests:
+    """Interleaved requests for two hafizs stay isolated."""
+
+    def test_revision_log_per_hafiz(self, two_hafiz_clients):
+        def fetch_revision_ids(label):
+            client, _ = two_hafiz_clients[label]
+            response = client.get("/revision/")
+            assert response.status_code == 200
+            return label, set(map(int, REVISION_ROW_ID.findall(response.text)))
+
+        labels = ["a", "b"] * 10
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(fetch_revision_ids, labels))
+
+        for label, revision_ids in results:
+            _, details = two_hafiz_clients[label]
+            assert revision_ids == details["revision_ids"]
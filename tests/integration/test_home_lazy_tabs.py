@@ -0,0 +1,84 @@
+"""Integration tests for the lazily loaded home page tabs.
+
+Tests verify that:
+1. Only the Full Cycle table is rendered inline; other tabs are HTMX placeholders
+2. Tab badges show each mode's queue size and empty modes get no tab
+3. A placeholder's URL returns the mode's table
+"""
+
+import re
+import pytest
+from fasthtml.common import to_xml
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+    NEW_MEMORIZATION_MODE_CODE,
+)
+from database import hafizs_items, revisions
+from app.common_model import get_mode_queue_counts, get_mode_queue_page
+from app.home_controller import HOME_MODE_CODES, change_page, index
+
+
+@pytest.fixture
+def home_hafiz(progression_test_hafiz):
+    """The fixture hafiz with three Full Cycle pages revised today."""
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    current_date = progression_test_hafiz["current_date"]
+    hafizs_items.xtra()
+    revisions.xtra()
+    for hafiz_item in hafizs_items(where=f"hafiz_id = {hafiz_id} AND memorized = 0", limit=3):
+        hafizs_items.update({"memorized": True, "mode_code": FULL_CYCLE_MODE_CODE}, hafiz_item.id)
+        revisions.insert(
+            hafiz_id=hafiz_id,
+            item_id=hafiz_item.item_id,
+            mode_code=FULL_CYCLE_MODE_CODE,
+            revision_date=current_date,
+            rating=1,
+        )
+    return progression_test_hafiz
+
+
+def _badge(html, mode_code):
+    match = re.search(rf'data-testid="tab-count-{mode_code}"[^>]*>(\d+)<', html)
+    return int(match.group(1)) if match else None
+
+
+def test_counts_match_queue_lengths(home_hafiz):
+    hafiz_id, current_date = home_hafiz["hafiz_id"], home_hafiz["current_date"]
+    counts = get_mode_queue_counts(hafiz_id, HOME_MODE_CODES, current_date)
+
+    assert list(counts) == HOME_MODE_CODES
+    for mode_code, count in counts.items():
+        item_ids, _ = get_mode_queue_page(hafiz_id, mode_code, current_date)
+        assert count == len(item_ids)
+    assert counts[FULL_CYCLE_MODE_CODE] == 3
+
+
+def test_only_full_cycle_rendered_inline(home_hafiz):
+    hafiz_id, current_date = home_hafiz["hafiz_id"], home_hafiz["current_date"]
+    counts = get_mode_queue_counts(hafiz_id, HOME_MODE_CODES, current_date)
+
+    html = to_xml(index(auth=hafiz_id, sess={}))
+
+    # The Full Cycle rows are in the page; the other tabs only have a loader
+    assert f'id="{FULL_CYCLE_MODE_CODE}_tbody"' in html
+    for mode_code in (NEW_MEMORIZATION_MODE_CODE, DAILY_REPS_MODE_CODE):
+        assert f'id="{mode_code}_tbody"' not in html
+        assert f'hx-get="/page/{mode_code}"' in html
+    assert html.count('hx-trigger="intersect once"') == 2
+    # Hidden until Alpine applies x-show, so a placeholder can't intersect early
+    cloaked = re.findall(r"x-show=\"activeTab === '(\w+)'\" x-cloak", html)
+    assert cloaked == [NEW_MEMORIZATION_MODE_CODE, DAILY_REPS_MODE_CODE]
+
+    assert _badge(html, FULL_CYCLE_MODE_CODE) == 3
+    assert _badge(html, NEW_MEMORIZATION_MODE_CODE) == counts[NEW_MEMORIZATION_MODE_CODE]
+    # Empty modes get no tab
+    assert counts[MONTHLY_REPS_MODE_CODE] == 0
+    assert f"tab-count-{MONTHLY_REPS_MODE_CODE}" not in html
+
+
+def test_placeholder_url_returns_table(home_hafiz):
+    html = to_xml(change_page(sess={}, auth=home_hafiz["hafiz_id"], mode_code=DAILY_REPS_MODE_CODE))
+    assert f'id="summary_table_{DAILY_REPS_MODE_CODE}"' in html
+    assert f'id="{DAILY_REPS_MODE_CODE}_tbody"' in html
@@ -0,0 +1,266 @@
+"""Integration tests for streak/last_review maintenance in app/common_model.py.
+
+Tests verify that:
+1. Appended revisions update streaks from the stored values
+2. Back-dated, edited and deleted revisions trigger a correct recompute
+3. The windowed full rebuild matches a replay of each item's history
+4. Bulk revision ingest writes in one transaction and rebuilds the stats set-wise
+"""
+
+import random
+import pytest
+from constants import FULL_CYCLE_MODE_CODE
+from database import hafizs_items, revisions
+from app.common_model import (
+    add_revisions_bulk,
+    apply_rating_to_streaks,
+    get_item_stats,
+    populate_hafizs_items_stat_columns,
+    recompute_item_stats,
+    update_stats_for_new_revision,
+)
+
+
+def _replay_history(hafiz_id, item_id):
+    """Reference implementation: replay every revision in date order."""
+    good_streak, bad_streak, last_review = 0, 0, ""
+    revisions.xtra()
+    for rev in revisions(
+        where=f"hafiz_id = {hafiz_id} AND item_id = {item_id}",
+        order_by="revision_date ASC, id ASC",
+    ):
+        good_streak, bad_streak = apply_rating_to_streaks(good_streak, bad_streak, rev.rating)
+        last_review = rev.revision_date
+    return {"good_streak": good_streak, "bad_streak": bad_streak, "last_review": last_review}
+
+
+def _stored_stats(hafiz_id, item_id):
+    hafizs_items.xtra()
+    row = hafizs_items(where=f"hafiz_id = {hafiz_id} AND item_id = {item_id}")[0]
+    return {"good_streak": row.good_streak, "bad_streak": row.bad_streak, "last_review": row.last_review}
+
+
+@pytest.fixture
+def stats_item(progression_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    hafizs_items.xtra()
+    item_id = hafizs_items(
+        where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=1
+    )[0].item_id
+    return hafiz_id, item_id
+
+
+class TestApplyRatingToStreaks:
+    """Pure streak transition."""
+
+    def test_good_extends_good_streak(self):
+        assert apply_rating_to_streaks(2, 0, 1) == (3, 0)
+
+    def test_bad_resets_good_streak(self):
+        assert apply_rating_to_streaks(2, 0, -1) == (0, 1)
+
+    def test_ok_resets_both(self):
+        assert apply_rating_to_streaks(2, 0, 0) == (0, 0)
+        assert apply_rating_to_streaks(0, 3, None) == (0, 0)
+
+
+class TestIncrementalStats:
+    """update_stats_for_new_revision and recompute_item_stats."""
+
+    def test_append_updates_from_stored_streak(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        for revision_date, rating in [("2024-01-01", 1), ("2024-01-02", 1), ("2024-01-03", 1)]:
+            add_revision(hafiz_id, item_id, revision_date, rating=rating)
+            update_stats_for_new_revision(hafiz_id, item_id, rating, revision_date)
+
+        assert _stored_stats(hafiz_id, item_id) == {
+            "good_streak": 3,
+            "bad_streak": 0,
+            "last_review": "2024-01-03",
+        }
+
+    def test_back_dated_revision_recomputes(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        for revision_date, rating in [("2024-01-01", -1), ("2024-01-05", -1)]:
+            add_revision(hafiz_id, item_id, revision_date, rating=rating)
+            update_stats_for_new_revision(hafiz_id, item_id, rating, revision_date)
+
+        add_revision(hafiz_id, item_id, "2024-01-03", rating=1)
+        update_stats_for_new_revision(hafiz_id, item_id, 1, "2024-01-03")
+
+        assert _stored_stats(hafiz_id, item_id) == _replay_history(hafiz_id, item_id)
+        assert _stored_stats(hafiz_id, item_id)["bad_streak"] == 1
+
+    def test_append_after_unrecorded_revision_recomputes(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        add_revision(hafiz_id, item_id, "2024-01-01", rating=1)
+        update_stats_for_new_revision(hafiz_id, item_id, 1, "2024-01-01")
+        # A home page add leaves the stored stats behind
+        add_revision(hafiz_id, item_id, "2024-01-02", rating=-1)
+
+        add_revision(hafiz_id, item_id, "2024-01-03", rating=-1)
+        update_stats_for_new_revision(hafiz_id, item_id, -1, "2024-01-03")
+
+        assert _stored_stats(hafiz_id, item_id) == _replay_history(hafiz_id, item_id)
+        assert _stored_stats(hafiz_id, item_id)["bad_streak"] == 2
+
+    def test_delete_recomputes(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        add_revision(hafiz_id, item_id, "2024-01-01", rating=1)
+        add_revision(hafiz_id, item_id, "2024-01-02", rating=1)
+        latest = add_revision(hafiz_id, item_id, "2024-01-03", rating=-1)
+        recompute_item_stats(hafiz_id, item_id)
+        assert _stored_stats(hafiz_id, item_id)["bad_streak"] == 1
+
+        revisions.delete(latest.id)
+        recompute_item_stats(hafiz_id, item_id)
+
+        assert _stored_stats(hafiz_id, item_id) == {
+            "good_streak": 2,
+            "bad_streak": 0,
+            "last_review": "2024-01-02",
+        }
+
+    def test_recompute_without_revisions_clears_stats(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        rev = add_revision(hafiz_id, item_id, "2024-01-01", rating=1)
+        recompute_item_stats(hafiz_id, item_id)
+        revisions.delete(rev.id)
+        recompute_item_stats(hafiz_id, item_id)
+
+        assert _stored_stats(hafiz_id, item_id) == {
+            "good_streak": 0,
+            "bad_streak": 0,
+            "last_review": "",
+        }
+
+
+class TestFullRebuild:
+    """get_item_stats and populate_hafizs_items_stat_columns."""
+
+    def test_windowed_stats_match_history_replay(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        hafizs_items.xtra()
+        item_ids = [
+            row.item_id
+            for row in hafizs_items(where=f"hafiz_id = {hafiz_id}", order_by="item_id", limit=20)
+        ]
+        rng = random.Random(7)
+        for item_id in item_ids:
+            for _ in range(rng.randint(0, 8)):
+                add_revision(
+                    hafiz_id,
+                    item_id,
+                    f"2024-01-{rng.randint(1, 9):02d}",
+                    rating=rng.choice([-1, 0, 1, None]),
+                )
+
+        item_stats = get_item_stats(hafiz_id, item_ids)
+
+        for item_id in item_ids:
+            expected = _replay_history(hafiz_id, item_id)
+            if expected["last_review"]:
+                assert item_stats[item_id] == expected
+            else:
+                assert item_id not in item_stats
+
+    def test_rebuild_writes_all_items(self, progression_test_hafiz, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        hafizs_items.xtra()
+        first, second = hafizs_items(
+            where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=2
+        )
+        add_revision(hafiz_id, first.item_id, "2024-01-10", rating=-1)
+        hafizs_items.update({"good_streak": 5, "last_review": "2023-12-01"}, second.id)
+
+        populate_hafizs_items_stat_columns(hafiz_id)
+
+        assert _stored_stats(hafiz_id, first.item_id) == {
+            "good_streak": 0,
+            "bad_streak": 1,
+            "last_review": "2024-01-10",
+        }
+        assert _stored_stats(hafiz_id, second.item_id) == {
+            "good_streak": 0,
+            "bad_streak": 0,
+            "last_review": "",
+        }
+
+    def test_rebuild_limited_to_item_ids(self, stats_item, add_revision):
+        hafiz_id, item_id = stats_item
+        add_revision(hafiz_id, item_id, "2024-01-10", rating=1)
+
+        populate_hafizs_items_stat_columns(hafiz_id, item_ids=[item_id])
+
+        assert _stored_stats(hafiz_id, item_id)["good_streak"] == 1
+
+
+class TestBulkRevisions:
+    """add_revisions_bulk."""
+
+    @pytest.fixture
+    def bulk_items(self, progression_test_hafiz):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        hafizs_items.xtra()
+        item_ids = [
+            row.item_id
+            for row in hafizs_items(
+                where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=5
+            )
+        ]
+        return hafiz_id, item_ids
+
+    def test_inserts_and_returns_ids_in_order(self, bulk_items):
+        hafiz_id, item_ids = bulk_items
+        ratings = [1, 0, -1, 1, 1]
+
+        revision_ids = add_revisions_bulk(
+            hafiz_id, list(zip(item_ids, ratings)), FULL_CYCLE_MODE_CODE, "2024-01-15"
+        )
+
+        revisions.xtra()
+        assert [(revisions[rev_id].item_id, revisions[rev_id].rating) for rev_id in revision_ids] == list(
+            zip(item_ids, ratings)
+        )
+        assert all(revisions[rev_id].hafiz_id == hafiz_id for rev_id in revision_ids)
+
+    def test_stats_match_history_replay(self, bulk_items, add_revision):
+        hafiz_id, item_ids = bulk_items
+        # Earlier history, plus a back-dated bulk revision that must not win
+        add_revision(hafiz_id, item_ids[0], "2024-01-10", rating=1)
+        add_revision(hafiz_id, item_ids[1], "2024-01-10", rating=-1)
+        add_revision(hafiz_id, item_ids[2], "2024-01-20", rating=0)
+
+        add_revisions_bulk(
+            hafiz_id, [(item_id, 1) for item_id in item_ids], FULL_CYCLE_MODE_CODE, "2024-01-15"
+        )
+
+        for item_id in item_ids:
+            assert _stored_stats(hafiz_id, item_id) == _replay_history(hafiz_id, item_id)
+
+    def test_update_stats_false_leaves_stats(self, bulk_items):
+        hafiz_id, item_ids = bulk_items
+        before = _stored_stats(hafiz_id, item_ids[0])
+
+        add_revisions_bulk(
+            hafiz_id, [(item_ids[0], 1)], FULL_CYCLE_MODE_CODE, "2024-01-15", update_stats=False
+        )
+
+        assert _stored_stats(hafiz_id, item_ids[0]) == before
+
+    @pytest.mark.parametrize("bad_input", ["item", "mode"])
+    def test_invalid_input_writes_nothing(self, bulk_items, bad_input):
+        hafiz_id, item_ids = bulk_items
+        item_ratings = [(item_id, 1) for item_id in item_ids]
+        mode_code = FULL_CYCLE_MODE_CODE
+        if bad_input == "item":
+            item_ratings.append((10**6, 1))
+        else:
+            mode_code = "XX"
+
+        with pytest.raises(ValueError):
+            add_revisions_bulk(hafiz_id, item_ratings, mode_code, "2024-01-15")
+
+        revisions.xtra()
+        assert not revisions(where=f"hafiz_id = {hafiz_id} AND revision_date = '2024-01-15'")
+
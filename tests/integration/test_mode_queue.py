@@ -0,0 +1,217 @@
+"""Integration tests for the SQL mode queues (get_mode_queue_page).
+
+Tests verify that:
+1. Each mode's SQL queue matches the in-memory predicates over the same records
+2. Every combination of review dates and revisions is classified the same way
+   by the SQL conditions and by MODE_PREDICATES
+3. Pages concatenate to the whole queue, with has_more on every page but the last
+"""
+
+import itertools
+import random
+import pytest
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FORTNIGHTLY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+    NEW_MEMORIZATION_MODE_CODE,
+    SRS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+)
+from database import hafizs_items, plans, revisions
+from app.common_model import (
+    get_last_added_full_cycle_page,
+    get_mode_condition,
+    get_mode_queue_page,
+    get_mode_specific_hafizs_items,
+    is_full_cycle_plan_finished,
+)
+from app.home_view import MODE_PREDICATES
+
+CURRENT_DATE = "2024-01-15"
+DATES = ["2024-01-01", "2024-01-10", "2024-01-14", CURRENT_DATE, "2024-01-20", None]
+MODES = [
+    FULL_CYCLE_MODE_CODE,
+    SRS_MODE_CODE,
+    DAILY_REPS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+    FORTNIGHTLY_REPS_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+]
+
+
+def _reference_queue(hafiz_id, mode_code, plan_id, show_loved_only=False):
+    """The in-memory pipeline the SQL queue replaces."""
+    if mode_code == NEW_MEMORIZATION_MODE_CODE:
+        unmemorized = {
+            row.item_id for row in hafizs_items(where=f"hafiz_id = {hafiz_id} AND memorized = 0")
+        }
+        memorized_today = {
+            rev.item_id
+            for rev in revisions(
+                where=f"hafiz_id = {hafiz_id} AND revision_date = '{CURRENT_DATE}' AND mode_code = '{NEW_MEMORIZATION_MODE_CODE}'"
+            )
+        }
+        return sorted(unmemorized | memorized_today)
+
+    records = get_mode_specific_hafizs_items(
+        hafiz_id, get_mode_condition(mode_code), current_date=CURRENT_DATE
+    )
+    filtered = [r for r in records if MODE_PREDICATES[mode_code](r, CURRENT_DATE)]
+    if mode_code == SRS_MODE_CODE:
+        start = get_last_added_full_cycle_page(hafiz_id)
+        if start is not None:
+            filtered = [r for r in filtered if r["page_number"] < start or r["page_number"] > start + 60]
+        if show_loved_only:
+            filtered = [r for r in filtered if r.get("loved")]
+    item_ids = list(dict.fromkeys(r["item_id"] for r in filtered))
+
+    if mode_code == FULL_CYCLE_MODE_CODE:
+        eligible = []
+        if plan_id is not None:
+            revised_in_plan = {
+                rev.item_id
+                for rev in revisions(
+                    where=f"hafiz_id = {hafiz_id} AND mode_code = '{FULL_CYCLE_MODE_CODE}' AND plan_id = {plan_id} AND revision_date != '{CURRENT_DATE}'"
+                )
+            }
+            eligible = [i for i in item_ids if i not in revised_in_plan]
+        revised_today = {
+            rev.item_id
+            for rev in revisions(
+                where=f"hafiz_id = {hafiz_id} AND revision_date = '{CURRENT_DATE}' AND mode_code = '{FULL_CYCLE_MODE_CODE}'"
+            )
+        }
+        today_items = [r["item_id"] for r in records if r["item_id"] in revised_today]
+        return sorted(set(eligible) | set(today_items))
+    return item_ids
+
+
+@pytest.fixture(params=[1, 2, 3])
+def random_hafiz(request, progression_test_hafiz):
+    """The fixture hafiz with randomized item states and revision history."""
+    rng = random.Random(request.param)
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    hafizs_items.xtra()
+    revisions.xtra()
+    plans.xtra()
+    plan_id = plans.insert(hafiz_id=hafiz_id, completed=0).id
+
+    for hafiz_item in hafizs_items(where=f"hafiz_id = {hafiz_id}"):
+        if rng.random() < 0.3:
+            continue
+        mode_code = rng.choice(MODES)
+        hafizs_items.update(
+            {
+                "mode_code": mode_code,
+                "memorized": rng.random() < 0.8,
+                "next_review": rng.choice(DATES),
+                "last_review": rng.choice(DATES),
+                "loved": rng.random() < 0.2,
+            },
+            hafiz_item.id,
+        )
+        for _ in range(rng.randint(0, 2)):
+            revisions.insert(
+                hafiz_id=hafiz_id,
+                item_id=hafiz_item.item_id,
+                mode_code=rng.choice([mode_code, NEW_MEMORIZATION_MODE_CODE, FULL_CYCLE_MODE_CODE]),
+                revision_date=rng.choice(DATES[:4]),
+                rating=1,
+                plan_id=plan_id if rng.random() < 0.7 else None,
+            )
+    return hafiz_id, plan_id
+
+
+class TestModeQueueMatchesPredicates:
+    """SQL queues select exactly what the in-memory predicates select."""
+
+    @pytest.mark.parametrize("mode_code", [NEW_MEMORIZATION_MODE_CODE, *MODES])
+    def test_queue_matches_reference(self, random_hafiz, mode_code):
+        hafiz_id, plan_id = random_hafiz
+        item_ids, has_more = get_mode_queue_page(hafiz_id, mode_code, CURRENT_DATE, plan_id=plan_id)
+
+        assert item_ids == _reference_queue(hafiz_id, mode_code, plan_id)
+        assert has_more is False
+
+    def test_srs_loved_only(self, random_hafiz):
+        hafiz_id, plan_id = random_hafiz
+        item_ids, _ = get_mode_queue_page(
+            hafiz_id, SRS_MODE_CODE, CURRENT_DATE, show_loved_only=True
+        )
+        assert item_ids == _reference_queue(hafiz_id, SRS_MODE_CODE, plan_id, show_loved_only=True)
+
+    def test_full_cycle_without_plan_lists_only_today(self, random_hafiz):
+        hafiz_id, _ = random_hafiz
+        item_ids, _ = get_mode_queue_page(hafiz_id, FULL_CYCLE_MODE_CODE, CURRENT_DATE)
+        assert item_ids == _reference_queue(hafiz_id, FULL_CYCLE_MODE_CODE, None)
+        assert is_full_cycle_plan_finished(hafiz_id, CURRENT_DATE) is False
+
+
+# Revisions added for an item: (mode_code, revision_date), with None for the item's own mode
+REVISION_VARIANTS = [
+    [],
+    [(None, CURRENT_DATE)],
+    [(None, "2024-01-10")],
+    [(NEW_MEMORIZATION_MODE_CODE, CURRENT_DATE)],
+]
+
+
+class TestModePredicateParity:
+    """MODE_PREDICATES define the tabs; the SQL conditions must agree on every case."""
+
+    @pytest.mark.parametrize("mode_code", [m for m in MODES if m != FULL_CYCLE_MODE_CODE])
+    def test_every_case_matches_predicate(self, progression_test_hafiz, mode_code):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        hafizs_items.xtra()
+        revisions.xtra()
+        revisions.delete_where(f"hafiz_id = {hafiz_id}")
+        cases = itertools.product(DATES, DATES, REVISION_VARIANTS)
+        for hafiz_item, (next_review, last_review, variant) in zip(
+            hafizs_items(where=f"hafiz_id = {hafiz_id}", order_by="item_id"), cases
+        ):
+            hafizs_items.update(
+                {"mode_code": mode_code, "memorized": True, "next_review": next_review, "last_review": last_review},
+                hafiz_item.id,
+            )
+            for revision_mode, revision_date in variant:
+                revisions.insert(
+                    hafiz_id=hafiz_id, item_id=hafiz_item.item_id, mode_code=revision_mode or mode_code,
+                    revision_date=revision_date, rating=1,
+                )
+
+        records = get_mode_specific_hafizs_items(
+            hafiz_id, get_mode_condition(mode_code), current_date=CURRENT_DATE
+        )
+        assert len(records) == len(DATES) ** 2 * len(REVISION_VARIANTS)
+        expected = [r["item_id"] for r in records if MODE_PREDICATES[mode_code](r, CURRENT_DATE)]
+        item_ids, _ = get_mode_queue_page(hafiz_id, mode_code, CURRENT_DATE)
+        assert item_ids == expected
+
+
+class TestModeQueuePaging:
+    """LIMIT/OFFSET pages and the aggregate total."""
+
+    def test_pages_cover_queue(self, random_hafiz):
+        hafiz_id, plan_id = random_hafiz
+        full_queue, _ = get_mode_queue_page(hafiz_id, FULL_CYCLE_MODE_CODE, CURRENT_DATE, plan_id=plan_id)
+
+        pages, offset = [], 0
+        while True:
+            item_ids, has_more = get_mode_queue_page(
+                hafiz_id, FULL_CYCLE_MODE_CODE, CURRENT_DATE, offset=offset, limit=25, plan_id=plan_id
+            )
+            pages.append(item_ids)
+            if not has_more:
+                break
+            offset += 25
+
+        assert [item_id for page in pages for item_id in page] == full_queue
+        assert all(len(page) == 25 for page in pages[:-1])
+
+    def test_scroll_past_end_returns_no_rows(self, random_hafiz):
+        from app.home_view import make_summary_table
+
+        hafiz_id, _ = random_hafiz
+        assert make_summary_table(FULL_CYCLE_MODE_CODE, hafiz_id, offset=10_000, items_per_page=25, rows_only=True) == ()
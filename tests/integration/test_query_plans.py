@@ -0,0 +1,120 @@
+"""Query-plan regression tests for the hot revisions/hafizs_items access paths.
+
+Every query issued while rendering the dashboard, closing a date, building the
+datewise report and showing page details is captured with the database tracer,
+then checked with EXPLAIN QUERY PLAN. None of them may scan revisions or
+hafizs_items in full; they must search one of the indexes from migration 0028.
+"""
+
+import re
+import pytest
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    SRS_MODE_CODE,
+    WEEKLY_REPS_MODE_CODE,
+    FORTNIGHTLY_REPS_MODE_CODE,
+    MONTHLY_REPS_MODE_CODE,
+)
+from database import db, hafizs_items, plans, revisions
+
+FULL_SCAN = re.compile(r"^SCAN (revisions|hafizs_items)\b")
+
+
+def _capture_queries(action) -> list[tuple]:
+    """Run action and return the distinct SELECT statements it executed."""
+    captured = {}
+
+    def tracer(sql, params):
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.setdefault(sql, params)
+
+    with db.tracer(tracer):
+        action()
+    return list(captured.items())
+
+
+def _full_scans(queries: list[tuple]) -> list[str]:
+    scans = []
+    for sql, params in queries:
+        for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()):
+            detail = row[3]
+            if FULL_SCAN.match(detail):
+                scans.append(f"{detail}: {' '.join(sql.split())[:200]}")
+    return scans
+
+
+@pytest.fixture
+def hafiz_with_revisions(progression_test_hafiz):
+    """A hafiz with an open plan and Full Cycle revisions on the current date."""
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    current_date = progression_test_hafiz["current_date"]
+    revisions.xtra(hafiz_id=hafiz_id)
+    hafizs_items.xtra(hafiz_id=hafiz_id)
+    plans.xtra(hafiz_id=hafiz_id)
+
+    plan = plans.insert(completed=0)
+    for hafiz_item in hafizs_items(where="memorized = 0", limit=10):
+        revisions.insert(
+            item_id=hafiz_item.item_id,
+            mode_code=FULL_CYCLE_MODE_CODE,
+            revision_date=current_date,
+            rating=0,
+            plan_id=plan.id,
+        )
+
+    yield hafiz_id
+
+    revisions.xtra()
+    hafizs_items.xtra()
+    plans.xtra()
+
+
+class TestQueryPlans:
+    """Key flows must not fall back to full scans of revisions/hafizs_items."""
+
+    def test_dashboard(self, hafiz_with_revisions):
+        from app.home_view import make_summary_table
+        from app.new_memorization import make_new_memorization_table
+
+        def render_dashboard():
+            make_new_memorization_table(hafiz_with_revisions)
+            for mode_code in [
+                FULL_CYCLE_MODE_CODE,
+                SRS_MODE_CODE,
+                DAILY_REPS_MODE_CODE,
+                WEEKLY_REPS_MODE_CODE,
+                FORTNIGHTLY_REPS_MODE_CODE,
+                MONTHLY_REPS_MODE_CODE,
+            ]:
+                make_summary_table(mode_code, hafiz_with_revisions)
+
+        assert _full_scans(_capture_queries(render_dashboard)) == []
+
+    def test_close_date(self, hafiz_with_revisions):
+        from app.close_date import close_date
+
+        queries = _capture_queries(lambda: close_date(hafiz_with_revisions))
+        assert _full_scans(queries) == []
+
+    def test_datewise_report(self, hafiz_with_revisions):
+        from app.home_view import datewise_summary_table
+
+        queries = _capture_queries(
+            lambda: datewise_summary_table(hafiz_id=hafiz_with_revisions)
+        )
+        assert _full_scans(queries) == []
+
+    def test_page_details(self, hafiz_with_revisions):
+        from app.page_details_controller import (
+            page_details_view,
+            display_page_level_details,
+        )
+
+        item_id = hafizs_items(where="memorized = 0", limit=1)[0].item_id
+
+        def render_page_details():
+            page_details_view(auth=hafiz_with_revisions)
+            display_page_level_details(auth=hafiz_with_revisions, item_id=item_id)
+
+        assert _full_scans(_capture_queries(render_page_details)) == []
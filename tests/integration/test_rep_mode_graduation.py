@@ -1,7 +1,7 @@
 """Integration tests for REP_MODES_CONFIG and graduation logic.
 
-Tests the configuration consistency and graduation chain.
-Full graduation behavior is tested via E2E tests which have proper authentication context.
+Tests the configuration consistency and graduation chain. Graduation itself
+runs through the Close Date engine (app/close_date.py).
 """
 
 import time
@@ -13,7 +13,16 @@ from constants import (
     MONTHLY_REPS_MODE_CODE,
     FULL_CYCLE_MODE_CODE,
 )
-from app.fixed_reps import REP_MODES_CONFIG, set_next_review, update_rep_item
+from app.fixed_reps import REP_MODES_CONFIG, set_next_review
+
+
+def _close_revision_day(rev):
+    """Run Close Date over rev, moved onto its hafiz's current date."""
+    from database import hafizs, revisions
+    from app.close_date import close_date
+
+    revisions.update({"revision_date": hafizs[rev.hafiz_id].current_date}, rev.id)
+    close_date(rev.hafiz_id)
 
 
 class TestRepModesConfigStructure:
@@ -137,7 +146,7 @@ class TestSetNextReview:
         assert hafiz_item.next_review == "2024-02-14"
 
 
-# === Integration Tests for update_rep_item() Graduation Logic ===
+# === Integration Tests for Close Date Rep-Mode Graduation ===
 
 
 @pytest.fixture
@@ -195,7 +204,7 @@ def graduation_test_hafiz(client):
 
 
 class TestUpdateRepItemGraduation:
-    """Test update_rep_item() graduation across all rep modes.
+    """Test Close Date's rep-mode graduation across all rep modes.
 
     These tests verify that:
     1. Items stay in mode when below threshold (7 reviews)
@@ -203,8 +212,8 @@ class TestUpdateRepItemGraduation:
     3. next_review and next_interval are correctly updated
     4. memorized flag is set correctly on Full Cycle graduation
 
-    Note: Tests set revisions.xtra() to filter by hafiz_id, simulating the
-    beforeware behavior that occurs in production requests.
+    Each test closes the day of its last revision (moved onto the hafiz's
+    current date) with the Close Date engine.
     """
 
     def test_daily_stays_in_mode_below_threshold(self, graduation_test_hafiz):
@@ -216,7 +225,7 @@ class TestUpdateRepItemGraduation:
         test_item = items_list[0]
         item_id = test_item.item_id
 
-        # Set xtra filter to simulate beforeware (required for get_mode_count)
+        # Set xtra filter to simulate beforeware
         revisions.xtra(hafiz_id=hafiz_id)
         hafizs_items.xtra(hafiz_id=hafiz_id)
 
@@ -241,7 +250,7 @@ class TestUpdateRepItemGraduation:
                 rating=1,
             )
 
-        # Create revision object for update_rep_item
+        # The revision whose day is closed
         rev = revisions.insert(
             item_id=item_id,
             hafiz_id=hafiz_id,
@@ -250,7 +259,7 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         # Verify: should stay in Daily mode
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -306,7 +315,7 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         # Verify: should graduate to Weekly mode
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -362,7 +371,7 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         # Verify: should graduate to Fortnightly mode
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -418,7 +427,7 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         # Verify: should graduate to Monthly mode
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -474,7 +483,7 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         # Verify: should graduate to Full Cycle mode
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -490,7 +499,7 @@ class TestUpdateRepItemGraduation:
         hafizs_items.xtra()
 
     def test_unknown_mode_returns_early(self, graduation_test_hafiz):
-        """update_rep_item returns early for unknown mode codes."""
+        """A revision in a mode outside REP_MODES_CONFIG gets no rep transition."""
         from database import hafizs, hafizs_items, revisions
 
         hafiz_id = graduation_test_hafiz["hafiz_id"]
@@ -523,8 +532,8 @@ class TestUpdateRepItemGraduation:
             rating=1,
         )
 
-        # This should return early without changes
-        update_rep_item(rev)
+        # Full Cycle with a Good rating leaves the mode unchanged
+        _close_revision_day(rev)
 
         # Verify: item should be unchanged
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -581,7 +590,7 @@ class TestFullGraduationChain:
                 )
 
             # Last revision triggers graduation
-            update_rep_item(rev)
+            _close_revision_day(rev)
 
             # Verify graduation
             updated_item = hafizs_items(where=f"item_id={item_id}")[0]
@@ -656,7 +665,7 @@ class TestCustomThresholdGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
         assert updated_item.mode_code == WEEKLY_REPS_MODE_CODE
@@ -707,7 +716,7 @@ class TestCustomThresholdGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
         assert updated_item.mode_code == FORTNIGHTLY_REPS_MODE_CODE
@@ -758,7 +767,7 @@ class TestCustomThresholdGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
         assert updated_item.mode_code == MONTHLY_REPS_MODE_CODE
@@ -809,7 +818,7 @@ class TestCustomThresholdGraduation:
             rating=1,
         )
 
-        update_rep_item(rev)
+        _close_revision_day(rev)
 
         updated_item = hafizs_items(where=f"item_id={item_id}")[0]
         assert updated_item.mode_code == FULL_CYCLE_MODE_CODE
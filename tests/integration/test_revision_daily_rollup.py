@@ -0,0 +1,276 @@
+"""Integration tests for the revision_daily_rollup table and the windowed report.
+
+Tests verify that:
+1. The rollup triggers keep per date/mode totals equal to the revisions
+2. Close Date leaves the closed day's rollup rows consistent
+3. /report renders REPORT_WINDOW_DAYS days per request and chains to the next window
+4. Rendering a window takes the same queries however many revisions it has
+5. The pages revised indicator follows rating changes with one rollup read
+"""
+
+import random
+import re
+import pytest
+from fasthtml.common import to_xml
+from constants import (
+    DAILY_REPS_MODE_CODE,
+    FULL_CYCLE_MODE_CODE,
+    REPORT_WINDOW_DAYS,
+    SRS_MODE_CODE,
+)
+from database import db, revisions
+from utils import add_days_to_date, format_number, sub_days_to_date
+from app.common_model import get_item_page_portion
+
+MODES = [FULL_CYCLE_MODE_CODE, SRS_MODE_CODE, DAILY_REPS_MODE_CODE]
+
+
+def _rollup(hafiz_id):
+    rows = db.q(
+        f"SELECT * FROM revision_daily_rollup WHERE hafiz_id = {hafiz_id} "
+        "ORDER BY revision_date, mode_code"
+    )
+    return {
+        (row["revision_date"], row["mode_code"]): (
+            row["revision_count"],
+            format_number(row["page_equivalents"]),
+        )
+        for row in rows
+    }
+
+
+def _expected_rollup(hafiz_id):
+    """The rollup recomputed in Python from the hafiz's revisions."""
+    groups = {}
+    for rev in db.q(
+        f"""SELECT revisions.revision_date, revisions.mode_code, revisions.item_id
+        FROM revisions JOIN items ON items.id = revisions.item_id
+        WHERE revisions.hafiz_id = {hafiz_id}"""
+    ):
+        groups.setdefault((rev["revision_date"], rev["mode_code"]), []).append(rev)
+    return {
+        key: (
+            len(revs),
+            format_number(sum(get_item_page_portion(r["item_id"]) for r in revs)),
+        )
+        for key, revs in groups.items()
+    }
+
+
+@pytest.fixture
+def item_ids():
+    return [row["id"] for row in db.q("SELECT id FROM items WHERE active = 1 ORDER BY id LIMIT 60")]
+
+
+class TestRollupTriggers:
+    """Inserts, moves and deletes of revisions are reflected in the rollup."""
+
+    def test_random_changes_match_revisions(self, progression_test_hafiz, item_ids, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        dates = ["2024-01-10", "2024-01-11", "2024-01-12"]
+        rng = random.Random(7)
+        revisions.xtra()
+
+        added = [
+            add_revision(hafiz_id, rng.choice(item_ids), rng.choice(dates), rng.choice(MODES))
+            for _ in range(80)
+        ]
+        assert _rollup(hafiz_id) == _expected_rollup(hafiz_id)
+
+        for rev in rng.sample(added, 20):
+            revisions.update(
+                {"revision_date": rng.choice(dates), "mode_code": rng.choice(MODES)}, rev.id
+            )
+        for rev in rng.sample(added, 10):
+            revisions.update({"item_id": rng.choice(item_ids), "rating": -1}, rev.id)
+        assert _rollup(hafiz_id) == _expected_rollup(hafiz_id)
+
+        for rev in added[:60]:
+            revisions.delete(rev.id)
+        assert _rollup(hafiz_id) == _expected_rollup(hafiz_id)
+
+    def test_deleting_last_revision_removes_row(self, progression_test_hafiz, item_ids, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        revisions.xtra()
+        rev = add_revision(hafiz_id, item_ids[0], "2023-06-01")
+        assert ("2023-06-01", FULL_CYCLE_MODE_CODE) in _rollup(hafiz_id)
+
+        revisions.delete(rev.id)
+        assert ("2023-06-01", FULL_CYCLE_MODE_CODE) not in _rollup(hafiz_id)
+
+    def test_page_portion_change_updates_rows(self, progression_test_hafiz, add_revision):
+        from app.quran_metadata import invalidate_quran_metadata
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        page_item_ids = [
+            int(item_id)
+            for item_id in db.q(
+                "SELECT group_concat(id) AS ids FROM items WHERE active = 1 "
+                "GROUP BY page_id HAVING COUNT(*) >= 2 LIMIT 1"
+            )[0]["ids"].split(",")
+        ]
+        revisions.xtra()
+        for revision_date, mode_code in [("2023-06-01", FULL_CYCLE_MODE_CODE), ("2023-06-02", SRS_MODE_CODE)]:
+            add_revision(hafiz_id, page_item_ids[0], revision_date, mode_code)
+        add_revision(hafiz_id, page_item_ids[0], "2023-06-01")
+        add_revision(hafiz_id, page_item_ids[1], "2023-06-01")
+
+        try:
+            # Deactivating an item on the page changes the page portion of the others
+            db.execute(f"UPDATE items SET active = 0 WHERE id = {page_item_ids[-1]}")
+            invalidate_quran_metadata("items")
+            assert _rollup(hafiz_id) == _expected_rollup(hafiz_id)
+        finally:
+            db.execute(f"UPDATE items SET active = 1 WHERE id = {page_item_ids[-1]}")
+            invalidate_quran_metadata("items")
+        assert _rollup(hafiz_id) == _expected_rollup(hafiz_id)
+
+    def test_close_date_keeps_rollup_consistent(self, progression_test_hafiz, item_ids, add_revision):
+        from app.close_date import close_date
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        revisions.xtra()
+        for item_id in item_ids[:3]:
+            add_revision(hafiz_id, item_id, progression_test_hafiz["current_date"])
+        # Clear the closed day's rows so only Close Date's rebuild can restore them
+        db.execute(f"DELETE FROM revision_daily_rollup WHERE hafiz_id = {hafiz_id}")
+
+        closed = close_date(hafiz_id)
+
+        rollup = _rollup(hafiz_id)
+        assert rollup == {
+            key: value
+            for key, value in _expected_rollup(hafiz_id).items()
+            if key[0] == closed["current_date"]
+        }
+        assert rollup
+
+
+class TestWindowedReport:
+    """The report is paged by REPORT_WINDOW_DAYS-day windows."""
+
+    @pytest.fixture
+    def hafiz_with_history(self, progression_test_hafiz, item_ids, add_revision):
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        revisions.xtra()
+        # One revision every third day for 70 days
+        earliest_date = sub_days_to_date(current_date, 69)
+        for offset in range(0, 70, 3):
+            add_revision(hafiz_id, item_ids[offset % len(item_ids)], add_days_to_date(earliest_date, offset))
+        return hafiz_id, current_date, earliest_date
+
+    def test_windows_cover_history(self, hafiz_with_history):
+        from app.home_controller import datewise_summary_table_view
+
+        hafiz_id, current_date, earliest_date = hafiz_with_history
+
+        html = to_xml(datewise_summary_table_view(auth=hafiz_id))
+        windows = [html]
+        while next_until := re.search(r'hx-get="/report\?until=([\d-]+)"', windows[-1]):
+            windows.append(
+                to_xml(datewise_summary_table_view(auth=hafiz_id, until=next_until.group(1)))
+            )
+
+        # 70 days: two full windows and a partial one
+        assert len(windows) == 3
+        assert "<thead>" not in windows[1]
+        row_dates = [
+            re.findall(r"<tr[^>]*>\s*<td[^>]*>([^<]+)</td>", window) for window in windows
+        ]
+        assert [len(dates) for dates in row_dates] == [REPORT_WINDOW_DAYS, REPORT_WINDOW_DAYS, 10]
+
+        total = sum(
+            int(count)
+            for window in windows
+            for count in re.findall(r'<td rowspan="1">(\d+)</td>', window)
+        )
+        assert total == len(
+            revisions(where=f"hafiz_id = {hafiz_id} AND revision_date >= '{earliest_date}'")
+        )
+
+    def test_query_count_independent_of_revisions(self, progression_test_hafiz, item_ids, add_revision):
+        from app.home_view import datewise_summary_table
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        current_date = progression_test_hafiz["current_date"]
+        revisions.xtra()
+
+        def render_queries():
+            statements = []
+            with db.tracer(lambda sql, params: statements.append(sql)):
+                html = to_xml(datewise_summary_table(hafiz_id=hafiz_id))
+            return len(statements), html
+
+        add_revision(hafiz_id, item_ids[0], current_date)
+        few_queries, _ = render_queries()
+        for item_id in item_ids[1:40]:
+            add_revision(hafiz_id, item_id, sub_days_to_date(current_date, item_id % 5))
+        many_queries, html = render_queries()
+
+        assert many_queries == few_queries
+        # Every revision in the window is linked from exactly one range
+        linked_ids = [
+            int(rev_id)
+            for ids in re.findall(r"bulk_edit\?ids=([\d,]+)", html)
+            for rev_id in ids.split(",")
+        ]
+        window_ids = [
+            rev.id
+            for rev in revisions(
+                where=f"hafiz_id = {hafiz_id} AND revision_date >= '{sub_days_to_date(current_date, REPORT_WINDOW_DAYS - 1)}'"
+            )
+        ]
+        assert sorted(linked_ids) == sorted(window_ids)
+
+
+class TestPagesRevisedIndicator:
+    """get_today_vs_yesterday_stats reads the rollup."""
+
+    def test_follows_inserts_updates_and_deletes(self, progression_test_hafiz, item_ids, add_revision):
+        from app.home_view import get_today_vs_yesterday_stats
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        today = progression_test_hafiz["current_date"]
+        yesterday = sub_days_to_date(today, 1)
+        revisions.xtra()
+
+        def expected():
+            return tuple(
+                format_number(sum(
+                    get_item_page_portion(rev.item_id)
+                    for rev in revisions(where=f"hafiz_id = {hafiz_id} AND revision_date = '{date}'")
+                ))
+                for date in (today, yesterday)
+            )
+
+        added = [
+            add_revision(hafiz_id, item_id, today, mode_code)
+            for item_id, mode_code in zip(item_ids[:6], MODES * 2)
+        ]
+        add_revision(hafiz_id, item_ids[10], yesterday)
+        assert get_today_vs_yesterday_stats(hafiz_id) == expected()
+
+        revisions.update({"revision_date": yesterday}, added[0].id)
+        revisions.update({"item_id": item_ids[20]}, added[1].id)
+        revisions.delete(added[2].id)
+        assert get_today_vs_yesterday_stats(hafiz_id) == expected()
+
+    def test_one_query_however_many_revisions(self, progression_test_hafiz, item_ids, add_revision):
+        from app.home_view import get_today_vs_yesterday_stats
+
+        hafiz_id = progression_test_hafiz["hafiz_id"]
+        today = progression_test_hafiz["current_date"]
+        revisions.xtra()
+
+        def stats_queries():
+            statements = []
+            with db.tracer(lambda sql, params: statements.append(sql)):
+                get_today_vs_yesterday_stats(hafiz_id)
+            return len(statements)
+
+        few_queries = stats_queries()
+        for item_id in item_ids[:40]:
+            add_revision(hafiz_id, item_id, today)
+
+        assert stats_queries() == few_queries
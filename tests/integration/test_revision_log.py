@@ -0,0 +1,87 @@
+"""Integration tests for the keyset-paginated revision log.
+
+Tests verify that:
+1. Following the cursor walks the hafiz's whole history newest-first, once
+2. The infinite-scroll trigger row carries the cursor
+3. Each page is an index search, independent of history size
+"""
+
+import pytest
+from constants import FULL_CYCLE_MODE_CODE
+from database import db, revisions
+from app.revision_model import get_revision_log
+from app.revision_view import generate_revision_table_part
+
+
+@pytest.fixture
+def hafiz_with_history(progression_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    revisions.xtra()
+    for item_id in range(1, 46):
+        revisions.insert(
+            hafiz_id=hafiz_id,
+            item_id=item_id,
+            mode_code=FULL_CYCLE_MODE_CODE,
+            revision_date="2024-01-14",
+            rating=1,
+        )
+    # Includes any revisions the fixture hafiz already had
+    revision_ids = [rev.id for rev in revisions(where=f"hafiz_id = {hafiz_id}")]
+    return hafiz_id, revision_ids
+
+
+class TestRevisionLog:
+    """get_revision_log keyset pagination."""
+
+    def test_cursor_walks_history_newest_first(self, hafiz_with_history):
+        hafiz_id, revision_ids = hafiz_with_history
+        seen, cursor = [], None
+        while True:
+            page = get_revision_log(hafiz_id, cursor, size=20)
+            if not page:
+                break
+            seen.extend(row["id"] for row in page)
+            cursor = page[-1]["id"]
+
+        assert seen == sorted(revision_ids, reverse=True)
+
+    def test_rows_include_item_fields(self, hafiz_with_history):
+        hafiz_id, _ = hafiz_with_history
+        row = get_revision_log(hafiz_id, size=1)[0]
+        item = db.q(
+            f"SELECT items.description, pages.page_number FROM items "
+            f"JOIN pages ON pages.id = items.page_id WHERE items.id = {row['item_id']}"
+        )[0]
+        assert row["description"] == item["description"]
+        assert row["page_number"] == item["page_number"]
+        assert row["surah_name"]
+
+    def test_page_is_index_search(self, hafiz_with_history):
+        hafiz_id, revision_ids = hafiz_with_history
+        queries = []
+        with db.tracer(lambda sql, params: queries.append(sql)):
+            get_revision_log(hafiz_id, cursor=revision_ids[20])
+        plan = [row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {queries[-1]}")]
+        assert any("idx_revisions_hafiz_id" in detail for detail in plan)
+        assert not any("TEMP B-TREE" in detail for detail in plan)
+
+
+class TestRevisionTablePart:
+    """The revealed trigger row requests the next page by cursor."""
+
+    def test_last_row_carries_cursor(self, hafiz_with_history):
+        hafiz_id, revision_ids = hafiz_with_history
+        rows = generate_revision_table_part(hafiz_id)
+        newest_first = sorted(revision_ids, reverse=True)
+
+        assert len(rows) == 20
+        assert rows[-1].attrs["get"] == f"revision?cursor={newest_first[19]}"
+        assert rows[-1].attrs["hx-trigger"] == "revealed"
+
+    def test_short_last_page_has_no_trigger(self, hafiz_with_history):
+        hafiz_id, revision_ids = hafiz_with_history
+        newest_first = sorted(revision_ids, reverse=True)
+        rows = generate_revision_table_part(hafiz_id, cursor=newest_first[39])
+
+        assert len(rows) == len(revision_ids) - 40 < 20
+        assert "get" not in rows[-1].attrs
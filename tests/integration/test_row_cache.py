@@ -0,0 +1,121 @@
+"""Integration tests for the summary table row cache (app/home_view.py).
+
+Tests verify that:
+1. Cached rows render the same HTML as freshly rendered ones
+2. Re-rendering a table after one rating reuses every other row
+3. The cache is bounded by bytes and evicts the least recently used rows
+4. Rows returned from the cache can be changed without affecting it
+5. Quran metadata edits render fresh rows
+"""
+
+import pytest
+from fasthtml.common import to_xml
+from constants import FULL_CYCLE_MODE_CODE
+from database import db, hafizs_items, items, revisions
+from app.quran_metadata import invalidate_quran_metadata
+from app.home_view import (
+    _RowFragmentCache,
+    clear_row_cache,
+    get_row_cache_stats,
+    render_range_row,
+    render_summary_table,
+)
+
+
+@pytest.fixture
+def table_item_ids(progression_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    hafizs_items.xtra()
+    item_ids = [
+        row.item_id
+        for row in hafizs_items(where=f"hafiz_id = {hafiz_id} AND memorized = 0", order_by="item_id", limit=10)
+    ]
+    clear_row_cache()
+    yield hafiz_id, item_ids
+    clear_row_cache()
+
+
+def _render_table(hafiz_id, item_ids):
+    _, table = render_summary_table(hafiz_id, FULL_CYCLE_MODE_CODE, item_ids, is_plan_finished=False)
+    return to_xml(table)
+
+
+def test_rerender_after_one_rating_reuses_other_rows(table_item_ids):
+    hafiz_id, item_ids = table_item_ids
+    _render_table(hafiz_id, item_ids)
+    assert get_row_cache_stats()["misses"] == len(item_ids)
+
+    revisions.xtra()
+    revisions.insert(
+        hafiz_id=hafiz_id, item_id=item_ids[3], mode_code=FULL_CYCLE_MODE_CODE,
+        revision_date="2024-01-15", rating=1,
+    )
+    cached_html = _render_table(hafiz_id, item_ids)
+
+    stats = get_row_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (len(item_ids) - 1, len(item_ids) + 1)
+    assert 'hx-put="/edit/' in cached_html
+
+    clear_row_cache()
+    assert _render_table(hafiz_id, item_ids) == cached_html
+
+
+def test_row_changes_with_each_key_input(table_item_ids):
+    _, item_ids = table_item_ids
+    records = {"item": items[item_ids[0]], "revision": None}
+    variants = [
+        dict(current_date="2024-01-15", mode_code=FULL_CYCLE_MODE_CODE),
+        dict(current_date="2024-01-16", mode_code=FULL_CYCLE_MODE_CODE),
+        dict(current_date="2024-01-15", mode_code=FULL_CYCLE_MODE_CODE, plan_id=2),
+        dict(current_date="2024-01-15", mode_code=FULL_CYCLE_MODE_CODE, loved=True),
+        dict(current_date="2024-01-15", mode_code=FULL_CYCLE_MODE_CODE, hide_start_text=True),
+    ]
+
+    rendered = {to_xml(render_range_row(records, **variant)) for variant in variants}
+    assert len(rendered) == len(variants)
+    assert get_row_cache_stats()["entries"] == len(variants)
+
+
+def test_returned_row_is_not_shared(table_item_ids):
+    _, item_ids = table_item_ids
+    records = {"item": items[item_ids[0]], "revision": None}
+    row = render_range_row(records, "2024-01-15", FULL_CYCLE_MODE_CODE)
+    row.attrs["hx-trigger"] = "revealed"
+
+    assert "revealed" not in to_xml(render_range_row(records, "2024-01-15", FULL_CYCLE_MODE_CODE))
+    assert get_row_cache_stats()["hits"] == 1
+
+
+def test_metadata_edit_renders_fresh_row(table_item_ids):
+    _, item_ids = table_item_ids
+    item = items[item_ids[0]]
+    records = {"item": item, "revision": None}
+    page_number = db.q(f"SELECT page_number FROM pages WHERE id = {item.page_id}")[0]["page_number"]
+    assert f">{page_number}</a>" in to_xml(render_range_row(records, "2024-01-15", FULL_CYCLE_MODE_CODE))
+
+    try:
+        db.execute("UPDATE pages SET page_number = 9999 WHERE id = ?", [item.page_id])
+        invalidate_quran_metadata("pages")
+        html = to_xml(render_range_row(records, "2024-01-15", FULL_CYCLE_MODE_CODE))
+        assert ">9999</a>" in html
+    finally:
+        db.execute("UPDATE pages SET page_number = ? WHERE id = ?", [page_number, item.page_id])
+        invalidate_quran_metadata("pages")
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = _RowFragmentCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # "b" is now least recently used
+
+    cache.put("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+    # Multi-byte characters count by their encoded size
+    cache.put("d", "é" * 5)
+    assert cache.stats()["bytes"] <= 10
+    # A fragment larger than the whole cache is not stored
+    cache.put("e", "e" * 11)
+    assert cache.get("e") is None
+    assert cache.stats() == {"hits": 3, "misses": 2, "entries": 1, "bytes": 10, "max_bytes": 10}
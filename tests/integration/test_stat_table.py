@@ -0,0 +1,73 @@
+"""Integration tests for the today/yesterday stat table (create_stat_table).
+
+Tests verify that:
+1. Each mode's counts and bulk edit links match its revisions
+2. Building the table takes the same queries however many revisions it has
+"""
+
+import re
+import pytest
+from fasthtml.common import to_xml
+from constants import DAILY_REPS_MODE_CODE, FULL_CYCLE_MODE_CODE, SRS_MODE_CODE
+from database import db, revisions
+from utils import format_number, sub_days_to_date
+from app.common_model import get_item_page_portion
+from app.home_view import create_stat_table
+
+
+@pytest.fixture
+def item_ids():
+    return [row["id"] for row in db.q("SELECT id FROM items WHERE active = 1 ORDER BY id LIMIT 40")]
+
+
+def _cells(html, mode_code):
+    row = re.search(rf'<tr id="stat-row-{mode_code}">(.*?)</tr>', html, re.S).group(1)
+    return re.findall(r"<td>(.*?)</td>", row, re.S)
+
+
+def test_counts_and_links_match_revisions(progression_test_hafiz, multi_mode_test_hafiz, item_ids, add_revision):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    today = progression_test_hafiz["current_date"]
+    yesterday = sub_days_to_date(today, 1)
+    revisions.xtra()
+    added = {
+        (FULL_CYCLE_MODE_CODE, today): [add_revision(hafiz_id, i, today, FULL_CYCLE_MODE_CODE) for i in item_ids[:5]],
+        (SRS_MODE_CODE, yesterday): [add_revision(hafiz_id, i, yesterday, SRS_MODE_CODE) for i in item_ids[5:8]],
+    }
+    # Another hafiz's revisions are not counted
+    add_revision(multi_mode_test_hafiz["hafiz_id"], item_ids[9], today, DAILY_REPS_MODE_CODE)
+
+    html = to_xml(create_stat_table(hafiz_id))
+
+    def pages(revs):
+        return format_number(sum(get_item_page_portion(rev.item_id) for rev in revs))
+
+    fc_today = added[(FULL_CYCLE_MODE_CODE, today)]
+    srs_yesterday = added[(SRS_MODE_CODE, yesterday)]
+    fc_cells = _cells(html, FULL_CYCLE_MODE_CODE)
+    assert f"ids={','.join(str(rev.id) for rev in fc_today)}" in fc_cells[1]
+    assert f">{pages(fc_today)}</a>" in fc_cells[1]
+    assert fc_cells[2] == "-"
+    srs_cells = _cells(html, SRS_MODE_CODE)
+    assert srs_cells[1] == "-"
+    assert f">{pages(srs_yesterday)}</a>" in srs_cells[2]
+    assert 'id="stat-row-DR"' not in html
+
+
+def test_query_count_independent_of_revisions(progression_test_hafiz, item_ids, add_revision):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    today = progression_test_hafiz["current_date"]
+    revisions.xtra()
+
+    def table_queries():
+        statements = []
+        with db.tracer(lambda sql, params: statements.append(sql)):
+            to_xml(create_stat_table(hafiz_id))
+        return len(statements)
+
+    few_queries = table_queries()
+    for item_id in item_ids:
+        add_revision(hafiz_id, item_id, today, FULL_CYCLE_MODE_CODE)
+        add_revision(hafiz_id, item_id, sub_days_to_date(today, 1), SRS_MODE_CODE)
+
+    assert table_queries() == few_queries
@@ -0,0 +1,98 @@
+"""Integration tests for the cached status histogram (get_status_histogram).
+
+Tests verify that:
+1. The single aggregate query matches classifying each item with get_status
+2. Repeat calls are served from the cache
+3. Status changes invalidate the cache, other hafizs_items writes do not
+"""
+
+import pytest
+from constants import FULL_CYCLE_MODE_CODE, STATUS_NOT_MEMORIZED, STATUS_SOLID
+from database import db, hafizs_items
+from app.common_model import (
+    get_page_count,
+    get_status,
+    get_status_counts,
+    get_status_histogram,
+)
+
+
+def _histogram_queries(hafiz_id) -> list:
+    queries = []
+
+    def tracer(sql, params):
+        if "GROUP BY status" in sql:
+            queries.append(sql)
+
+    with db.tracer(tracer):
+        get_status_histogram(hafiz_id)
+    return queries
+
+
+@pytest.fixture
+def hafiz_id(progression_test_hafiz):
+    hafiz_id = progression_test_hafiz["hafiz_id"]
+    hafizs_items.xtra()
+    # A mix of statuses
+    for hafiz_item in hafizs_items(where=f"hafiz_id = {hafiz_id}", order_by="item_id", limit=5):
+        hafizs_items.update(
+            {"memorized": True, "mode_code": FULL_CYCLE_MODE_CODE}, hafiz_item.id
+        )
+    return hafiz_id
+
+
+class TestStatusHistogram:
+    """Aggregate matches per-item classification."""
+
+    def test_matches_per_item_status(self, hafiz_id):
+        rows = hafizs_items(where=f"hafiz_id = {hafiz_id}")
+        histogram = get_status_histogram(hafiz_id)
+
+        for status in [STATUS_NOT_MEMORIZED, STATUS_SOLID]:
+            item_ids = [row.item_id for row in rows if get_status(row) == status]
+            assert histogram[status]["items"] == len(item_ids)
+            assert histogram[status]["pages"] == pytest.approx(
+                get_page_count(item_ids=item_ids), abs=0.05
+            )
+        assert histogram["memorized"]["items"] == sum(1 for row in rows if row.memorized)
+        assert histogram["total"]["items"] == len(rows)
+        assert get_status_counts(hafiz_id)[STATUS_SOLID] == get_page_count(
+            item_ids=[row.item_id for row in rows if get_status(row) == STATUS_SOLID]
+        )
+
+    def test_unknown_hafiz_is_empty(self):
+        histogram = get_status_histogram(10_000_000)
+        assert histogram["total"] == {"items": 0, "pages": 0.0}
+
+
+class TestStatusHistogramCache:
+    """Cached per hafiz, invalidated by status changes."""
+
+    def test_repeat_call_is_cached(self, hafiz_id):
+        get_status_histogram(hafiz_id)
+        assert _histogram_queries(hafiz_id) == []
+
+    def test_status_change_invalidates(self, hafiz_id):
+        before = get_status_histogram(hafiz_id)[STATUS_SOLID]["items"]
+        hafiz_item = hafizs_items(
+            where=f"hafiz_id = {hafiz_id} AND memorized = 0", limit=1
+        )[0]
+        hafizs_items.update(
+            {"memorized": True, "mode_code": FULL_CYCLE_MODE_CODE}, hafiz_item.id
+        )
+
+        assert len(_histogram_queries(hafiz_id)) == 1
+        assert get_status_histogram(hafiz_id)[STATUS_SOLID]["items"] == before + 1
+
+    def test_raw_sql_status_change_invalidates(self, hafiz_id):
+        get_status_histogram(hafiz_id)
+        db.execute(
+            f"UPDATE hafizs_items SET memorized = 0, mode_code = NULL WHERE hafiz_id = {hafiz_id}"
+        )
+        assert get_status_histogram(hafiz_id)[STATUS_SOLID]["items"] == 0
+
+    def test_stats_update_keeps_cache(self, hafiz_id):
+        get_status_histogram(hafiz_id)
+        hafiz_item = hafizs_items(where=f"hafiz_id = {hafiz_id}", limit=1)[0]
+        hafizs_items.update({"good_streak": 3, "last_review": "2024-01-14"}, hafiz_item.id)
+        assert _histogram_queries(hafiz_id) == []
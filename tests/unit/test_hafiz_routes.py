@@ -273,3 +273,92 @@ class TestHafizRouteProtection:
         # Verify hafiz still belongs to original user
         updated = hafizs[hafiz_id]
         assert updated.user_id == original_user_id
+
+
+class TestHafizProvisioning:
+    """Tests bulk hafizs_items provisioning and POST /hafiz/clone."""
+
+    def test_populate_hafiz_items_is_one_statement(self, progression_test_hafiz):
+        """populate_hafiz_items fills a new hafiz with a single INSERT ... SELECT."""
+        from app.hafiz_model import populate_hafiz_items
+        from database import db, hafizs_items
+
+        hafiz_id = hafizs.insert(name="Provisioned Hafiz", user_id=progression_test_hafiz["user_id"]).id
+        statements = []
+        with db.tracer(lambda sql, params: statements.append(sql)):
+            populate_hafiz_items(hafiz_id)
+
+        assert len([sql for sql in statements if "INSERT INTO hafizs_items" in sql]) == 1
+        rows = db.q(
+            f"""SELECT hafizs_items.page_number, pages.page_number AS expected
+            FROM hafizs_items JOIN items ON items.id = hafizs_items.item_id
+            LEFT JOIN pages ON pages.id = items.page_id
+            WHERE hafizs_items.hafiz_id = {hafiz_id}"""
+        )
+        assert len(rows) == db.q("SELECT COUNT(*) AS n FROM items WHERE active <> 0")[0]["n"]
+        assert all(row["page_number"] == row["expected"] for row in rows)
+        hafizs_items.xtra()
+        assert {hi.mode_code for hi in hafizs_items(where=f"hafiz_id = {hafiz_id}")} == {FULL_CYCLE_MODE_CODE}
+
+        # Running it again adds nothing
+        populate_hafiz_items(hafiz_id)
+        assert len(hafizs_items(where=f"hafiz_id = {hafiz_id}")) == len(rows)
+
+    def test_clone_copies_template_pages(self, progression_test_hafiz):
+        """POST /hafiz/clone creates hafizs with the template's memorized pages and a plan each."""
+        from app.hafiz_controller import clone_hafizs
+        from database import hafizs_items, plans
+
+        user_id = progression_test_hafiz["user_id"]
+        template_id = progression_test_hafiz["hafiz_id"]
+        hafizs_items.xtra()
+        plans.xtra()
+
+        result = clone_hafizs(
+            template_hafiz_id=template_id,
+            names="Student A\n\n  Student B  \n",
+            sess={"user_auth": user_id},
+        )
+        assert result.status_code == 303
+
+        def item_state(hafiz_id):
+            return {
+                hi.item_id: (
+                    hi.mode_code, bool(hi.memorized), hi.page_number, hi.next_review, hi.next_interval,
+                    hi.custom_daily_threshold, hi.custom_weekly_threshold,
+                    hi.custom_fortnightly_threshold, hi.custom_monthly_threshold,
+                )
+                for hi in hafizs_items(where=f"hafiz_id = {hafiz_id}")
+            }
+
+        students = hafizs(where=f"user_id = {user_id} AND name IN ('Student A', 'Student B')")
+        assert len(students) == 2
+        for student in students:
+            assert item_state(student.id) == item_state(template_id)
+            assert len(plans(where=f"hafiz_id = {student.id} AND completed = 0")) == 1
+
+    def test_clone_rejects_other_users_template(self, progression_test_hafiz, multi_mode_test_hafiz):
+        """POST /hafiz/clone does nothing for a template owned by another user."""
+        from app.hafiz_controller import clone_hafizs
+
+        user_2 = multi_mode_test_hafiz["user_id"]
+        clone_hafizs(
+            template_hafiz_id=progression_test_hafiz["hafiz_id"],
+            names="Intruder",
+            sess={"user_auth": user_2},
+        )
+        assert hafizs(where=f"user_id = {user_2} AND name = 'Intruder'") == []
+
+    def test_clone_missing_template(self, progression_test_hafiz):
+        """POST /hafiz/clone with an unknown template redirects with an error instead of failing."""
+        from app.hafiz_controller import clone_hafizs
+
+        user_id = progression_test_hafiz["user_id"]
+        sess = {"user_auth": user_id}
+        result = clone_hafizs(template_hafiz_id=999_999_999, names="Orphan", sess=sess)
+
+        assert result.status_code == 303
+        from fasthtml.toaster import sk
+
+        assert sess[sk] == [("Template hafiz not found", "error")]
+        assert hafizs(where=f"user_id = {user_id} AND name = 'Orphan'") == []
@@ -0,0 +1,158 @@
+"""Unit tests for the in-process Quran metadata index.
+
+The index must answer exactly what the items/pages/surahs tables say.
+"""
+
+import pytest
+from fasthtml.common import NotFoundError
+from database import db, items, pages, surahs
+from app import quran_metadata
+from app.admin_model import update_record_model
+
+
+@pytest.fixture
+def fresh_index():
+    quran_metadata.invalidate_quran_metadata()
+    yield quran_metadata
+    quran_metadata.invalidate_quran_metadata()
+
+
+class TestQuranMetadataLookups:
+    """Index lookups agree with the underlying tables."""
+
+    def test_page_surah_and_juz_match_tables(self, fresh_index):
+        for item in items():
+            page = pages[item.page_id]
+            assert fresh_index.item_page_number(item.id) == page.page_number
+            assert fresh_index.item_juz_number(item.id) == page.juz_number
+            assert fresh_index.item_surah_id(item.id) == item.surah_id
+            assert fresh_index.surah_name(item.surah_id) == surahs[item.surah_id].name
+
+    def test_part_info_and_portion_match_active_items(self, fresh_index):
+        for item in items():
+            page_items = items(
+                where=f"page_id = {item.page_id} and active = 1", order_by="id ASC"
+            )
+            active_ids = [page_item.id for page_item in page_items]
+            expected_portion = 1 / len(active_ids) if active_ids else 0
+            assert fresh_index.item_page_portion(item.id) == expected_portion
+
+            if len(active_ids) > 1 and item.id in active_ids:
+                expected_part = (active_ids.index(item.id) + 1, len(active_ids))
+            else:
+                expected_part = None
+            assert fresh_index.item_part_info(item.id) == expected_part
+
+    def test_split_page_parts_are_numbered(self, fresh_index):
+        split_page = db.q(
+            "SELECT page_id FROM items WHERE active = 1 GROUP BY page_id HAVING COUNT(*) > 1 LIMIT 1"
+        )
+        if not split_page:
+            pytest.skip("No split pages in database")
+        page_items = items(
+            where=f"page_id = {split_page[0]['page_id']} and active = 1", order_by="id ASC"
+        )
+        parts = [fresh_index.item_part_info(item.id) for item in page_items]
+        assert parts == [(idx + 1, len(page_items)) for idx in range(len(page_items))]
+
+    def test_unknown_item_raises_not_found(self, fresh_index):
+        with pytest.raises(NotFoundError):
+            fresh_index.item_page_number(10_000_000)
+
+
+class TestPagePortions:
+    """items.page_portion and vectorized page counts."""
+
+    def test_items_page_count_sums_portions(self, fresh_index):
+        all_items = items()
+        item_ids = [item.id for item in all_items]
+        expected = sum(item.page_portion for item in all_items)
+        assert fresh_index.items_page_count(item_ids) == pytest.approx(expected)
+        assert fresh_index.items_page_count([]) == 0
+
+    def test_items_page_count_unknown_item_raises(self, fresh_index):
+        with pytest.raises(NotFoundError):
+            fresh_index.items_page_count([1, 10_000_000])
+
+    def test_deactivating_item_updates_page_portions(self, fresh_index):
+        split_page = db.q(
+            "SELECT page_id FROM items WHERE active = 1 GROUP BY page_id HAVING COUNT(*) = 2 LIMIT 1"
+        )
+        if not split_page:
+            pytest.skip("No two-part pages in database")
+        first, second = items(
+            where=f"page_id = {split_page[0]['page_id']} and active = 1", order_by="id ASC"
+        )
+        try:
+            update_record_model("items", first.id, {"active": 0})
+            assert items[first.id].page_portion == items[second.id].page_portion == 1
+            assert fresh_index.item_page_portion(second.id) == 1
+        finally:
+            update_record_model("items", first.id, {"active": 1})
+        assert items[second.id].page_portion == 0.5
+        assert fresh_index.item_page_portion(second.id) == 0.5
+
+
+class TestItemBoundaries:
+    """Surah/juz boundaries of a run of items."""
+
+    def test_boundaries_match_tables(self, fresh_index):
+        # Every third active item, so boundaries fall between non-adjacent items
+        run = items(where="active = 1", order_by="id ASC")[::3]
+        boundaries = fresh_index.item_boundaries(item.id for item in run)
+
+        juz_numbers = [pages[item.page_id].juz_number for item in run]
+        assert boundaries["surah_id"].tolist() == [item.surah_id for item in run]
+        assert boundaries["juz_number"].tolist() == juz_numbers
+        assert boundaries["surah_starts"].tolist() == [False] + [
+            current.surah_id != previous.surah_id for previous, current in zip(run, run[1:])
+        ]
+        assert boundaries["juz_starts"].tolist() == [False] + [
+            current != previous for previous, current in zip(juz_numbers, juz_numbers[1:])
+        ]
+        assert boundaries["surah_starts"].sum() > 0 and boundaries["juz_starts"].sum() > 0
+
+    def test_empty_run_and_unknown_item(self, fresh_index):
+        assert fresh_index.item_boundaries([])["surah_starts"].size == 0
+        with pytest.raises(NotFoundError):
+            fresh_index.item_boundaries([1, 10_000_000])
+
+
+class TestQuranMetadataInvalidation:
+    """Admin edits to metadata tables rebuild the index."""
+
+    def test_index_is_loaded_once(self, fresh_index):
+        assert fresh_index.load_quran_metadata() is fresh_index.load_quran_metadata()
+
+    def test_non_metadata_table_keeps_index(self, fresh_index):
+        index = fresh_index.load_quran_metadata()
+        fresh_index.invalidate_quran_metadata("revisions")
+        assert fresh_index.load_quran_metadata() is index
+
+    def test_admin_surah_edit_is_visible(self, fresh_index):
+        surah = surahs()[0]
+        assert fresh_index.surah_name(surah.id) == surah.name
+        try:
+            update_record_model("surahs", surah.id, {"name": "Renamed"})
+            assert fresh_index.surah_name(surah.id) == "Renamed"
+        finally:
+            update_record_model("surahs", surah.id, {"name": surah.name})
+        assert fresh_index.surah_name(surah.id) == surah.name
+
+    def test_edit_from_another_process_is_picked_up(self, fresh_index):
+        surah = surahs()[0]
+        assert fresh_index.surah_name(surah.id) == surah.name
+        try:
+            # A direct write stands in for another worker's admin edit: it bumps
+            # the stored version without touching this process's index
+            db.execute("UPDATE surahs SET name = 'Renamed' WHERE id = ?", [surah.id])
+            assert fresh_index.surah_name(surah.id) == surah.name
+            fresh_index.check_quran_metadata_version()
+            assert fresh_index.surah_name(surah.id) == "Renamed"
+        finally:
+            db.execute("UPDATE surahs SET name = ? WHERE id = ?", [surah.name, surah.id])
+
+    def test_unchanged_version_keeps_index(self, fresh_index):
+        index = fresh_index.load_quran_metadata()
+        fresh_index.check_quran_metadata_version()
+        assert fresh_index.load_quran_metadata() is index
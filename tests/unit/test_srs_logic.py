@@ -1,173 +1,111 @@
 """Unit tests for SRS algorithm pure functions in app/srs_reps.py."""
 
 import pytest
+from utils import add_days_to_date
 from app.srs_reps import (
-    binary_search_less_than,
-    get_interval_triplet,
-    apply_rating_penalty,
-    get_next_interval_based_on_rating,
+    compute_srs_intervals,
+    step_srs_interval_indexes,
+    SRS_END_INTERVAL,
     SRS_START_INTERVAL,
     SRS_INTERVALS,
 )
 
 
-class TestBinarySearchLessThan:
-    def test_target_exactly_matches_element(self):
-        result = binary_search_less_than([2, 5, 10, 20], 10)
-        assert result == {"index": 2, "value": 10}
-
-    def test_target_between_elements_returns_smaller(self):
-        result = binary_search_less_than([2, 5, 10, 20], 8)
-        assert result == {"index": 1, "value": 5}
-
-    def test_target_smaller_than_all_elements(self):
-        result = binary_search_less_than([2, 5, 10, 20], 1)
-        assert result == {"index": None, "value": None}
-
-    def test_target_larger_than_all_elements(self):
-        result = binary_search_less_than([2, 5, 10, 20], 100)
-        assert result == {"index": 3, "value": 20}
-
-    def test_first_element_match(self):
-        result = binary_search_less_than([2, 5, 10, 20], 2)
-        assert result == {"index": 0, "value": 2}
-
-    def test_last_element_match(self):
-        result = binary_search_less_than([2, 5, 10, 20], 20)
-        assert result == {"index": 3, "value": 20}
-
-    def test_single_element_list_match(self):
-        result = binary_search_less_than([5], 5)
-        assert result == {"index": 0, "value": 5}
-
-    def test_single_element_list_smaller(self):
-        result = binary_search_less_than([5], 3)
-        assert result == {"index": None, "value": None}
-
-    def test_single_element_list_larger(self):
-        result = binary_search_less_than([5], 10)
-        assert result == {"index": 0, "value": 5}
-
-    def test_with_srs_intervals(self):
-        result = binary_search_less_than(SRS_INTERVALS, 30)
-        assert result == {"index": 9, "value": 29}
-
-
-class TestGetIntervalTriplet:
-    def test_middle_of_list(self):
-        triplet = get_interval_triplet(10, [2, 5, 10, 20, 30])
-        assert triplet == [5, 10, 20]
-
-    def test_first_element_left_equals_current(self):
-        triplet = get_interval_triplet(2, [2, 5, 10, 20])
-        assert triplet == [2, 2, 5]
-
-    def test_last_element_right_equals_current(self):
-        triplet = get_interval_triplet(20, [2, 5, 10, 20])
-        assert triplet == [10, 20, 20]
-
-    def test_target_not_exactly_in_list(self):
-        triplet = get_interval_triplet(8, [2, 5, 10, 20])
-        assert triplet == [2, 5, 10]
-
-    def test_target_smaller_than_all_starts_at_index_0(self):
-        triplet = get_interval_triplet(1, [2, 5, 10, 20])
-        assert triplet == [2, 2, 5]
-
-    def test_target_larger_than_all(self):
-        triplet = get_interval_triplet(100, [2, 5, 10, 20])
-        assert triplet == [10, 20, 20]
+class TestSrsStartInterval:
+    def test_bad_rating_starts_at_3_days(self):
+        assert SRS_START_INTERVAL[-1] == 3
 
-    def test_single_element_list(self):
-        triplet = get_interval_triplet(5, [5])
-        assert triplet == [5, 5, 5]
+    def test_ok_rating_starts_at_10_days(self):
+        assert SRS_START_INTERVAL[0] == 10
 
-    def test_two_element_list_first(self):
-        triplet = get_interval_triplet(5, [5, 10])
-        assert triplet == [5, 5, 10]
 
-    def test_two_element_list_second(self):
-        triplet = get_interval_triplet(10, [5, 10])
-        assert triplet == [5, 10, 10]
+def _next_interval(days_since_review, planned_interval, rating, current_date="2024-06-15"):
+    """compute_srs_intervals for a single revision; None when it isn't scheduled."""
+    last_review = add_days_to_date(current_date, -days_since_review) if days_since_review is not None else None
+    result = compute_srs_intervals(current_date, [last_review], [planned_interval], [rating])
+    if not result["scheduled"][0]:
+        return None
+    return int(result["next_interval"][0])
 
-    def test_with_srs_intervals_prime_sequence(self):
-        triplet = get_interval_triplet(29, SRS_INTERVALS)
-        assert triplet == [23, 29, 31]
 
+class TestComputeSrsIntervals:
+    CURRENT_DATE = "2024-06-15"
 
-class TestApplyRatingPenalty:
     @pytest.mark.parametrize(
-        "actual_interval,rating,expected",
+        "planned_interval,rating,expected",
         [
-            (100, 1, 100),
-            (10, 1, 10),
-            (1, 1, 1),
+            (29, -1, 23),  # Bad moves left
+            (29, 0, 29),  # Ok stays
+            (29, 1, 31),  # Good moves right
+            (30, 1, 31),  # Not in the sequence: steps from the closest lower interval
+            (1, 0, 2),  # Below the sequence: starts at its first interval
+            (2, -1, 2),  # Bad at the first interval stays
+            (101, 1, 101),  # Good at the last interval stays
         ],
     )
-    def test_good_rating_100_percent(self, actual_interval, rating, expected):
-        assert apply_rating_penalty(actual_interval, rating) == expected
+    def test_rating_steps_along_sequence(self, planned_interval, rating, expected):
+        # Reviewed yesterday, so the planned interval outweighs the actual one
+        assert _next_interval(1, planned_interval, rating) == expected
 
     @pytest.mark.parametrize(
         "actual_interval,rating,expected",
         [
-            (100, 0, 50),
+            (29, 1, 31),  # Good keeps 100%: 29 -> right
+            (10, 1, 11),  # 10 -> 7 -> right
+            (58, 0, 29),  # Ok keeps 50%: 29
             (10, 0, 5),
-            (1, 0, 0),
+            (100, -1, 29),  # Bad keeps 35%: 35 -> 31 -> left
+            (20, -1, 5),  # 7 -> left
+            (30, -1, 5),  # 10.5 rounds to 10 -> 7 -> left
         ],
     )
-    def test_ok_rating_50_percent(self, actual_interval, rating, expected):
-        assert apply_rating_penalty(actual_interval, rating) == expected
+    def test_rating_penalty_on_actual_interval(self, actual_interval, rating, expected):
+        # A planned interval of 1 leaves the penalized actual interval in charge
+        assert _next_interval(actual_interval, 1, rating) == expected
+
+    def test_half_penalties_round_like_round(self):
+        # Ok halves 5 and 7 days to 2 and 4 (half to even), giving 2 and 3
+        result = compute_srs_intervals(
+            self.CURRENT_DATE,
+            [add_days_to_date(self.CURRENT_DATE, -5), add_days_to_date(self.CURRENT_DATE, -7)],
+            [1, 1],
+            [0, 0],
+        )
+        assert list(result["next_interval"]) == [2, 3]
 
     @pytest.mark.parametrize(
-        "actual_interval,rating,expected",
-        [
-            (100, -1, 35),
-            (10, -1, 4),
-            (1, -1, 0),
-        ],
+        "days_since_review,planned_interval",
+        [(None, 7), (0, 7), (5, None), (5, 0)],
     )
-    def test_bad_rating_35_percent(self, actual_interval, rating, expected):
-        assert apply_rating_penalty(actual_interval, rating) == expected
-
-    def test_rounding_behavior_rounds_half_up(self):
-        assert apply_rating_penalty(3, 0) == 2
-        assert apply_rating_penalty(5, 0) == 2
-        assert apply_rating_penalty(7, 0) == 4
-
-    def test_rounding_for_bad_rating(self):
-        assert apply_rating_penalty(20, -1) == 7
-        assert apply_rating_penalty(30, -1) == 10
-
-
-class TestGetNextIntervalBasedOnRating:
-    def test_bad_rating_moves_left(self):
-        result = get_next_interval_based_on_rating(29, -1)
-        assert result == 23
-
-    def test_ok_rating_stays_at_current(self):
-        result = get_next_interval_based_on_rating(29, 0)
-        assert result == 29
-
-    def test_good_rating_moves_right(self):
-        result = get_next_interval_based_on_rating(29, 1)
-        assert result == 31
-
-    def test_at_first_element_bad_rating_stays(self):
-        result = get_next_interval_based_on_rating(2, -1)
-        assert result == 2
-
-    def test_at_last_element_good_rating_stays(self):
-        result = get_next_interval_based_on_rating(101, 1)
-        assert result == 101
-
-    def test_target_not_in_list_uses_closest_lower(self):
-        result = get_next_interval_based_on_rating(30, 1)
-        assert result == 31
-
-
-class TestSrsStartInterval:
-    def test_bad_rating_starts_at_3_days(self):
-        assert SRS_START_INTERVAL[-1] == 3
-
-    def test_ok_rating_starts_at_10_days(self):
-        assert SRS_START_INTERVAL[0] == 10
+    def test_unscheduled_without_review_or_plan(self, days_since_review, planned_interval):
+        assert _next_interval(days_since_review, planned_interval, 1) is None
+
+    def test_graduates_past_end_interval(self):
+        result = compute_srs_intervals(
+            self.CURRENT_DATE,
+            [add_days_to_date(self.CURRENT_DATE, -1)] * 2,
+            [89, 97],
+            [1, 1],
+        )
+        assert list(result["next_interval"]) == [97, 101]
+        assert list(result["graduated"]) == [False, True]
+        assert SRS_END_INTERVAL == 99
+
+    def test_per_revision_dates(self):
+        result = compute_srs_intervals(
+            ["2024-06-15", "2024-07-15"], ["2024-06-05", "2024-06-05"], [1, 1], [0, 0]
+        )
+        # 10 and 40 days, halved by Ok: 5 and 20 -> 19
+        assert list(result["next_interval"]) == [5, 19]
+
+    def test_empty_batch(self):
+        result = compute_srs_intervals(self.CURRENT_DATE, [], [], [])
+        assert len(result["next_interval"]) == 0
+
+
+class TestStepSrsIntervalIndexes:
+    def test_steps_and_clamps(self):
+        last = len(SRS_INTERVALS) - 1
+        assert list(step_srs_interval_indexes([0, 5, last], -1)) == [0, 4, last - 1]
+        assert list(step_srs_interval_indexes([0, 5, last], 1)) == [1, 6, last]
+        assert list(step_srs_interval_indexes([0, 5, last], [1, 0, -1])) == [1, 5, last - 1]
@@ -5,6 +5,7 @@ from utils import (
     flatten_list,
     find_next_greater,
     compact_format,
+    encode_page_ranges,
     day_diff,
     calculate_days_difference,
     find_gaps,
@@ -56,6 +57,33 @@ class TestCompactFormat:
         assert compact_format([1, 1, 2, 2, 3]) == "1-3"
 
 
+class TestEncodePageRanges:
+    def test_ranges_match_compact_format(self):
+        entries = [(1, 11, 5), (2, 12, 3), (3, 13, 9), (7, 17, 1), (9, 19, 2), (10, 20, 4)]
+        ranges = encode_page_ranges(entries)
+        pages = ", ".join(
+            f"{r['start_page']}-{r['end_page']}" if r["end_page"] else str(r["start_page"])
+            for r in ranges
+        )
+        assert pages == compact_format([1, 2, 3, 7, 9, 10])
+
+    def test_endpoints_and_revision_ids(self):
+        # Page 3 is split into two items; the first entry on a page labels it
+        entries = [(2, 20, 8), (3, 30, 4), (3, 31, 6), (5, 50, 1)]
+        assert encode_page_ranges(entries) == [
+            {"start_page": 2, "end_page": 3, "start_item_id": 20, "end_item_id": 30, "revision_ids": [4, 6, 8]},
+            {"start_page": 5, "end_page": None, "start_item_id": 50, "end_item_id": 50, "revision_ids": [1]},
+        ]
+
+    def test_repeated_single_page(self):
+        assert encode_page_ranges([(4, 40, 2), (4, 40, 7)]) == [
+            {"start_page": 4, "end_page": None, "start_item_id": 40, "end_item_id": 40, "revision_ids": [2, 7]},
+        ]
+
+    def test_empty(self):
+        assert encode_page_ranges([]) == []
+
+
 class TestDayDiff:
     def test_empty_date1(self):
         assert day_diff("", "2024-01-15") == 0
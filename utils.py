@@ -154,6 +154,40 @@ def compact_format(numbers):
     return ", ".join(result)
 
 
+def encode_page_ranges(entries):
+    """
+    Group (page_id, item_id, revision_id) entries into runs of consecutive pages.
+
+    entries must be sorted by page_id (then revision_id); they are read in one pass.
+    Each range is a dict with start_page, end_page (None for a single page),
+    start_item_id/end_item_id (the first entry's item on the endpoint pages) and
+    revision_ids (every entry in the run, ascending). The pages match compact_format.
+    """
+    ranges = []
+    current = None
+    for page_id, item_id, revision_id in entries:
+        if current is not None and page_id in (current["end_page"], current["end_page"] + 1):
+            if page_id != current["end_page"]:
+                current["end_page"] = page_id
+                current["end_item_id"] = item_id
+            current["revision_ids"].append(revision_id)
+            continue
+        current = {
+            "start_page": page_id,
+            "end_page": page_id,
+            "start_item_id": item_id,
+            "end_item_id": item_id,
+            "revision_ids": [revision_id],
+        }
+        ranges.append(current)
+
+    for page_range in ranges:
+        page_range["revision_ids"].sort()
+        if page_range["end_page"] == page_range["start_page"]:
+            page_range["end_page"] = None
+    return ranges
+
+
 def date_to_human_readable(date_string):
 
     try: